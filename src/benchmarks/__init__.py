@@ -0,0 +1,10 @@
+"""
+Benchmarks for the FocusMe model and database layer.
+
+The benchmarks are run as modules from the ``src`` directory, e.g.::
+
+    python -m benchmarks.bench_load
+
+benchmarks.suite runs all database and model operations on seeded
+synthetic data (benchmarks.datagen) and writes the timings as JSON.
+"""
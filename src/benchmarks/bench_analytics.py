@@ -0,0 +1,70 @@
+"""
+Benchmark for the NumPy analytics (focusme_analytics).
+
+Fills a database with generated tasks and a pomodoro session log, then
+measures streaming the columns into NumPy arrays, the metrics
+(burndown, weekly velocity over the whole log, estimate accuracy) and a
+report from the AnalyticsCache of an unchanged database.
+Needs NumPy.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_analytics --projects 100 --tasks 10000 --sessions 1000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from model.focusme_db import initialize_database
+from model.focusme_analytics import load_task_columns, load_session_columns, AnalyticsCache, burndown, velocity, \
+                                    estimate_accuracy
+from benchmarks.datagen import fill_database
+
+
+def fill_sessions(conn, n_sessions, n_tasks, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    rows = []
+    for n in range(n_sessions):
+        started = start + timedelta(minutes=n * 3 * 365 * 24 * 60 // n_sessions)
+        completed = rng.random() < 0.8
+        ended = started + timedelta(minutes=25 if completed else rng.randint(1, 24))
+        rows.append((rng.randint(1, n_tasks), started.isoformat(timespec="seconds"),
+                     ended.isoformat(timespec="seconds"), int(completed)))
+    conn.executemany("INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed) VALUES (?, ?, ?, ?);",
+                     rows)
+    conn.commit()
+
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:>22}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks per project")
+    parser.add_argument("--sessions", type=int, default=1000000)
+    args = parser.parse_args()
+
+    conn = initialize_database()
+    fill_database(conn, args.projects, args.tasks, 0)
+    fill_sessions(conn, args.sessions, args.projects * args.tasks)
+    print(f"{args.projects * args.tasks} tasks, {args.sessions} sessions")
+    tasks = timed("load task columns", lambda: load_task_columns(conn))
+    sessions = timed("load session columns", lambda: load_session_columns(conn))
+    timed("burndown of one year", lambda: burndown(tasks, sessions, "2024-01-01", "2024-12-31"))
+    timed("weekly velocity", lambda: velocity(tasks, sessions, "2022-01-03", "2024-12-29"))
+    timed("estimate accuracy", lambda: estimate_accuracy(tasks, by="tag", done_only=False))
+    cache = AnalyticsCache()
+    cache.tasks(conn)
+    cache.sessions(conn)
+    timed("cached report", lambda: velocity(cache.tasks(conn), cache.sessions(conn), "2022-01-03", "2024-12-29",
+                                            project=tasks.projects[0]))
+
+
+if __name__ == "__main__":
+    main()
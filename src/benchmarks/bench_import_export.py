@@ -0,0 +1,97 @@
+"""
+Benchmark for the streaming import and export (JSON Lines / CSV).
+
+Writes a JSON Lines file with generated projects, tasks and subtasks
+(benchmarks.datagen), imports it into a new database and exports the
+database again as JSON Lines and CSV. The peak of the Python memory
+(tracemalloc) is measured in a second run of each step; it does not
+grow with the number of tasks.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_import_export --projects 1000 --tasks 1000 --subtasks 1
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from model.focusme_db import initialize_database
+from model.focusme_import_export import import_file, export_file, write_jsonl, TASK_FIELDS
+from benchmarks.datagen import DataGenerator
+
+
+def generated_records(n_projects, n_tasks, n_subtasks, seed=42):
+    """
+    Yields the records of the generated data, see focusme_import_export.
+    """
+    for (_, project_name), task_rows, subtask_rows in DataGenerator(seed).rows(n_projects, n_tasks, n_subtasks):
+        yield {"type": "project", "name": project_name}
+        subtasks = iter(subtask_rows)
+        for row in task_rows:
+            record = {"type": "task", "id": row[0], "project": row[9]}
+            record.update(zip(TASK_FIELDS, row[1:9] + row[10:]))
+            yield record
+            for _ in range(n_subtasks):
+                _, task_id, _, description, status = next(subtasks)
+                yield {"type": "subtask", "task_id": task_id, "description": description, "status": status}
+
+
+def measure(func, trace_memory=False):
+    """
+    Returns the duration in s and, with trace_memory, the peak of the traced memory in MB.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per project")
+    parser.add_argument("--subtasks", type=int, default=1, help="subtasks per task")
+    parser.add_argument("--profile", default="balanced", help="performance profile of the database")
+    parser.add_argument("--memory", action="store_true", help="also measure the peak memory (second run)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.jsonl")
+        with open(source, "w", encoding="utf-8") as file:
+            write_jsonl(generated_records(args.projects, args.tasks, args.subtasks), file)
+        print(f"{args.projects * args.tasks} tasks, {args.projects * args.tasks * args.subtasks} subtasks, "
+              f"{os.path.getsize(source) / 1e6:.0f} MB JSON Lines")
+
+        def run_import(db_name):
+            conn = initialize_database(db_name=db_name, profile=args.profile)
+            import_file(conn, source)
+            conn.close()
+
+        db_name = os.path.join(tmp_dir, "import.db")
+        steps = [
+            ("import .jsonl", lambda: run_import(db_name), lambda: run_import(os.path.join(tmp_dir, "import2.db"))),
+        ]
+        conn = None
+        def export(extension):
+            return lambda: export_file(conn, os.path.join(tmp_dir, "export" + extension))
+        steps.append(("export .jsonl", export(".jsonl"), export(".jsonl")))
+        steps.append(("export .csv", export(".csv"), export(".csv")))
+
+        print(f"{'step':>14} {'time s':>8} {'peak MB':>8}")
+        for name, func, second_run in steps:
+            if conn is None and name.startswith("export"):
+                conn = initialize_database(db_name=db_name, profile=args.profile)
+            duration, _ = measure(func)
+            peak = measure(second_run, trace_memory=True)[1] if args.memory else None
+            print(f"{name:>14} {duration:8.1f} {peak if peak is not None else float('nan'):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
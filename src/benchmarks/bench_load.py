@@ -0,0 +1,56 @@
+"""
+Benchmark for loading the FocusMeData object from the database.
+
+Compares the bulk loader generate_focusme_data_obj with the former loader that
+queried the Projects, Tasks and Subtasks tables once per project.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_load --projects 1000 --tasks 100 --subtasks 10
+"""
+import argparse
+import time
+from model.focusme_model import FocusMeData
+from model.focusme_db import initialize_database, generate_focusme_data_obj, select_project_table, \
+                             select_task_table, select_subtask_table, generate_project_obj
+from benchmarks.datagen import fill_database
+
+
+def legacy_generate_focusme_data_obj(conn):
+    """
+    The former loader with three queries per project (kept for comparison).
+    """
+    focusme_data = FocusMeData()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name FROM Projects;")
+    for project_id, project_name in cursor.fetchall():
+        project_table = select_project_table(conn, project_id)
+        tasks_table = select_task_table(conn, project_name)
+        subtask_table = select_subtask_table(conn, project_id)
+        focusme_data.add_project(generate_project_obj(project_table, tasks_table, subtask_table))
+    return focusme_data
+
+
+def measure(loader, conn):
+    start = time.perf_counter()
+    loader(conn)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--subtasks", type=int, default=10)
+    parser.add_argument("--db", default=None, help="database file (default: in-memory)")
+    args = parser.parse_args()
+
+    conn = initialize_database(db_name=args.db)
+    fill_database(conn, args.projects, args.tasks, args.subtasks)
+    print(f"{args.projects} projects x {args.tasks} tasks x {args.subtasks} subtasks")
+    print(f"before (per project queries): {measure(legacy_generate_focusme_data_obj, conn):8.3f} s")
+    print(f"after  (bulk loader):         {measure(generate_focusme_data_obj, conn):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark for the lookups in FocusMeData, Project and Task.
+
+Builds an in-memory model and measures the mean time of the indexed lookups
+for growing model sizes. A linear scan over the projects is measured for
+comparison. The lookup times stay constant while the model grows.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_lookups --projects 10000 --tasks 100
+"""
+import argparse
+import random
+import time
+from model.focusme_model import FocusMeData, Project, Task, Subtask, KanbanBoardColumns
+
+SWIMLANES = [col.value for col in KanbanBoardColumns]
+
+
+def build_model(n_projects, n_tasks):
+    """
+    Returns a FocusMeData object with n_projects x n_tasks tasks, each with one subtask.
+    """
+    focusme_data = FocusMeData()
+    task_id = 0
+    for project_id in range(1, n_projects + 1):
+        project = Project(f"Project {project_id}", project_id)
+        focusme_data.add_project(project)
+        for t in range(n_tasks):
+            task_id += 1
+            task = Task(id=task_id, taskname=f"Task {task_id}", assigned_kanban_swimlane=SWIMLANES[t % 3])
+            task.add_subtask(Subtask(id=task_id, task_id=task_id))
+            project.add_task(task)
+    return focusme_data
+
+
+def mean_time(func, keys):
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def linear_get_project(focusme_data, project_name):
+    for project in focusme_data.projects:
+        if project.name == project_name:
+            return project
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per project")
+    parser.add_argument("--lookups", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'projects':>9} {'tasks':>9} {'project by name':>16} {'project by id':>14} {'task by id':>11} "
+          f"{'task by name':>13} {'subtask by id':>14} {'linear scan':>12}  (us per lookup)")
+    for n_projects in (args.projects // 100, args.projects // 10, args.projects):
+        focusme_data = build_model(n_projects, args.tasks)
+        n_total = n_projects * args.tasks
+        project_ids = [rng.randint(1, n_projects) for _ in range(args.lookups)]
+        task_ids = [rng.randint(1, n_total) for _ in range(args.lookups)]
+        tasks = [focusme_data.get_task_by_id(task_id) for task_id in task_ids]
+        projects = [focusme_data.get_project_by_id((task_id - 1) // args.tasks + 1) for task_id in task_ids]
+        times = [
+            mean_time(focusme_data.get_project, [f"Project {i}" for i in project_ids]),
+            mean_time(focusme_data.get_project_by_id, project_ids),
+            mean_time(focusme_data.get_task_by_id, task_ids),
+            mean_time(lambda i: projects[i].get_task(tasks[i].taskname, tasks[i].assigned_kanban_swimlane),
+                      range(args.lookups)),
+            mean_time(lambda task: task.get_subtask(task.id), tasks),
+            mean_time(lambda i: linear_get_project(focusme_data, f"Project {i}"), project_ids[:100]),
+        ]
+        print(f"{n_projects:9} {n_total:9} " + " ".join(f"{t * 1e6:{w}.3f}" for t, w in
+                                                        zip(times, (16, 14, 11, 13, 14, 12))))
+        del focusme_data, tasks, projects
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Memory benchmark for Task objects loaded from the database.
+
+Measures with tracemalloc the bytes per task that stay allocated after the
+task rows are turned into objects:
+
+* before: plain objects with a per-instance __dict__, a new subtasks list
+  per task and without interning of repeated strings
+* after: Task objects with __slots__ built by generate_task_obj_2, which
+  interns swimlane, repeat, tag and project name
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_memory --tasks 500000
+"""
+import argparse
+import gc
+import tracemalloc
+from model.focusme_db import initialize_database, select_all_tasks_table, generate_task_obj_2
+from benchmarks.datagen import fill_database
+
+
+class PlainTask:
+    """
+    Task object as it was before __slots__ were used
+    """
+    def __init__(self, id, taskname, description, estimated_pomodoros, performed_pomodoros,
+                 date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project, kanban_rank):
+        self.id = id
+        self.taskname = taskname
+        self.description = description
+        self.estimated_pomodoros = estimated_pomodoros
+        self.performed_pomodoros = performed_pomodoros
+        self.date_to_perform = date_to_perform
+        self.repeat = repeat
+        self.tag = tag
+        self.assigned_kanban_swimlane = assigned_kanban_swimlane
+        self.assigned_project = assigned_project
+        self.kanban_rank = kanban_rank
+        self.subtasks = []
+
+
+def measure(conn, build_task):
+    """
+    Returns the bytes that stay allocated for the task objects.
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = select_all_tasks_table(conn)
+    tasks = [build_task(row) for row in rows]
+    del rows
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500000)
+    parser.add_argument("--tasks-per-project", type=int, default=100)
+    args = parser.parse_args()
+
+    conn = initialize_database()
+    fill_database(conn, args.tasks // args.tasks_per_project, args.tasks_per_project, 0)
+    before = measure(conn, lambda row: PlainTask(*row))
+    after = measure(conn, lambda row: generate_task_obj_2(row, ()))
+    print(f"{args.tasks} tasks")
+    print(f"before (__dict__, no interning): {before / args.tasks:7.1f} bytes per task")
+    print(f"after  (__slots__, interning):   {after / args.tasks:7.1f} bytes per task")
+
+
+if __name__ == "__main__":
+    main()
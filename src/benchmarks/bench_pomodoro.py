@@ -0,0 +1,105 @@
+"""
+Benchmark for the pomodoro engine (focusme_pomodoro).
+
+* timers: many sessions run at once on the engine thread, measured is the
+  time until all are completed and the lateness of the completions.
+* flush: writing the finished sessions in one transaction compared with
+  one transaction per session.
+* history: loading the board (generate_focusme_data_obj) and the sessions
+  of one task with and without a long session history.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_pomodoro --timers 10000 --history 1000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from model.focusme_model import Task
+from model.focusme_db import initialize_database, generate_focusme_data_obj
+from model.focusme_pomodoro import PomodoroEngine, select_pomodoro_sessions
+from benchmarks.datagen import fill_database
+
+
+def bench_timers(n_timers, duration):
+    lateness = []
+    engine = PomodoroEngine(on_finished=lambda session: lateness.append(time.monotonic() - session.deadline),
+                            tick_seconds=0.1)
+    tasks = [Task(id=n, taskname=f"Task {n}") for n in range(1, 101)]
+    start = time.perf_counter()
+    for n in range(n_timers):
+        engine.start(tasks[n % len(tasks)], duration=duration + n % 100 * 0.001)
+    started = time.perf_counter() - start
+    while len(lateness) < n_timers:
+        time.sleep(0.01)
+    total = time.perf_counter() - start
+    engine.close()
+    lateness.sort()
+    print(f"{n_timers} timers: started in {started * 1000:.0f} ms, all completed after {total:.2f} s, "
+          f"lateness median {lateness[len(lateness) // 2] * 1000:.2f} ms, max {lateness[-1] * 1000:.1f} ms")
+    return engine
+
+
+def bench_flush(conn, engine):
+    n_sessions = len(engine.finished_sessions)
+    sessions = list(engine.finished_sessions)
+    start = time.perf_counter()
+    engine.flush(conn)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    for session in sessions:
+        engine.finished_sessions.append(session)
+        engine.flush(conn)
+    single = time.perf_counter() - start
+    print(f"flush of {n_sessions} sessions: one transaction {batched * 1000:.0f} ms, "
+          f"one transaction per session {single * 1000:.0f} ms")
+
+
+def fill_history(conn, n_sessions, n_tasks, seed=42):
+    rng = random.Random(seed)
+    first = datetime(2024, 1, 1)
+    rows = []
+    for n in range(n_sessions):
+        started = first + timedelta(minutes=30 * n)
+        rows.append((rng.randint(1, n_tasks), started.isoformat(), (started + timedelta(minutes=25)).isoformat(),
+                     int(rng.random() < 0.9)))
+    conn.executemany("INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed) VALUES (?, ?, ?, ?);",
+                     rows)
+    conn.commit()
+
+
+def bench_history(conn, n_sessions, n_tasks):
+    def measure():
+        start = time.perf_counter()
+        generate_focusme_data_obj(conn)
+        board = time.perf_counter() - start
+        start = time.perf_counter()
+        for task_id in range(1, 101):
+            select_pomodoro_sessions(conn, task_id=task_id, limit=20)
+        sessions = (time.perf_counter() - start) / 100
+        return board, sessions
+    board, sessions = measure()
+    print(f"board load without history: {board * 1000:.0f} ms, 20 sessions of a task {sessions * 1000:.3f} ms")
+    fill_history(conn, n_sessions, n_tasks)
+    board, sessions = measure()
+    print(f"board load with {n_sessions} sessions: {board * 1000:.0f} ms, 20 sessions of a task {sessions * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per timer")
+    parser.add_argument("--history", type=int, default=1000000, help="logged sessions")
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+
+    conn = initialize_database()
+    fill_database(conn, max(1, args.tasks // 100), min(100, args.tasks), 0)
+    engine = bench_timers(args.timers, args.duration)
+    bench_flush(conn, engine)
+    bench_history(conn, args.history, args.tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for the SQLite performance profiles.
+
+For each profile in PERFORMANCE_PROFILES a database file is filled and the
+latency of small commits (one task update per commit, like an edit in the
+detail panel) and the time of a bulk load with generate_focusme_data_obj
+are measured.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_profiles --commits 200 --projects 100
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from model.focusme_db import initialize_database, generate_focusme_data_obj, transaction, PERFORMANCE_PROFILES
+from model.focusme_model import Task
+from benchmarks.datagen import fill_database
+
+
+def measure_profile(db_name, profile, n_commits):
+    """
+    Returns the commit latencies (s) and the bulk load time (s) for a profile.
+    """
+    conn = initialize_database(db_name=db_name, profile=profile)
+    task = Task(id=1, taskname="Task 1", assigned_project="Project 1")
+    latencies = []
+    for i in range(n_commits):
+        task.description = f"Description {i}"
+        start = time.perf_counter()
+        with transaction(conn) as uow:
+            uow.update_task(task)
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+    conn = initialize_database(db_name=db_name, profile=profile)
+    start = time.perf_counter()
+    generate_focusme_data_obj(conn)
+    load_time = time.perf_counter() - start
+    conn.close()
+    return latencies, load_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commits", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--subtasks", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.commits} commits, load of {args.projects} projects x {args.tasks} tasks x {args.subtasks} subtasks")
+    print(f"{'profile':10} {'commit median':>14} {'commit p95':>11} {'bulk load':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for profile in PERFORMANCE_PROFILES:
+            db_name = os.path.join(tmp_dir, f"{profile}.db")
+            conn = initialize_database(db_name=db_name, profile=profile)
+            fill_database(conn, args.projects, args.tasks, args.subtasks)
+            conn.close()
+            latencies, load_time = measure_profile(db_name, profile, args.commits)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{profile:10} {statistics.median(latencies) * 1000:11.3f} ms {p95 * 1000:8.3f} ms "
+                  f"{load_time:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark for the recurrence engine (focusme_recurrence).
+
+Creates repeating tasks (DAY, WEEK and MONTH mixed, random dates in one year),
+builds a RecurrenceIndex and measures the window queries "due this week"
+and "due this month" against computing the first occurrence of every task.
+The batch roll-over of the DONE tasks is measured with the write to the
+database (one transaction).
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_recurrence --tasks 100000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from model.focusme_model import Project, Task, FocusMeData, KanbanBoardColumns, RepeatEnum
+from model.focusme_db import initialize_database, WriteBehindQueue
+from model.focusme_recurrence import RecurrenceIndex, occurrences, repeat_of, anchor_of, roll_over_done_tasks
+from benchmarks.datagen import fill_database, build_focusme_data
+from benchmarks.suite import median_ms
+
+REPEATS = [RepeatEnum.DAY.value, RepeatEnum.WEEK.value, RepeatEnum.WEEK.value, RepeatEnum.MONTH.value]
+
+
+def repeating_tasks(n_tasks, seed=42):
+    rng = random.Random(seed)
+    return [Task(id=n, taskname=f"Task {n}", repeat=rng.choice(REPEATS),
+                 date_to_perform=(date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat())
+            for n in range(1, n_tasks + 1)]
+
+
+def per_task_scan(tasks, first_day, last_day):
+    """
+    The first occurrence in the window computed for every task (for comparison).
+    """
+    due = []
+    for task in tasks:
+        day = next(occurrences(anchor_of(task), repeat_of(task.repeat), first_day, last_day), None)
+        if day is not None:
+            due.append((day, task))
+    due.sort(key=lambda item: item[0])
+    return due
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=100, help="projects of the roll-over test")
+    args = parser.parse_args()
+
+    tasks = repeating_tasks(args.tasks)
+    start = time.perf_counter()
+    index = RecurrenceIndex(tasks)
+    print(f"{len(index)} repeating tasks, index built in {time.perf_counter() - start:.3f} s")
+    week = (date(2025, 6, 2), date(2025, 6, 8))
+    month = (date(2025, 6, 1), date(2025, 6, 30))
+    for name, (first_day, last_day) in (("week", week), ("month", month)):
+        duration, due = median_ms(lambda: list(index.due_between(first_day, last_day)), repeat=20)
+        scan, _ = median_ms(lambda: per_task_scan(tasks, first_day, last_day), repeat=3)
+        print(f"due this {name:>5}: {len(due):7} tasks, index {duration:7.2f} ms, per-task scan {scan:7.1f} ms")
+    duration, _ = median_ms(lambda: next(iter(index.due_between(*week))), repeat=20)
+    print(f"first due task of the week: {duration:.3f} ms")
+
+    # roll-over: every third task of the generated board is a repeating task in DONE
+    n_tasks = max(1, args.tasks // args.projects)
+    conn = initialize_database()
+    fill_database(conn, args.projects, n_tasks, 0)
+    focusme_data = build_focusme_data(args.projects, n_tasks, 0)
+    done = 0
+    for task in focusme_data.tasks_by_id.values():
+        if task.assigned_kanban_swimlane == KanbanBoardColumns.DONE.value:
+            task.repeat = RepeatEnum.WEEK.value
+            done += 1
+    start = time.perf_counter()
+    changed = roll_over_done_tasks(focusme_data, today=date(2025, 6, 1))
+    queue = WriteBehindQueue(conn)
+    for task in changed:
+        queue.mark_task_dirty(task)
+    queue.flush()
+    print(f"roll-over of {done} DONE tasks ({len(changed)} written): {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark for the full-text search over tasks and subtasks.
+
+Fills a database with tasks whose names, descriptions, tags and subtasks are
+drawn from a seeded vocabulary (benchmarks.datagen) and measures search_tasks
+for whole words and for the prefixes typed while searching as you type.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_search --projects 1000 --tasks 1000 --subtasks 2
+"""
+import argparse
+import random
+import statistics
+import time
+from model.focusme_db import initialize_database, search_tasks
+from benchmarks.datagen import DataGenerator, fill_database
+
+SEED = 42
+
+
+def measure(conn, queries):
+    """
+    Returns the median and the maximum search time in ms.
+    """
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        search_tasks(conn, query)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per project")
+    parser.add_argument("--subtasks", type=int, default=2, help="subtasks per task")
+    parser.add_argument("--words", type=int, default=20000, help="size of the vocabulary")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", default=None, help="database file (default: in-memory)")
+    args = parser.parse_args()
+
+    # the vocabulary the texts of fill_database are drawn from
+    vocabulary = DataGenerator(SEED, args.words).vocabulary
+    rng = random.Random(SEED)
+    conn = initialize_database(db_name=args.db)
+    start = time.perf_counter()
+    fill_database(conn, args.projects, args.tasks, args.subtasks, seed=SEED, n_words=args.words)
+    print(f"{args.projects * args.tasks} tasks indexed in {time.perf_counter() - start:.1f} s")
+
+    words = [rng.choice(vocabulary) for _ in range(args.queries)]
+    cases = {
+        "one word": words,
+        "two words": [f"{a} {b}" for a, b in zip(words, reversed(words))],
+        "prefix (3 chars)": [word[:3] for word in words],
+        "prefix (5 chars)": [word[:5] for word in words],
+    }
+    print(f"{'query':>18} {'median ms':>10} {'max ms':>10}")
+    for name, queries in cases.items():
+        median, worst = measure(conn, queries)
+        print(f"{name:>18} {median:10.2f} {worst:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for the startup with and without the snapshot cache.
+
+Measures, like main.main does it, the time from opening the database file
+until the FocusMeData object is available:
+
+* database: the snapshot is stale, generate_focusme_data_obj loads from SQL
+* snapshot: the snapshot is valid and loaded with pickle
+
+and the time of save_snapshot on shutdown. Each path runs in a new
+connection, the file system cache is warm.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_startup --projects 100 --tasks 1000 --subtasks 2
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from model.focusme_db import initialize_database, generate_focusme_data_obj
+from model.focusme_snapshot import snapshot_file_name, load_focusme_data, save_snapshot
+from benchmarks.datagen import fill_database
+
+
+def startup(db_name, file_name, profile):
+    """
+    Returns the startup time in s and whether the snapshot was used.
+    """
+    start = time.perf_counter()
+    conn = initialize_database(db_name=db_name, profile=profile)
+    _, from_snapshot = load_focusme_data(conn, file_name)
+    duration = time.perf_counter() - start
+    conn.close()
+    return duration, from_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per project")
+    parser.add_argument("--subtasks", type=int, default=2, help="subtasks per task")
+    parser.add_argument("--profile", default="balanced", help="performance profile of the database")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_name = os.path.join(tmp_dir, "focusme.db")
+        file_name = snapshot_file_name(db_name)
+        conn = initialize_database(db_name=db_name, profile=args.profile)
+        fill_database(conn, args.projects, args.tasks, args.subtasks)
+        focusme_data = generate_focusme_data_obj(conn)
+        start = time.perf_counter()
+        save_snapshot(conn, focusme_data, file_name)
+        save_time = time.perf_counter() - start
+        print(f"{args.projects * args.tasks} tasks, {args.projects * args.tasks * args.subtasks} subtasks, "
+              f"database {os.path.getsize(db_name) / 1e6:.0f} MB, snapshot {os.path.getsize(file_name) / 1e6:.0f} MB")
+        print(f"save_snapshot: {save_time:.3f} s")
+
+        times = {"database": [], "snapshot": []}
+        for _ in range(args.repeat):
+            duration, from_snapshot = startup(db_name, file_name, args.profile)
+            assert from_snapshot
+            times["snapshot"].append(duration)
+        # a write after the snapshot makes it stale
+        conn.execute("UPDATE Projects SET name = name WHERE id = 1;")
+        conn.commit()
+        for _ in range(args.repeat):
+            duration, from_snapshot = startup(db_name, file_name, args.profile)
+            assert not from_snapshot
+            times["database"].append(duration)
+        conn.close()
+        for path, durations in times.items():
+            print(f"startup from {path:>8}: median {statistics.median(durations):.3f} s, "
+                  f"min {min(durations):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
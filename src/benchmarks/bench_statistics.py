@@ -0,0 +1,100 @@
+"""
+Benchmark for the statistics summary table (TaskStats, schema migration 7).
+
+* report: the totals per project read from TaskStats (select_project_statistics)
+  compared with aggregating all tasks and subtasks.
+* edits: single task and subtask updates (one transaction each) with and
+  without the statistics triggers.
+* fill: the bulk insert of the generated data with and without the triggers.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_statistics --projects 100 --tasks 1000 --subtasks 3
+"""
+import argparse
+import statistics
+import time
+from model.focusme_model import KanbanBoardColumns
+from model.focusme_db import initialize_database, select_project_statistics
+from benchmarks.datagen import fill_database
+from benchmarks.suite import median_ms
+
+STATISTICS_TRIGGERS = ("task_stats_insert", "task_stats_delete", "task_stats_update",
+                       "subtask_stats_insert", "subtask_stats_delete", "subtask_stats_update")
+SWIMLANES = [col.value for col in KanbanBoardColumns]
+
+
+def aggregate_tasks(conn):
+    """
+    The totals per project computed from all tasks and subtasks (for comparison).
+    """
+    return {row[0]: row[1:] for row in conn.execute("""
+        SELECT assigned_project, COUNT(*), TOTAL(estimated_pomodoros), TOTAL(performed_pomodoros),
+               TOTAL(subtask_counts.subtasks), TOTAL(subtask_counts.subtasks_done)
+        FROM Tasks
+        LEFT JOIN (SELECT task_id, COUNT(*) AS subtasks, TOTAL(status != 0) AS subtasks_done
+                   FROM Subtasks GROUP BY task_id) AS subtask_counts ON subtask_counts.task_id = Tasks.id
+        GROUP BY assigned_project;
+    """)}
+
+
+def drop_statistics_triggers(conn):
+    for name in STATISTICS_TRIGGERS:
+        conn.execute(f"DROP TRIGGER {name};")
+    conn.commit()
+
+
+def edits_us(conn, n_edits):
+    """
+    Median time of one committed task update and one committed subtask update in microseconds.
+    """
+    task_ids = [row[0] for row in conn.execute("SELECT id FROM Tasks LIMIT ?;", (n_edits,))]
+    subtask_ids = [row[0] for row in conn.execute("SELECT id FROM Subtasks LIMIT ?;", (n_edits,))]
+    task_durations = []
+    for n, task_id in enumerate(task_ids):
+        start = time.perf_counter()
+        conn.execute("UPDATE Tasks SET assigned_kanban_swimlane = ?, performed_pomodoros = ? WHERE id = ?;",
+                     (SWIMLANES[n % len(SWIMLANES)], n % 5, task_id))
+        conn.commit()
+        task_durations.append((time.perf_counter() - start) * 1e6)
+    subtask_durations = []
+    for n, subtask_id in enumerate(subtask_ids):
+        start = time.perf_counter()
+        conn.execute("UPDATE Subtasks SET status = ? WHERE id = ?;", (n % 2, subtask_id))
+        conn.commit()
+        subtask_durations.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(task_durations), statistics.median(subtask_durations) if subtask_durations else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per project")
+    parser.add_argument("--subtasks", type=int, default=3, help="subtasks per task")
+    parser.add_argument("--edits", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {}
+    for with_triggers in (True, False):
+        conn = initialize_database()
+        if not with_triggers:
+            drop_statistics_triggers(conn)
+        start = time.perf_counter()
+        fill_database(conn, args.projects, args.tasks, args.subtasks)
+        fill = time.perf_counter() - start
+        task_edit, subtask_edit = edits_us(conn, args.edits)
+        results[with_triggers] = (fill, task_edit, subtask_edit)
+        if with_triggers:
+            assert select_project_statistics(conn) == aggregate_tasks(conn)
+            report, _ = median_ms(lambda: select_project_statistics(conn))
+            scan, _ = median_ms(lambda: aggregate_tasks(conn), repeat=3)
+            print(f"{args.projects * args.tasks} tasks, report per project: TaskStats {report:.2f} ms, "
+                  f"aggregating all tasks {scan:.1f} ms")
+        conn.close()
+    for with_triggers, (fill, task_edit, subtask_edit) in results.items():
+        print(f"{'with' if with_triggers else 'without':>7} triggers: fill {fill:.2f} s, "
+              f"task edit {task_edit:.1f} us, subtask edit {subtask_edit:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for the tag filter of the board (Project.filter_tasks).
+
+Builds projects of growing size where every task has two of 200 tags
+(Zipf-like: a few tags are common, most are rare) and measures the OR and
+AND filters from the tag index against matching the tag text of every task.
+The filter time should grow with the matches, not with the project.
+The same filters are run in SQL (select_tasks_by_tags) on one database.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.bench_tags --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from model.focusme_model import Project, Task, KanbanBoardColumns, split_tags
+from model.focusme_db import initialize_database, add_project_to_db, transaction, select_tasks_by_tags
+from benchmarks.suite import median_ms
+
+SWIMLANES = [col.value for col in KanbanBoardColumns]
+TAGS = [f"tag{n:03d}" for n in range(200)]
+# weight of tag n is 1 / (n + 1)
+WEIGHTS = [1 / (n + 1) for n in range(len(TAGS))]
+
+
+def tagged_tasks(n_tasks, seed=42):
+    rng = random.Random(seed)
+    return [Task(id=n, taskname=f"Task {n}", assigned_project="Tags",
+                 assigned_kanban_swimlane=SWIMLANES[n % len(SWIMLANES)],
+                 tag=", ".join(rng.choices(TAGS, weights=WEIGHTS, k=2)))
+            for n in range(1, n_tasks + 1)]
+
+
+def scan(project, tags, match_all):
+    """
+    Matches the tag text of every task (for comparison).
+    """
+    wanted = set(tags)
+    filtered = {}
+    for swimlane, tasks in project.tasks.items():
+        if match_all:
+            filtered[swimlane] = [task for task in tasks if wanted <= set(split_tags(task.tag))]
+        else:
+            filtered[swimlane] = [task for task in tasks if not wanted.isdisjoint(split_tags(task.tag))]
+    return filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--sql-tasks", type=int, default=100000)
+    args = parser.parse_args()
+
+    filters = (("rare OR", ("tag150", "tag199"), False), ("common OR", ("tag000", "tag001"), False),
+               ("common AND rare", ("tag000", "tag150"), True))
+    for size in args.sizes:
+        project = Project("Tags")
+        start = time.perf_counter()
+        for task in tagged_tasks(size):
+            project.add_task(task)
+        print(f"{size} tasks, built in {time.perf_counter() - start:.2f} s")
+        for name, tags, match_all in filters:
+            duration, filtered = median_ms(lambda: project.filter_tasks(tags, match_all), repeat=5)
+            scan_duration, _ = median_ms(lambda: scan(project, tags, match_all), repeat=1)
+            matches = sum(len(tasks) for tasks in filtered.values())
+            print(f"  {name:>15}: {matches:7} matches, index {duration:8.2f} ms, scan {scan_duration:8.1f} ms")
+
+    conn = initialize_database()
+    project = Project("Tags")
+    add_project_to_db(conn, project)
+    start = time.perf_counter()
+    with transaction(conn) as uow:
+        for task in tagged_tasks(args.sql_tasks):
+            task.id = None
+            uow.add_task(task)
+    print(f"SQL, {args.sql_tasks} tasks, inserted in {time.perf_counter() - start:.2f} s")
+    for name, tags, match_all in filters:
+        duration, rows = median_ms(lambda: select_tasks_by_tags(conn, tags, match_all), repeat=5)
+        print(f"  {name:>15}: {len(rows):7} matches, {duration:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Seeded generator of synthetic FocusMe data.
+
+Generates N projects x M tasks x K subtasks with text lengths similar to
+real kanban boards: short task names, descriptions of a few sentences and
+short checklist entries. The same seed always produces the same data, so
+benchmark runs can be compared with each other.
+"""
+import random
+from model.focusme_model import FocusMeData, Project, Task, Subtask, KanbanBoardColumns, RepeatEnum, RANK_STEP
+
+SWIMLANES = [col.value for col in KanbanBoardColumns]
+REPEATS = [repeat.value for repeat in RepeatEnum]
+SYLLABLES = ["ka", "be", "ri", "mo", "tu", "la", "sen", "dor", "fi", "gu", "pel", "no", "stra", "vi", "ze", "qua"]
+
+# (min, max) number of words
+TASKNAME_WORDS = (2, 6)
+DESCRIPTION_WORDS = (10, 60)
+SUBTASK_WORDS = (2, 8)
+
+
+def build_vocabulary(rng, size):
+    """
+    Returns size distinct artificial words.
+    """
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class DataGenerator:
+    """
+    Generates the rows of the Projects, Tasks and Subtasks tables
+
+    Args:
+        seed (int): seed of the random generator
+        n_words (int): size of the vocabulary
+    """
+    def __init__(self, seed=42, n_words=5000):
+        self.rng = random.Random(seed)
+        self.vocabulary = build_vocabulary(self.rng, n_words)
+        self.tags = ["", ""] + self.vocabulary[:20]
+
+    def text(self, word_range):
+        low, high = word_range
+        return " ".join(self.rng.choice(self.vocabulary) for _ in range(self.rng.randint(low, high)))
+
+    def date(self):
+        return f"2025-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}"
+
+    def rows(self, n_projects, n_tasks, n_subtasks):
+        """
+        Yields the rows of one project at a time, ids start at 1
+
+        Returns:
+            iterator of tuple: (project_row, task_rows, subtask_rows) with
+                project_row (id, name),
+                task rows (id, taskname, description, estimated_pomodoros, performed_pomodoros,
+                           date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project, kanban_rank)
+                in the column order of select_task_table and
+                subtask rows (id, task_id, project_id, description, status)
+        """
+        task_id = 0
+        subtask_id = 0
+        for project_id in range(1, n_projects + 1):
+            project_name = f"{self.text((1, 3)).capitalize()} {project_id}"
+            task_rows = []
+            subtask_rows = []
+            for t in range(n_tasks):
+                task_id += 1
+                estimated = self.rng.randint(1, 8)
+                task_rows.append((task_id, self.text(TASKNAME_WORDS).capitalize(), self.text(DESCRIPTION_WORDS),
+                                  estimated, self.rng.randint(0, estimated), self.date(),
+                                  self.rng.choice(REPEATS), self.rng.choice(self.tags),
+                                  SWIMLANES[t % len(SWIMLANES)], project_name, (t // len(SWIMLANES) + 1) * RANK_STEP))
+                for _ in range(n_subtasks):
+                    subtask_id += 1
+                    subtask_rows.append((subtask_id, task_id, project_id, self.text(SUBTASK_WORDS),
+                                         int(self.rng.random() < 0.3)))
+            yield (project_id, project_name), task_rows, subtask_rows
+
+
+def fill_database(conn, n_projects, n_tasks, n_subtasks, seed=42, n_words=5000):
+    """
+    Fills the database with n_projects x n_tasks x n_subtasks generated rows.
+    The texts are drawn from DataGenerator(seed, n_words).vocabulary.
+    """
+    cursor = conn.cursor()
+    for project_row, task_rows, subtask_rows in DataGenerator(seed, n_words).rows(n_projects, n_tasks, n_subtasks):
+        cursor.execute("INSERT INTO Projects (id, name) VALUES (?, ?);", project_row)
+        # subtasks first: the search index row of a task is then written once, by the Tasks insert trigger
+        cursor.executemany("INSERT INTO Subtasks (id, task_id, project_id, description, status) VALUES (?, ?, ?, ?, ?);",
+                           subtask_rows)
+        cursor.executemany("""
+            INSERT INTO Tasks (id, taskname, description, estimated_pomodoros, performed_pomodoros,
+                               date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project, kanban_rank)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, task_rows)
+    conn.commit()
+
+
+def build_focusme_data(n_projects, n_tasks, n_subtasks, seed=42):
+    """
+    Returns a FocusMeData object with the same data fill_database writes for the seed.
+    """
+    focusme_data = FocusMeData()
+    for (project_id, project_name), task_rows, subtask_rows in DataGenerator(seed).rows(n_projects, n_tasks, n_subtasks):
+        project = Project(project_name, project_id)
+        focusme_data.add_project(project)
+        tasks = {}
+        for row in task_rows:
+            task = Task(id=row[0], taskname=row[1], description=row[2], estimated_pomodoros=row[3],
+                        performed_pomodoros=row[4], date_to_perform=row[5], repeat=row[6], tag=row[7],
+                        assigned_kanban_swimlane=row[8], assigned_project=row[9], kanban_rank=row[10])
+            tasks[task.id] = task
+            project.add_task(task)
+        for subtask_id, task_id, project_id, description, status in subtask_rows:
+            tasks[task_id].add_subtask(Subtask(id=subtask_id, task_id=task_id, project_id=project_id,
+                                               description=description, status=status))
+    return focusme_data
@@ -0,0 +1,212 @@
+"""
+Benchmark suite for focusme_db and focusme_model.
+
+Runs the database and model operations on seeded synthetic data (see
+benchmarks.datagen) at several scales and writes the timings as JSON, so
+runs of different revisions can be compared with each other.
+
+Each scale is given as PROJECTSxTASKSxSUBTASKS. For every operation the
+number of samples and the min, median, p95, max and mean time in ms are
+reported. The model lookups are too fast to be timed one by one, each of
+their samples is the mean of a batch of calls.
+
+Usage (from the ``src`` directory)::
+
+    python -m benchmarks.suite --scales 10x100x5 100x100x5 --output results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from model.focusme_model import Task, Subtask, KanbanBoardColumns
+from model.focusme_db import initialize_database, generate_focusme_data_obj, add_task_to_db, update_task_in_db, \
+                             add_subtask_to_db, update_subtask_in_db, select_subtask_table
+from benchmarks.datagen import DataGenerator, fill_database, build_focusme_data, SUBTASK_WORDS
+
+DEFAULT_SCALES = ["10x100x5", "100x100x5", "1000x100x5"]
+
+
+def parse_scale(scale):
+    """
+    Returns (n_projects, n_tasks, n_subtasks) of a scale like "100x100x5".
+    """
+    n_projects, n_tasks, n_subtasks = (int(n) for n in scale.lower().split("x"))
+    return n_projects, n_tasks, n_subtasks
+
+
+def summarize(times):
+    """
+    Returns the statistics of a list of durations in seconds, in ms.
+    """
+    times = sorted(times)
+    return {
+        "samples": len(times),
+        "min_ms": times[0] * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        "max_ms": times[-1] * 1000,
+        "mean_ms": statistics.fmean(times) * 1000,
+    }
+
+
+def time_calls(func, args_list):
+    """
+    Calls func once per argument tuple and returns the durations in seconds.
+    The status messages printed by focusme_db are discarded, so they do not
+    mix with the JSON output.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for args in args_list:
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def median_ms(func, repeat=10):
+    """
+    Calls func repeat times and returns the median duration in ms and the result of the last call.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+def bench_database(db_name, n_projects, n_tasks, n_subtasks, calls, seed):
+    """
+    Times the database operations on a database file with the given scale.
+    """
+    results = {}
+    results["initialize_database"] = time_calls(lambda: initialize_database(db_name=db_name).close(), [()])
+    conn = initialize_database(db_name=db_name)
+    results["fill_database"] = time_calls(fill_database, [(conn, n_projects, n_tasks, n_subtasks, seed)])
+    results["generate_focusme_data_obj"] = time_calls(generate_focusme_data_obj, [(conn,)] * 3)
+
+    generator = DataGenerator(seed + 1)
+    project_names = [row[1] for row in conn.execute("SELECT id, name FROM Projects;")]
+    rng = random.Random(seed)
+    new_tasks = [Task(taskname=generator.text((2, 6)), description=generator.text((10, 60)),
+                      assigned_project=rng.choice(project_names)) for _ in range(calls)]
+    results["add_task_to_db"] = time_calls(add_task_to_db, [(conn, task) for task in new_tasks])
+    for task in new_tasks:
+        task.description = generator.text((10, 60))
+        task.assigned_kanban_swimlane = KanbanBoardColumns.IN_PROGRESS.value
+    results["update_task_in_db"] = time_calls(update_task_in_db, [(conn, task) for task in new_tasks])
+
+    subtasks = [Subtask(task_id=task.id, description=generator.text(SUBTASK_WORDS)) for task in new_tasks]
+    results["add_subtask_to_db"] = time_calls(add_subtask_to_db, [(conn, subtask, task)
+                                                                  for subtask, task in zip(subtasks, new_tasks)])
+    results["select_subtask_table"] = time_calls(select_subtask_table, [(conn, task.id) for task in new_tasks])
+    for subtask in subtasks:
+        subtask.status = 1
+    results["update_subtask_in_db"] = time_calls(update_subtask_in_db, [(conn, subtask) for subtask in subtasks])
+
+    def delete_subtask(subtask):
+        # focusme_db has no function for deleting a subtask yet
+        conn.execute("DELETE FROM Subtasks WHERE id = ?;", (subtask.id,))
+        conn.commit()
+    results["delete_subtask (SQL)"] = time_calls(delete_subtask, [(subtask,) for subtask in subtasks])
+    conn.close()
+    return results
+
+
+def bench_model(n_projects, n_tasks, n_subtasks, calls, seed):
+    """
+    Times the lookups of FocusMeData, Project and Task.
+    """
+    focusme_data = build_focusme_data(n_projects, n_tasks, n_subtasks, seed)
+    rng = random.Random(seed)
+    projects = [rng.choice(focusme_data.projects) for _ in range(calls)]
+    project_tasks = {project.id: [task for lane in project.tasks.values() for task in lane]
+                     for project in focusme_data.projects}
+    tasks = [rng.choice(project_tasks[project.id]) for project in projects]
+    # lookups are too fast to time one by one, each sample is the mean of a batch of calls
+    def batch(func, keys):
+        def run():
+            for key in keys:
+                func(key)
+        return [(t / len(keys)) for t in time_calls(run, [()] * 5)]
+    results = {
+        "FocusMeData.get_project": batch(focusme_data.get_project, [project.name for project in projects]),
+        "FocusMeData.get_project_by_id": batch(focusme_data.get_project_by_id, [project.id for project in projects]),
+        "FocusMeData.get_task_by_id": batch(focusme_data.get_task_by_id, [task.id for task in tasks]),
+        "Project.get_task": batch(lambda pair: pair[0].get_task(pair[1].taskname, pair[1].assigned_kanban_swimlane),
+                                  list(zip(projects, tasks))),
+    }
+    subtask_keys = [(task, task.subtasks[0].id) for task in tasks if task.subtasks]
+    if subtask_keys:
+        results["Task.get_subtask"] = batch(lambda pair: pair[0].get_subtask(pair[1]), subtask_keys)
+    return results
+
+
+def run_suite(scales, calls=200, seed=42, db_dir=None):
+    """
+    Runs the suite for all scales
+
+    Args:
+        scales (list): scales like "100x100x5"
+        calls (int): calls per timed operation
+        seed (int): seed of the data generator
+        db_dir (str, optional): directory of the database files. Defaults to a temporary directory.
+
+    Returns:
+        dict: JSON serializable results
+    """
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "calls": calls,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(dir=db_dir) as tmp_dir:
+        for scale in scales:
+            n_projects, n_tasks, n_subtasks = parse_scale(scale)
+            db_name = os.path.join(tmp_dir, f"bench_{scale}.db")
+            timings = bench_database(db_name, n_projects, n_tasks, n_subtasks, calls, seed)
+            timings.update(bench_model(n_projects, n_tasks, n_subtasks, calls, seed))
+            for operation, times in timings.items():
+                report["results"].append({"scale": scale, "projects": n_projects, "tasks": n_projects * n_tasks,
+                                          "subtasks": n_projects * n_tasks * n_subtasks,
+                                          "operation": operation, **summarize(times)})
+            print(f"{scale} done", file=sys.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="PROJECTSxTASKSxSUBTASKS")
+    parser.add_argument("--calls", type=int, default=200, help="calls per timed operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-dir", default=None, help="directory of the database files (default: temp directory)")
+    parser.add_argument("--output", default=None, help="JSON file (default: stdout)")
+    args = parser.parse_args()
+
+    report = run_suite(args.scales, args.calls, args.seed, args.db_dir)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,115 @@
 import sys
+import argparse
+import logging
 from PySide6.QtWidgets import QApplication
 from view.ui_main_window import MainWindow
-from model.focusme_db import initialize_database, generate_focusme_data_obj
+from model.focusme_db import generate_focusme_headers_obj, select_project_rows, LoadedProjectsLRU, WriteBehindQueue, \
+                             DEFAULT_MAX_LOADED_PROJECTS, PERFORMANCE_PROFILES
+from model.focusme_db_worker import DatabaseWorker
+from model.focusme_instrumentation import INSTRUMENTATION
+from model.focusme_recurrence import roll_over_done_tasks, roll_over_project
+from model.focusme_snapshot import snapshot_file_name, load_focusme_data, save_snapshot
 from control.focusme_control import FocusMeControl
 from model.focusme_model import KanbanBoardColumns
 
+def parse_args(argv):
+    """
+    Parses the FocusMe command line options. Unknown options are
+    left for QApplication.
+
+    Args:
+        argv (list): command line arguments
+
+    Returns:
+        tuple: parsed options and remaining arguments
+    """
+    parser = argparse.ArgumentParser(description="FocusMe")
+    parser.add_argument("--lazy", action="store_true",
+                        help="load only project headers at startup and the tasks of a project when it is opened")
+    parser.add_argument("--max-loaded-projects", type=int, default=DEFAULT_MAX_LOADED_PROJECTS,
+                        help="number of projects whose tasks are kept in memory in lazy mode")
+    parser.add_argument("--db-profile", choices=sorted(PERFORMANCE_PROFILES), default="balanced",
+                        help="SQLite performance profile (journal mode, synchronous, cache, ...)")
+    parser.add_argument("--instrument", nargs="?", const="", default=None, metavar="JSON_FILE",
+                        help="record calls, latencies and queries of the database functions and UI slots, "
+                             "log a summary on exit and optionally write it to JSON_FILE")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="always load the data from the database, do not read or write the snapshot file")
+    return parser.parse_known_args(argv)
+
+def save_snapshot_on_exit(conn, window, focusme_data, file_name):
+    """
+    Writes the snapshot of the data on a clean shutdown. If a write failed,
+    the changes (or pomodoro sessions) are still queued and no snapshot is written.
+
+    Args:
+        conn (sqlite3.Connection): connection of the database worker
+        window (MainWindow): main window with the write-behind queue
+        focusme_data (FocusMeData): the loaded data
+        file_name (str): name of the snapshot file
+
+    Returns:
+        bool: True if the snapshot was written
+    """
+    if window.pending_writes.has_pending_writes() or window.pomodoro_engine.has_pending_sessions():
+        return False
+    return save_snapshot(conn, focusme_data, file_name)
+
 def main():
     """_summary_
     """
-    # initialize database
-    db_conn=initialize_database(db_name="focusme4.db")
+    args, qt_args = parse_args(sys.argv[1:])
+    # initialize database, the worker thread owns the connection
+    db_name = "focusme4.db"
+    db_worker = DatabaseWorker(db_name=db_name, profile=args.db_profile)
+    if args.instrument is not None:
+        logging.basicConfig(level=logging.INFO)
+        INSTRUMENTATION.enable()
+        db_worker.call(INSTRUMENTATION.attach)
     
-    focusme_data = generate_focusme_data_obj(db_conn)
+    project_loader = None
+    # the snapshot holds the fully loaded data, it is not used in lazy mode
+    snapshot_file = None if args.lazy or args.no_snapshot else snapshot_file_name(db_name)
+    if args.lazy:
+        focusme_data = db_worker.call(generate_focusme_headers_obj)
+        project_loader = LoadedProjectsLRU(max_loaded_projects=args.max_loaded_projects)
+    else:
+        # falls back to generate_focusme_data_obj if the snapshot is missing or stale
+        focusme_data, _ = db_worker.call(load_focusme_data, snapshot_file)
+    # completed repeating tasks return to the backlog with their next date, written in one transaction.
+    # In lazy mode only the start project is loaded, the others are rolled over when they are opened.
+    rolled_over = WriteBehindQueue()
+    for task in roll_over_done_tasks(focusme_data):
+        rolled_over.mark_task_dirty(task)
     focusme_control = FocusMeControl()
     if focusme_data.projects: #list is not empty
         focusme_control.set_current_project(focusme_data.projects[0])
+        if project_loader:
+            # the worker reads the rows, the model is only changed on this thread
+            project = focusme_control.current_project
+            project_loader.add_rows(project, db_worker.call(select_project_rows, project.name))
+            for task in roll_over_project(project):
+                rolled_over.mark_task_dirty(task)
         focusme_control.set_current_task(focusme_control.current_project.tasks[KanbanBoardColumns.BACKLOG.value][0])
+    db_worker.call(rolled_over.flush)
     
     # start application
-    app = QApplication(sys.argv)
-    window = MainWindow(focusme_data, focusme_control, db_conn)
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(focusme_data, focusme_control, db_worker, project_loader)
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    # final flush, nothing written on close may be lost
+    window.flush_pending_writes()
+    if snapshot_file:
+        # runs after the queued writes
+        db_worker.call(save_snapshot_on_exit, window, focusme_data, snapshot_file)
+    # executes all queued commands before the connection is closed
+    db_worker.close()
+    if args.instrument is not None:
+        INSTRUMENTATION.log_summary()
+        if args.instrument:
+            INSTRUMENTATION.export_json(args.instrument)
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
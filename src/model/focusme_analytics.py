@@ -0,0 +1,442 @@
+"""
+focusme_analytics computes planning metrics over the whole task and pomodoro
+history with NumPy: burndown, velocity and estimate accuracy.
+
+The columns are streamed from SQLite in chunks straight into preallocated
+NumPy arrays, no Task objects are created. Project, swimlane and tag are
+stored as integer codes with a tuple of their names (the code is the index
+in the tuple), dates as datetime64[D]. The tags are the single tag names of
+the TaskTags index, a task with several tags has a (row, tag) pair for each. The metrics are computed with
+vectorized operations (bincount, searchsorted) on these arrays.
+
+The Tasks table has no completion date, so the progress over time is taken
+from the session log (PomodoroSessions): the burndown subtracts the completed
+pomodoros from the estimate, the velocity counts them per period.
+
+Most of the load time is spent by the sqlite3 module creating a tuple per
+row, the metrics themselves take milliseconds. AnalyticsCache keeps the
+columns for repeated reports: the task columns are loaded again only after a
+change (change stamp, see focusme_snapshot), the session log is append-only
+and only the new sessions are loaded.
+
+NumPy is an optional dependency, only this module needs it. Without NumPy
+the functions raise ImportError.
+
+    Functions:
+        load_task_columns(conn, chunk_size=CHUNK_SIZE):
+            The columns of all tasks as TaskColumns.
+
+        load_session_columns(conn, first_day=None, last_day=None, after_id=None, chunk_size=CHUNK_SIZE):
+            The columns of the logged pomodoro sessions as SessionColumns.
+
+        AnalyticsCache:
+            Keeps the loaded columns while the database is unchanged.
+
+        burndown(tasks, sessions, first_day, last_day, project=None):
+            Remaining estimated pomodoros at the end of every day.
+
+        velocity(tasks, sessions, first_day, last_day, days=7, project=None):
+            Completed pomodoros per period.
+
+        estimate_accuracy(tasks, by="project", done_only=True):
+            Performed compared with estimated pomodoros per project, tag or swimlane.
+"""
+import itertools
+from model.focusme_model import KanbanBoardColumns, to_iso_date
+from model.focusme_snapshot import claim_change_stamp
+from model.focusme_instrumentation import instrumented
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# rows fetched from SQLite per chunk
+CHUNK_SIZE = 65536
+# stored for a missing date, NumPy reads it as NaT
+NAT = -2**63
+# days between 4714-11-24 BC (julianday 0) and 1970-01-01 (day 0 of datetime64[D])
+UNIX_EPOCH_JULIANDAY = 2440587.5
+SWIMLANES = tuple(col.value for col in KanbanBoardColumns)
+
+
+def require_numpy():
+    """
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Für die Auswertungen wird NumPy benötigt (pip install numpy).")
+
+
+def read_columns(cursor, n_columns, n_rows, chunk_size):
+    """
+    Reads the integer rows of an executed query into an (n, n_columns) int64 array.
+    The array is allocated for n_rows rows and grown if the query returns more.
+    """
+    values = np.empty((n_rows, n_columns), dtype=np.int64)
+    filled = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        if filled + len(rows) > len(values):
+            values = np.resize(values, (max(2 * len(values), filled + len(rows)), n_columns))
+        chunk = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64, count=len(rows) * n_columns)
+        values[filled:filled + len(rows)] = chunk.reshape(len(rows), n_columns)
+        filled += len(rows)
+    return values[:filled]
+
+
+def select_names(conn, column):
+    """
+    Returns the distinct project names of the statistics table in code order.
+    """
+    return tuple(row[0] for row in conn.execute(f"SELECT {column} FROM TaskStats GROUP BY {column} ORDER BY {column};"))
+
+
+def day_number(column):
+    """
+    Returns an SQL expression for the days of a date column since 1970-01-01, NAT for no or an invalid date.
+    """
+    return f"COALESCE(CAST(julianday({column}) - {UNIX_EPOCH_JULIANDAY} AS INTEGER), {NAT})"
+
+
+def code_mask(codes, names, name):
+    """
+    Returns the boolean mask of the rows whose code is the code of name, all False for an unknown name.
+    """
+    if name not in names:
+        return np.zeros(len(codes), dtype=bool)
+    return codes == names.index(name)
+
+
+def to_day(value):
+    """
+    Returns a date (date or str, see to_iso_date) as numpy.datetime64 with the unit day.
+    """
+    return np.datetime64(to_iso_date(value), "D")
+
+
+class TaskColumns:
+    """
+    The columns of all tasks as NumPy arrays, the rows are in the order of the task ids.
+
+    Attributes:
+        id (ndarray of int64): The task ids.
+        project, swimlane (ndarray of int32): Codes, the index in projects and SWIMLANES,
+            -1 for an unknown swimlane.
+        tag, tag_row (ndarray of int32, int64): The (tag code, row) pairs of the task tags ordered
+            by row, a task has one pair per tag name, a task without tag one pair with the tag "".
+        estimated, performed (ndarray of int32): The estimated and performed pomodoros, 0 if not set.
+        date (ndarray of datetime64[D]): date_to_perform, NaT if not set.
+        projects, swimlanes, tags (tuple of str): The names of the codes.
+    """
+    __slots__ = ("id", "project", "swimlane", "tag", "tag_row", "estimated", "performed", "date",
+                 "projects", "swimlanes", "tags")
+
+    def __len__(self):
+        return len(self.id)
+
+
+class SessionColumns:
+    """
+    The columns of logged pomodoro sessions as NumPy arrays, the rows are in the order they were logged.
+
+    Attributes:
+        id (ndarray of int64): The session ids.
+        task_id (ndarray of int64): The task of the session.
+        day (ndarray of datetime64[D]): The day the session was started.
+        completed (ndarray of bool): False for an aborted session.
+        duration (ndarray of int32): The length in seconds.
+    """
+    __slots__ = ("id", "task_id", "day", "completed", "duration")
+
+    def __len__(self):
+        return len(self.id)
+
+    def append(self, other):
+        """
+        Returns the sessions of self followed by the sessions of other.
+        """
+        sessions = SessionColumns()
+        for name in SessionColumns.__slots__:
+            setattr(sessions, name, np.concatenate((getattr(self, name), getattr(other, name))))
+        return sessions
+
+
+@instrumented
+def load_task_columns(conn, chunk_size=CHUNK_SIZE):
+    """
+    Streams the columns of all tasks into NumPy arrays. The codes and the dates
+    are computed by SQLite, the rows are copied in chunks without Python objects
+    per task.
+
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        chunk_size (int, optional): Rows per fetch. Defaults to CHUNK_SIZE.
+
+    Returns:
+        TaskColumns: The columns.
+    """
+    require_numpy()
+    columns = TaskColumns()
+    columns.projects = select_names(conn, "project")
+    columns.tags = tuple(row[0] for row in conn.execute("""
+        SELECT '' WHERE EXISTS (SELECT 1 FROM Tasks WHERE NOT EXISTS (SELECT 1 FROM TaskTags WHERE task_id = Tasks.id))
+        UNION
+        SELECT name FROM Tags WHERE EXISTS (SELECT 1 FROM TaskTags WHERE tag_id = Tags.id)
+        ORDER BY 1;
+    """))
+    columns.swimlanes = SWIMLANES
+    swimlane_cases = " ".join(f"WHEN ? THEN {code}" for code in range(len(SWIMLANES)))
+    n_rows = conn.execute("SELECT COUNT(*) FROM Tasks;").fetchone()[0]
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        WITH projects AS (SELECT project AS name, ROW_NUMBER() OVER (ORDER BY project) - 1 AS code
+                          FROM TaskStats GROUP BY project)
+        SELECT Tasks.id, COALESCE(projects.code, -1),
+               CASE assigned_kanban_swimlane {swimlane_cases} ELSE -1 END,
+               COALESCE(estimated_pomodoros, 0), COALESCE(performed_pomodoros, 0),
+               {day_number("date_to_perform")}
+        FROM Tasks
+        LEFT JOIN projects ON projects.name = Tasks.assigned_project
+        ORDER BY Tasks.id;
+    """, SWIMLANES)
+    values = read_columns(cursor, 6, n_rows, chunk_size)
+    columns.id = values[:, 0].copy()
+    columns.project = values[:, 1].astype(np.int32)
+    columns.swimlane = values[:, 2].astype(np.int32)
+    columns.estimated = values[:, 3].astype(np.int32)
+    columns.performed = values[:, 4].astype(np.int32)
+    columns.date = values[:, 5].astype("datetime64[D]")
+    # "" sorts before the tag names, so it has the code 0 if there are tasks without tag
+    untagged = 1 if columns.tags[:1] == ("",) else 0
+    cursor.execute("""
+        WITH tag_codes AS (SELECT id, ROW_NUMBER() OVER (ORDER BY name) - 1 + ? AS code
+                           FROM Tags WHERE EXISTS (SELECT 1 FROM TaskTags WHERE tag_id = Tags.id))
+        SELECT task_id, code FROM TaskTags JOIN tag_codes ON tag_codes.id = TaskTags.tag_id
+        UNION ALL
+        SELECT id, 0 FROM Tasks WHERE NOT EXISTS (SELECT 1 FROM TaskTags WHERE task_id = Tasks.id)
+        ORDER BY 1, 2;
+    """, (untagged,))
+    pairs = read_columns(cursor, 2, len(columns), chunk_size)
+    columns.tag_row = np.searchsorted(columns.id, pairs[:, 0])
+    columns.tag = pairs[:, 1].astype(np.int32)
+    return columns
+
+
+@instrumented
+def load_session_columns(conn, first_day=None, last_day=None, after_id=None, chunk_size=CHUNK_SIZE):
+    """
+    Streams the columns of the logged pomodoro sessions into NumPy arrays. The
+    date range is read with the index on started_at.
+
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        first_day (date | str, optional): Only sessions started on or after this day.
+        last_day (date | str, optional): Only sessions started on or before this day.
+        after_id (int, optional): Only sessions with a greater id, i.e. logged later.
+        chunk_size (int, optional): Rows per fetch. Defaults to CHUNK_SIZE.
+
+    Returns:
+        SessionColumns: The columns.
+    """
+    require_numpy()
+    conditions = []
+    params = []
+    if first_day is not None:
+        conditions.append("started_at >= ?")
+        params.append(to_iso_date(first_day))
+    if last_day is not None:
+        # the timestamps of last_day (YYYY-MM-DDTHH:MM:SS) sort before YYYY-MM-DDU
+        conditions.append("started_at < ?")
+        params.append(to_iso_date(last_day) + "U")
+    if after_id is not None:
+        conditions.append("id > ?")
+        params.append(after_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    n_rows = conn.execute(f"SELECT COUNT(*) FROM PomodoroSessions {where};", params).fetchone()[0]
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT id, task_id, {day_number("started_at")}, completed,
+               COALESCE(CAST(round((julianday(ended_at) - julianday(started_at)) * 86400) AS INTEGER), 0)
+        FROM PomodoroSessions
+        {where}
+        ORDER BY id;
+    """, params)
+    values = read_columns(cursor, 5, n_rows, chunk_size)
+    sessions = SessionColumns()
+    sessions.id = values[:, 0].copy()
+    sessions.task_id = values[:, 1].copy()
+    sessions.day = values[:, 2].astype("datetime64[D]")
+    sessions.completed = values[:, 3] != 0
+    sessions.duration = values[:, 4].astype(np.int32)
+    return sessions
+
+
+class AnalyticsCache:
+    """
+    Keeps the columns of load_task_columns and load_session_columns for
+    repeated reports. The task columns are loaded again after Projects, Tasks
+    or Subtasks were changed, the sessions logged since the last call are appended.
+    """
+    def __init__(self):
+        self.stamp = None
+        self.task_columns = None
+        self.session_columns = None
+
+    def tasks(self, conn):
+        """
+        Args:
+            conn (sqlite3.Connection): The database connection object.
+
+        Returns:
+            TaskColumns: The columns of all tasks.
+        """
+        stamp = claim_change_stamp(conn)
+        if self.task_columns is None or stamp != self.stamp:
+            self.task_columns = load_task_columns(conn)
+            self.stamp = stamp
+        return self.task_columns
+
+    def sessions(self, conn):
+        """
+        Args:
+            conn (sqlite3.Connection): The database connection object.
+
+        Returns:
+            SessionColumns: The columns of all logged sessions.
+        """
+        if self.session_columns is None:
+            self.session_columns = load_session_columns(conn)
+        else:
+            last_id = int(self.session_columns.id[-1]) if len(self.session_columns) else 0
+            new_sessions = load_session_columns(conn, after_id=last_id)
+            if len(new_sessions):
+                self.session_columns = self.session_columns.append(new_sessions)
+        return self.session_columns
+
+
+def session_projects(tasks, sessions):
+    """
+    Returns the project codes of the tasks of the sessions, -1 for tasks that no longer exist.
+    The task ids are sorted, the tasks are found with searchsorted.
+    """
+    if not len(tasks):
+        return np.full(len(sessions), -1, dtype=np.int32)
+    position = np.minimum(np.searchsorted(tasks.id, sessions.task_id), len(tasks) - 1)
+    return np.where(tasks.id[position] == sessions.task_id, tasks.project[position], -1)
+
+
+def burndown(tasks, sessions, first_day, last_day, project=None):
+    """
+    Computes the burndown of the estimated pomodoros: the estimate of all tasks
+    minus the pomodoros completed up to the end of every day (not below 0).
+    Sessions before first_day are subtracted from the first day on.
+
+    Args:
+        tasks (TaskColumns): The tasks, see load_task_columns.
+        sessions (SessionColumns): The sessions, see load_session_columns.
+        first_day (date | str): The first day.
+        last_day (date | str): The last day.
+        project (str, optional): Only the tasks and sessions of this project.
+
+    Returns:
+        tuple: (days, remaining, ideal) with
+            - days (ndarray of datetime64[D]): first_day to last_day.
+            - remaining (ndarray of int64): The remaining estimated pomodoros at the end of the day.
+            - ideal (ndarray of float64): The line from the first remaining value to 0 on last_day.
+    """
+    require_numpy()
+    days = np.arange(to_day(first_day), to_day(last_day) + 1)
+    task_mask = slice(None) if project is None else code_mask(tasks.project, tasks.projects, project)
+    session_mask = sessions.completed.copy()
+    if project is not None:
+        session_mask &= code_mask(session_projects(tasks, sessions), tasks.projects, project)
+    scope = int(tasks.estimated[task_mask].sum(dtype=np.int64))
+    completed_days = np.sort(sessions.day[session_mask])
+    completed = np.searchsorted(completed_days, days, side="right")
+    remaining = np.maximum(scope - completed, 0)
+    ideal = np.linspace(remaining[0] if len(days) else 0, 0, len(days))
+    return days, remaining, ideal
+
+
+def velocity(tasks, sessions, first_day, last_day, days=7, project=None):
+    """
+    Counts the completed pomodoros per period of days, starting at first_day.
+
+    Args:
+        tasks (TaskColumns): The tasks, see load_task_columns, for the projects of the sessions.
+        sessions (SessionColumns): The sessions, see load_session_columns.
+        first_day (date | str): The first day of the first period.
+        last_day (date | str): The last day, the last period may be shorter.
+        days (int, optional): The length of a period. Defaults to 7 (weeks).
+        project (str, optional): Only the sessions of this project.
+
+    Returns:
+        tuple: (starts, completed) with
+            - starts (ndarray of datetime64[D]): The first day of every period.
+            - completed (ndarray of int64): The completed pomodoros of the period.
+    """
+    require_numpy()
+    first = to_day(first_day)
+    last = to_day(last_day)
+    n_periods = max(0, int((last - first).astype(np.int64)) // days + 1)
+    mask = sessions.completed & (sessions.day >= first) & (sessions.day <= last)
+    if project is not None:
+        mask &= code_mask(session_projects(tasks, sessions), tasks.projects, project)
+    periods = (sessions.day[mask] - first).astype(np.int64) // days
+    completed = np.bincount(periods, minlength=n_periods)[:n_periods]
+    starts = first + np.arange(n_periods) * days
+    return starts, completed
+
+
+def estimate_accuracy(tasks, by="project", done_only=True):
+    """
+    Compares the performed with the estimated pomodoros of the tasks with an
+    estimate, grouped by project, tag or swimlane. A task with several tags is
+    counted in each of its tags.
+
+    Args:
+        tasks (TaskColumns): The tasks, see load_task_columns.
+        by (str, optional): "project", "tag" or "swimlane". Defaults to "project".
+        done_only (bool, optional): Only the tasks in the DONE swimlane. Defaults to True.
+
+    Returns:
+        dict: with the arrays in the order of names
+            - names (tuple of str): The groups.
+            - tasks (ndarray of int64): The number of tasks with an estimate.
+            - estimated, performed (ndarray of int64): The sums of the pomodoros.
+            - ratio (ndarray of float64): performed / estimated, NaN for a group without tasks.
+            - median_ratio (float): The median of performed / estimated of the single tasks,
+              NaN without tasks.
+
+    Raises:
+        ValueError: If by is not "project", "tag" or "swimlane".
+    """
+    require_numpy()
+    if by not in ("project", "tag", "swimlane"):
+        raise ValueError(f"Unbekannte Gruppierung: {by}")
+    names = getattr(tasks, by + "s")
+    task_mask = tasks.estimated > 0
+    if done_only:
+        task_mask &= tasks.swimlane == SWIMLANES.index(KanbanBoardColumns.DONE.value)
+    if by == "tag":
+        rows, codes = tasks.tag_row, tasks.tag
+    else:
+        rows, codes = np.arange(len(tasks)), getattr(tasks, by)
+    mask = task_mask[rows] & (codes >= 0)
+    rows, codes = rows[mask], codes[mask]
+    estimated = tasks.estimated[rows].astype(np.int64)
+    performed = tasks.performed[rows].astype(np.int64)
+    count = np.bincount(codes, minlength=len(names))
+    estimated_sum = np.bincount(codes, weights=estimated, minlength=len(names)).astype(np.int64)
+    performed_sum = np.bincount(codes, weights=performed, minlength=len(names)).astype(np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(estimated_sum > 0, performed_sum / np.maximum(estimated_sum, 1), np.nan)
+    # every task once, also with several tags
+    rows = np.unique(rows)
+    median_ratio = float(np.median(tasks.performed[rows] / tasks.estimated[rows])) if len(rows) else float("nan")
+    return {"names": names, "tasks": count, "estimated": estimated_sum, "performed": performed_sum,
+            "ratio": ratio, "median_ratio": median_ratio}
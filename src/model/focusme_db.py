@@ -4,16 +4,77 @@
     Functions:
         initialize_database(conn=None, db_name=None):
         
+        connect_database(db_name=None, profile="default"):
+            Opens a connection and applies a named performance profile (WAL, synchronous, ...).
+        
+        migrate_database(conn):
+            Upgrades the schema in place using PRAGMA user_version.
+        
         save_focusme_model_to_db(conn, focusme_model):
         
         generate_focusme_data_obj(conn):
         
+        generate_focusme_headers_obj(conn):
+            Loads only the project headers (id, name, task counts).
+        
+        select_project_rows(conn, project_name):
+            Reads the task and subtask rows of a single project (e.g. on the database worker).
+        
+        load_project_tasks(conn, project):
+            Loads the tasks of a single project on demand.
+        
+        LoadedProjectsLRU:
+            Keeps the tasks of the most recently viewed projects loaded.
+        
+        select_tasks_due_between(conn, first_day=None, last_day=None, include_done=True, limit=None):
+            Tasks of all projects in a date range (index on date_to_perform), e.g. for an agenda.
+        
+        select_overdue_tasks(conn, today=None, limit=None):
+            Tasks of all projects that are not done and due before today.
+        
+        select_statistics(conn, group_by=("project",)):
+            Task, pomodoro and subtask totals by project, tag and swimlane, read from
+            the TaskStats summary table that triggers keep current. By tag a task is
+            counted in each of its tag names.
+        
+        select_project_statistics(conn):
+            The totals of every project by name.
+        
+        select_tags(conn):
+            All tags (Tags table) with the number of their tasks.
+        
+        select_tasks_by_tags(conn, tags, match_all=False, project_name=None):
+            Tasks with any or all of the tags, found with the TaskTags index.
+        
+        search_tasks(conn, text, limit=50):
+            Full-text search (FTS5, bm25 ranked) over the tasks and subtasks of all projects.
+        
+        bulk_search_indexing(cursor, first_task_id):
+            Indexes bulk inserted tasks with one statement instead of the per-row triggers.
+        
+        transaction(conn):
+            Context manager providing a UnitOfWork that writes all collected
+            inserts and updates with executemany in one commit (in a savepoint
+            if the connection is already in a transaction).
+        
+        WriteBehindQueue:
+            Merges task and subtask edits and writes them in one transaction.
+        
+        select_all_tasks_table(conn):
+            Loads the tasks of all projects with a single query.
+        
+        select_all_subtasks_table(conn):
+            Loads the subtasks of all tasks with a single query.
+        
         load_project_tasks_from_db(cursor, project_name):
             Loads tasks associated with a specific project from the database.
         
         add_project_to_db(conn, project) -> int:
             Adds a project to the database and returns the ID of the newly inserted project.
         
+        delete_project_from_db(conn, project):
+            Deletes a project with its tasks, subtasks and pomodoro sessions.
+        
         get_project_by_name(conn, project_name):
             Retrieves a project by its name from the database.
         
@@ -21,33 +82,118 @@
         
         generate_task_obj(task_row):
         
+        intern_string(value):
+            Interns low-cardinality strings (swimlane, repeat, tag, project name) on load.
+        
         get_table_schema(conn, table_name):
             Retrieves the schema of a specified `table` in the database.
         
         update_task_in_db(conn, task):
         
         add_task_to_db(conn, task):
+    
+    The database functions are decorated with focusme_instrumentation.instrumented,
+    their calls, latencies, rows and statements are recorded when the
+    instrumentation is enabled.
 """
 import sqlite3
-from model.focusme_model import Task, Subtask, Project, FocusMeData
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from model.focusme_model import Task, Subtask, Project, FocusMeData, KanbanBoardColumns, RANK_STEP, DATE_FORMAT, \
+                                to_iso_date
+from model.focusme_instrumentation import instrumented
+
+# number of projects whose tasks are kept in memory in lazy loading mode
+DEFAULT_MAX_LOADED_PROJECTS = 8
+# bm25 weights of the columns taskname, description, tag and subtasks of TaskSearch
+SEARCH_WEIGHTS = (10.0, 2.0, 5.0, 1.0)
+
+# Named SQLite performance profiles, applied with PRAGMA statements on every connection.
+PERFORMANCE_PROFILES = {
+    # SQLite defaults: rollback journal, full fsync on every commit
+    "default": {},
+    # WAL journal, fsync only at checkpoints, larger page cache and memory mapped I/O
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,  # negative value: size in KiB
+        "temp_store": "MEMORY",
+    },
+    # WAL journal, but fsync on every commit
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+@instrumented
+def apply_performance_profile(conn, profile="default"):
+    """
+    Applies a named performance profile to a database connection.
+    The PRAGMA settings are per connection, so every new connection must
+    be configured with this function.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        profile (str): Name of a profile in PERFORMANCE_PROFILES.
+    Returns:
+        sqlite3.Connection: The configured connection.
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    if profile not in PERFORMANCE_PROFILES:
+        raise ValueError(f"Unbekanntes Performance-Profil '{profile}'.")
+    for pragma, value in PERFORMANCE_PROFILES[profile].items():
+        conn.execute(f"PRAGMA {pragma} = {value};")
+    return conn
+
+
+@instrumented
+def connect_database(db_name=None, profile="default"):
+    """
+    Opens a connection to the database and applies the performance profile.
+    Args:
+        db_name (str, optional): The name of the SQLite database file. Defaults to None (in-memory).
+        profile (str): Name of a profile in PERFORMANCE_PROFILES.
+    Returns:
+        sqlite3.Connection: The configured connection.
+    """
+    if db_name:
+        conn = sqlite3.connect(db_name)  # Persistente Datenbank
+    else:
+        conn = sqlite3.connect(":memory:")  # In-Memory-Datenbank
+    return apply_performance_profile(conn, profile)
+
 
-def initialize_database(conn=None, db_name=None):
+@instrumented
+def initialize_database(conn=None, db_name=None, profile=None):
     """
     Initializes the database with the required tables: Projects, Tasks, and Subtasks.
+    Afterwards the schema migrations (e.g. indexes) are applied with migrate_database.
     If a connection object is not provided, it will create a new SQLite connection.
     If a database name is provided, it will connect to that database; otherwise, 
     it will use an in-memory database.
     Args:
         conn (sqlite3.Connection, optional): An existing SQLite connection object. Defaults to None.
         db_name (str, optional): The name of the SQLite database file. Defaults to None.
+        profile (str, optional): Name of a performance profile in PERFORMANCE_PROFILES that is
+                                 applied to the connection. Defaults to None ("default" for new
+                                 connections, an existing connection is left unchanged).
     Returns:
         sqlite3.Connection: The SQLite connection object with the initialized database.
     """
     if conn is None:
-        if db_name:
-            conn = sqlite3.connect(db_name)  # Persistente Datenbank
-        else:
-            conn = sqlite3.connect(":memory:")  # In-Memory-Datenbank
+        conn = connect_database(db_name, profile or "default")
+    elif profile is not None:
+        apply_performance_profile(conn, profile)
     cursor = conn.cursor()
     # Tabellen erstellen
     cursor.execute("""
@@ -85,52 +231,604 @@ def initialize_database(conn=None, db_name=None):
     """)
     
     conn.commit()
+    migrate_database(conn)
     return conn
 
+
+# Statements of the TaskStats triggers (migration 7). A task is counted in the row of its
+# project, tag and swimlane together with its subtasks; subtasks inserted before their
+# task are counted by the task insert, subtasks of a task that does not exist are not counted.
+TASK_STATS_ADD = """
+    INSERT INTO TaskStats (project, tag, swimlane, tasks, estimated_pomodoros, performed_pomodoros,
+                           subtasks, subtasks_done)
+    SELECT NEW.assigned_project, COALESCE(NEW.tag, ''), NEW.assigned_kanban_swimlane, 1,
+           COALESCE(NEW.estimated_pomodoros, 0), COALESCE(NEW.performed_pomodoros, 0),
+           COUNT(*), COALESCE(SUM(COALESCE(status, 0) != 0), 0)
+    FROM Subtasks WHERE task_id = NEW.id
+    ON CONFLICT (project, tag, swimlane) DO UPDATE SET
+        tasks = tasks + 1,
+        estimated_pomodoros = estimated_pomodoros + excluded.estimated_pomodoros,
+        performed_pomodoros = performed_pomodoros + excluded.performed_pomodoros,
+        subtasks = subtasks + excluded.subtasks,
+        subtasks_done = subtasks_done + excluded.subtasks_done;
+"""
+TASK_STATS_REMOVE = """
+    UPDATE TaskStats SET
+        tasks = tasks - 1,
+        estimated_pomodoros = estimated_pomodoros - COALESCE(OLD.estimated_pomodoros, 0),
+        performed_pomodoros = performed_pomodoros - COALESCE(OLD.performed_pomodoros, 0),
+        subtasks = subtasks - (SELECT COUNT(*) FROM Subtasks WHERE task_id = OLD.id),
+        subtasks_done = subtasks_done - (SELECT COUNT(*) FROM Subtasks WHERE task_id = OLD.id AND COALESCE(status, 0) != 0)
+    WHERE project = OLD.assigned_project AND tag = COALESCE(OLD.tag, '') AND swimlane = OLD.assigned_kanban_swimlane;
+    DELETE FROM TaskStats
+    WHERE project = OLD.assigned_project AND tag = COALESCE(OLD.tag, '') AND swimlane = OLD.assigned_kanban_swimlane
+          AND tasks = 0;
+"""
+SUBTASK_STATS_ADD = """
+    UPDATE TaskStats SET subtasks = subtasks + 1, subtasks_done = subtasks_done + (COALESCE(NEW.status, 0) != 0)
+    WHERE (project, tag, swimlane) = (SELECT assigned_project, COALESCE(tag, ''), assigned_kanban_swimlane
+                                      FROM Tasks WHERE id = NEW.task_id);
+"""
+SUBTASK_STATS_REMOVE = """
+    UPDATE TaskStats SET subtasks = subtasks - 1, subtasks_done = subtasks_done - (COALESCE(OLD.status, 0) != 0)
+    WHERE (project, tag, swimlane) = (SELECT assigned_project, COALESCE(tag, ''), assigned_kanban_swimlane
+                                      FROM Tasks WHERE id = OLD.task_id);
+"""
+
+
+def tag_names_sql(tag):
+    """
+    Returns a table-valued SQL expression with the tag names of a tag column in
+    its column value: the text is split at the commas and the names are trimmed
+    like focusme_model.split_tags does it. json_quote escapes the text, so any
+    text is a valid JSON array after the commas are replaced.
+    """
+    return f"""json_each('[' || replace(json_quote({tag}), ',', '","') || ']')"""
+
+
+# Statements of the tag triggers (migration 8), the tags of Tasks.tag are kept in TaskTags
+TASK_TAGS_ADD = f"""
+    INSERT OR IGNORE INTO Tags (name)
+    SELECT trim(value) FROM {tag_names_sql("NEW.tag")} WHERE trim(value) != '';
+    INSERT OR IGNORE INTO TaskTags (task_id, tag_id)
+    SELECT NEW.id, Tags.id FROM {tag_names_sql("NEW.tag")} JOIN Tags ON Tags.name = trim(value);
+"""
+TASK_TAGS_REMOVE = """
+    DELETE FROM TaskTags WHERE task_id = OLD.id;
+"""
+
+# Schema migrations. Migration i (starting with 1) upgrades a database with
+# PRAGMA user_version i-1 to version i. A step is a SQL statement or a
+# function that gets a cursor. Never change a released migration, append a new one.
+MIGRATIONS = [
+    # 1: indexes for the per project, per task and per date lookups
+    [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_project_swimlane ON Tasks (assigned_project, assigned_kanban_swimlane);",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_date_to_perform ON Tasks (date_to_perform);",
+        "CREATE INDEX IF NOT EXISTS idx_subtasks_task_id ON Subtasks (task_id);",
+    ],
+    # 2: position of a task within its kanban swimlane, sparse ranks keep the insertion order
+    [
+        "ALTER TABLE Tasks ADD COLUMN kanban_rank REAL;",
+        f"UPDATE Tasks SET kanban_rank = id * {RANK_STEP};",
+        "DROP INDEX IF EXISTS idx_tasks_project_swimlane;",
+        "CREATE INDEX idx_tasks_project_swimlane ON Tasks (assigned_project, assigned_kanban_swimlane, kanban_rank);",
+    ],
+    # 3: full-text search over tasks and subtasks, one row per task (rowid = task id)
+    [
+        """
+        CREATE VIRTUAL TABLE TaskSearch USING fts5(
+            taskname, description, tag, subtasks,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        );
+        """,
+        """
+        INSERT INTO TaskSearch (rowid, taskname, description, tag, subtasks)
+        SELECT id, taskname, description, tag,
+               (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = Tasks.id)
+        FROM Tasks;
+        """,
+        """
+        CREATE TRIGGER task_search_insert AFTER INSERT ON Tasks BEGIN
+            INSERT INTO TaskSearch (rowid, taskname, description, tag, subtasks)
+            VALUES (NEW.id, NEW.taskname, NEW.description, NEW.tag,
+                    (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = NEW.id));
+        END;
+        """,
+        """
+        CREATE TRIGGER task_search_update AFTER UPDATE OF taskname, description, tag ON Tasks
+        WHEN OLD.taskname IS NOT NEW.taskname OR OLD.description IS NOT NEW.description OR OLD.tag IS NOT NEW.tag
+        BEGIN
+            UPDATE TaskSearch SET taskname = NEW.taskname, description = NEW.description, tag = NEW.tag
+            WHERE rowid = NEW.id;
+        END;
+        """,
+        """
+        CREATE TRIGGER task_search_delete AFTER DELETE ON Tasks BEGIN
+            DELETE FROM TaskSearch WHERE rowid = OLD.id;
+        END;
+        """,
+        """
+        CREATE TRIGGER subtask_search_insert AFTER INSERT ON Subtasks BEGIN
+            UPDATE TaskSearch
+            SET subtasks = (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = NEW.task_id)
+            WHERE rowid = NEW.task_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER subtask_search_update AFTER UPDATE OF description, task_id ON Subtasks
+        WHEN OLD.description IS NOT NEW.description OR OLD.task_id IS NOT NEW.task_id
+        BEGIN
+            UPDATE TaskSearch
+            SET subtasks = (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = TaskSearch.rowid)
+            WHERE rowid IN (OLD.task_id, NEW.task_id);
+        END;
+        """,
+        """
+        CREATE TRIGGER subtask_search_delete AFTER DELETE ON Subtasks BEGIN
+            UPDATE TaskSearch
+            SET subtasks = (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = OLD.task_id)
+            WHERE rowid = OLD.task_id;
+        END;
+        """,
+    ],
+    # 4: change stamp of the snapshot cache (focusme_snapshot), every write sets changed = 1
+    [
+        """
+        CREATE TABLE ChangeStamp (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            database_id TEXT NOT NULL,
+            counter INTEGER NOT NULL,
+            changed INTEGER NOT NULL
+        );
+        """,
+        "INSERT INTO ChangeStamp (id, database_id, counter, changed) VALUES (1, lower(hex(randomblob(8))), 0, 1);",
+    ] + [
+        # WHERE changed = 0: only the first write after a snapshot updates the row
+        f"""
+        CREATE TRIGGER {table.lower()}_change_stamp_{event.lower()} AFTER {event} ON {table} BEGIN
+            UPDATE ChangeStamp SET changed = 1 WHERE changed = 0;
+        END;
+        """
+        for table in ("Projects", "Tasks", "Subtasks") for event in ("INSERT", "UPDATE", "DELETE")
+    ],
+    # 5: date_to_perform as ISO 8601 date (YYYY-MM-DD) instead of dd.MM.yyyy, so the index
+    #    on date_to_perform can be used for date ranges and sorting; invalid dates become NULL
+    [
+        """
+        UPDATE Tasks
+        SET date_to_perform = substr(date_to_perform, 7, 4) || '-' || substr(date_to_perform, 4, 2) || '-'
+                              || substr(date_to_perform, 1, 2)
+        WHERE date_to_perform GLOB '[0-9][0-9].[0-9][0-9].[0-9][0-9][0-9][0-9]';
+        """,
+        "UPDATE Tasks SET date_to_perform = NULL WHERE date(date_to_perform) IS NOT date_to_perform;",
+    ],
+    # 6: log of the pomodoro sessions (focusme_pomodoro), times as ISO 8601 (YYYY-MM-DDTHH:MM:SS)
+    [
+        """
+        CREATE TABLE PomodoroSessions (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT NOT NULL,
+            completed INTEGER NOT NULL,
+            FOREIGN KEY (task_id) REFERENCES Tasks (id)
+        );
+        """,
+        "CREATE INDEX idx_pomodoro_sessions_task ON PomodoroSessions (task_id, started_at);",
+        "CREATE INDEX idx_pomodoro_sessions_started_at ON PomodoroSessions (started_at);",
+    ],
+    # 7: totals per (project, tag, swimlane) kept current by triggers, one row update per edit
+    [
+        """
+        CREATE TABLE TaskStats (
+            -- same affinity as Tasks.assigned_project (the project name), otherwise the
+            -- trigger lookups by the values of a task cannot use the primary key
+            project INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            swimlane TEXT NOT NULL,
+            tasks INTEGER NOT NULL,
+            estimated_pomodoros INTEGER NOT NULL,
+            performed_pomodoros INTEGER NOT NULL,
+            subtasks INTEGER NOT NULL,
+            subtasks_done INTEGER NOT NULL,
+            PRIMARY KEY (project, tag, swimlane)
+        ) WITHOUT ROWID;
+        """,
+        """
+        INSERT INTO TaskStats
+        SELECT assigned_project, COALESCE(tag, ''), assigned_kanban_swimlane, COUNT(*),
+               TOTAL(estimated_pomodoros), TOTAL(performed_pomodoros),
+               TOTAL(subtask_counts.subtasks), TOTAL(subtask_counts.subtasks_done)
+        FROM Tasks
+        LEFT JOIN (SELECT task_id, COUNT(*) AS subtasks, TOTAL(COALESCE(status, 0) != 0) AS subtasks_done
+                   FROM Subtasks GROUP BY task_id) AS subtask_counts ON subtask_counts.task_id = Tasks.id
+        GROUP BY 1, 2, 3;
+        """,
+        f"CREATE TRIGGER task_stats_insert AFTER INSERT ON Tasks BEGIN {TASK_STATS_ADD} END;",
+        f"CREATE TRIGGER task_stats_delete AFTER DELETE ON Tasks BEGIN {TASK_STATS_REMOVE} END;",
+        f"""
+        CREATE TRIGGER task_stats_update
+        AFTER UPDATE OF assigned_project, tag, assigned_kanban_swimlane, estimated_pomodoros, performed_pomodoros ON Tasks
+        WHEN OLD.assigned_project IS NOT NEW.assigned_project OR OLD.tag IS NOT NEW.tag
+             OR OLD.assigned_kanban_swimlane IS NOT NEW.assigned_kanban_swimlane
+             OR OLD.estimated_pomodoros IS NOT NEW.estimated_pomodoros
+             OR OLD.performed_pomodoros IS NOT NEW.performed_pomodoros
+        BEGIN {TASK_STATS_REMOVE} {TASK_STATS_ADD} END;
+        """,
+        f"CREATE TRIGGER subtask_stats_insert AFTER INSERT ON Subtasks BEGIN {SUBTASK_STATS_ADD} END;",
+        f"CREATE TRIGGER subtask_stats_delete AFTER DELETE ON Subtasks BEGIN {SUBTASK_STATS_REMOVE} END;",
+        f"""
+        CREATE TRIGGER subtask_stats_update AFTER UPDATE OF task_id, status ON Subtasks
+        WHEN OLD.task_id IS NOT NEW.task_id OR (COALESCE(OLD.status, 0) != 0) IS NOT (COALESCE(NEW.status, 0) != 0)
+        BEGIN {SUBTASK_STATS_REMOVE} {SUBTASK_STATS_ADD} END;
+        """,
+    ],
+    # 8: normalized tags, Tasks.tag holds the comma separated tag names of a task
+    [
+        "CREATE TABLE Tags (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);",
+        """
+        CREATE TABLE TaskTags (
+            task_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (task_id, tag_id),
+            FOREIGN KEY (task_id) REFERENCES Tasks (id),
+            FOREIGN KEY (tag_id) REFERENCES Tags (id)
+        ) WITHOUT ROWID;
+        """,
+        "CREATE INDEX idx_task_tags_tag ON TaskTags (tag_id, task_id);",
+        f"""
+        INSERT OR IGNORE INTO Tags (name)
+        SELECT trim(value) FROM Tasks, {tag_names_sql("Tasks.tag")} WHERE trim(value) != '' ORDER BY 1;
+        """,
+        f"""
+        INSERT OR IGNORE INTO TaskTags (task_id, tag_id)
+        SELECT Tasks.id, Tags.id FROM Tasks, {tag_names_sql("Tasks.tag")} JOIN Tags ON Tags.name = trim(value);
+        """,
+        f"CREATE TRIGGER task_tags_insert AFTER INSERT ON Tasks WHEN NEW.tag != '' BEGIN {TASK_TAGS_ADD} END;",
+        f"CREATE TRIGGER task_tags_delete AFTER DELETE ON Tasks BEGIN {TASK_TAGS_REMOVE} END;",
+        f"""
+        CREATE TRIGGER task_tags_update AFTER UPDATE OF tag ON Tasks WHEN OLD.tag IS NOT NEW.tag
+        BEGIN {TASK_TAGS_REMOVE} {TASK_TAGS_ADD} END;
+        """,
+    ],
+]
+
+
+@instrumented
+def get_schema_version(conn):
+    """
+    Returns the schema version of the database (PRAGMA user_version).
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        int: The schema version, 0 for a database without migrations.
+    """
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+@instrumented
+def migrate_database(conn):
+    """
+    Upgrades the database schema in place to the latest version.
+    Each migration runs in its own transaction together with the update of
+    PRAGMA user_version, so an interrupted upgrade can simply be repeated.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        int: The schema version after the upgrade.
+    Raises:
+        sqlite3.Error: If a migration fails. The failed migration is rolled back.
+    """
+    version = get_schema_version(conn)
+    cursor = conn.cursor()
+    for new_version, steps in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            cursor.execute("BEGIN IMMEDIATE;")
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(f"PRAGMA user_version = {new_version};")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Fehler bei der Migration auf Version {new_version}: {e}")
+            raise
+    return get_schema_version(conn)
+
+def build_search_query(text):
+    """
+    Turns the text of the search box into an FTS5 query. Every word is
+    quoted, so FTS5 operators typed by the user are searched as text, and
+    the last word is a prefix query for search-as-you-type.
+    Args:
+        text (str): The text typed by the user.
+    Returns:
+        str: The FTS5 query or None if the text contains no word.
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+@instrumented
+def search_tasks(conn, text, limit=50):
+    """
+    Searches the task names, descriptions, tags and subtask descriptions of all
+    projects. Only the FTS5 index and the matching rows of the Tasks table are read,
+    no project is loaded into FocusMeData.
+    All matches are ranked with bm25 (FTS5 rank with SEARCH_WEIGHTS), FTS5 keeps
+    only the best limit rows while it ranks, so no match is left out and the
+    other rows of Tasks are read only for the results.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        text (str): The text typed by the user.
+        limit (int, optional): The maximum number of results. Defaults to 50.
+    Returns:
+        list of tuple: The best matches first (bm25), each a tuple of
+            - id (int): The task id.
+            - taskname (str): The name of the task.
+            - assigned_project (str): The project the task is assigned to.
+            - assigned_kanban_swimlane (str): The kanban swimlane of the task.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return []
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT Tasks.id, Tasks.taskname, Tasks.assigned_project, Tasks.assigned_kanban_swimlane
+        FROM (
+            SELECT rowid, rank FROM TaskSearch
+            WHERE TaskSearch MATCH ? AND rank MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ) AS matches
+        JOIN Tasks ON Tasks.id = matches.rowid
+        ORDER BY matches.rank;
+    """, (query, f"bm25({', '.join(str(weight) for weight in SEARCH_WEIGHTS)})", limit))
+    return cursor.fetchall()
+
+@instrumented
+def select_tasks_due_between(conn, first_day=None, last_day=None, include_done=True, limit=None):
+    """
+    Selects the tasks of all projects whose date_to_perform is between first_day and
+    last_day (both included), e.g. for an agenda. The range is read from the index on
+    date_to_perform in date order, no project is loaded into FocusMeData.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        first_day (date | str, optional): The first day, None for no lower bound.
+        last_day (date | str, optional): The last day, None for no upper bound.
+        include_done (bool, optional): False to leave out the tasks in the DONE swimlane.
+        limit (int, optional): The maximum number of tasks, None for all.
+    Returns:
+        list of tuple: In date order (and id order within a day), each a tuple of
+            - id (int): The task id.
+            - taskname (str): The name of the task.
+            - assigned_project (str): The project the task is assigned to.
+            - assigned_kanban_swimlane (str): The kanban swimlane of the task.
+            - date_to_perform (str): The date as YYYY-MM-DD.
+    """
+    # tasks without date are not in the range, they sort before all dates in the index
+    conditions = ["date_to_perform IS NOT NULL"]
+    params = []
+    if first_day is not None:
+        conditions.append("date_to_perform >= ?")
+        params.append(to_iso_date(first_day))
+    if last_day is not None:
+        conditions.append("date_to_perform <= ?")
+        params.append(to_iso_date(last_day))
+    if not include_done:
+        conditions.append("assigned_kanban_swimlane != ?")
+        params.append(KanbanBoardColumns.DONE.value)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT id, taskname, assigned_project, assigned_kanban_swimlane, date_to_perform
+        FROM Tasks
+        WHERE {" AND ".join(conditions)}
+        ORDER BY date_to_perform, id
+        LIMIT ?;
+    """, (*params, -1 if limit is None else limit))
+    return cursor.fetchall()
+
+
+@instrumented
+def select_overdue_tasks(conn, today=None, limit=None):
+    """
+    Selects the tasks of all projects that are not done and whose date_to_perform
+    is before today, the oldest first. See select_tasks_due_between.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        today (date | str, optional): The current day. Defaults to date.today().
+        limit (int, optional): The maximum number of tasks, None for all.
+    Returns:
+        list of tuple: (id, taskname, assigned_project, assigned_kanban_swimlane, date_to_perform)
+    """
+    today = datetime.strptime(to_iso_date(today), DATE_FORMAT).date() if today is not None else date.today()
+    return select_tasks_due_between(conn, last_day=today - timedelta(days=1), include_done=False, limit=limit)
+
+# columns of TaskStats a report can be grouped by, the tag is a single tag name of the row (see select_statistics)
+STATISTICS_GROUPS = {"project": "TaskStats.project", "tag": "COALESCE(stats_tags.name, '')",
+                     "swimlane": "TaskStats.swimlane"}
+
+
+@instrumented
+def select_statistics(conn, group_by=("project",)):
+    """
+    Selects the totals of the tasks from the TaskStats summary table (schema
+    migration 7), which the triggers keep current on every edit. The report reads
+    one row per (project, tag, swimlane) instead of all tasks and subtasks.
+    TaskStats is keyed by the tag text of the tasks (e.g. "Home, Work"), grouped
+    by tag the rows are split into the single tag names like TaskTags does it: a
+    task with several tags is counted in the group of each of its tags, so the
+    tag groups overlap and their sum can exceed the total.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        group_by (tuple of str, optional): Any of "project", "tag" and "swimlane", () for the total
+            of all tasks. Defaults to ("project",). Tasks without tag have the tag "".
+    Returns:
+        list of tuple: Ordered by the group columns, each the group columns followed by
+            tasks, estimated_pomodoros, performed_pomodoros, subtasks, subtasks_done (int).
+    Raises:
+        ValueError: If group_by contains another name.
+    """
+    for name in group_by:
+        if name not in STATISTICS_GROUPS:
+            raise ValueError(f"Unbekannte Gruppierung: {name}")
+    expressions = [STATISTICS_GROUPS[name] for name in group_by]
+    columns = "".join(f"{expression}, " for expression in expressions)
+    group = f"GROUP BY {', '.join(expressions)} ORDER BY {', '.join(expressions)}" if group_by else ""
+    tags = ""
+    if "tag" in group_by:
+        # the tag names of every row, a row without names is kept with the tag ""
+        tags = f"""
+            LEFT JOIN (SELECT DISTINCT project, tag, swimlane, trim(value) AS name
+                       FROM TaskStats, {tag_names_sql("tag")} WHERE trim(value) != '') AS stats_tags
+            ON (stats_tags.project, stats_tags.tag, stats_tags.swimlane) =
+               (TaskStats.project, TaskStats.tag, TaskStats.swimlane)"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT {columns}TOTAL(tasks), TOTAL(estimated_pomodoros), TOTAL(performed_pomodoros),
+               TOTAL(subtasks), TOTAL(subtasks_done)
+        FROM TaskStats{tags}
+        {group};
+    """)
+    return [row[:len(group_by)] + tuple(int(value) for value in row[len(group_by):]) for row in cursor.fetchall()]
+
+
+@instrumented
+def select_project_statistics(conn):
+    """
+    Selects the totals of every project, e.g. for the project list.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        dict: project name -> (tasks, estimated_pomodoros, performed_pomodoros, subtasks, subtasks_done),
+            projects without tasks are missing.
+    """
+    return {row[0]: row[1:] for row in select_statistics(conn, ("project",))}
+
+@instrumented
+def select_tags(conn):
+    """
+    Selects all tags with the number of their tasks, e.g. for a tag filter.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        list of tuple: (name, number of tasks) ordered by name, tags without tasks have 0.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT name, (SELECT COUNT(*) FROM TaskTags WHERE tag_id = Tags.id) FROM Tags ORDER BY name;
+    """)
+    return cursor.fetchall()
+
+
+@instrumented
+def select_tasks_by_tags(conn, tags, match_all=False, project_name=None):
+    """
+    Selects the tasks that have one (match_all=False) or all (match_all=True) of
+    the tags, also of projects that are not loaded. The tasks are found with the
+    index on TaskTags (tag_id, task_id), the cost depends on the number of matches.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        tags (iterable of str): The tag names.
+        match_all (bool, optional): True for tasks with all tags. Defaults to False.
+        project_name (str, optional): Only the tasks of this project.
+    Returns:
+        list of tuple: (id, taskname, assigned_project, assigned_kanban_swimlane) in board order,
+            ordered by project, swimlane and kanban_rank.
+    """
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return []
+    params = list(tags)
+    project_condition = ""
+    if project_name is not None:
+        project_condition = "AND assigned_project = ?"
+        params.append(project_name)
+    having = f"HAVING COUNT(*) = {len(tags)}" if match_all else ""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT Tasks.id, taskname, assigned_project, assigned_kanban_swimlane
+        FROM Tags
+        JOIN TaskTags ON TaskTags.tag_id = Tags.id
+        JOIN Tasks ON Tasks.id = TaskTags.task_id
+        WHERE Tags.name IN ({", ".join("?" * len(tags))}) {project_condition}
+        GROUP BY Tasks.id
+        {having}
+        ORDER BY assigned_project, assigned_kanban_swimlane, kanban_rank, Tasks.id;
+    """, params)
+    return cursor.fetchall()
+
+# search index triggers that are suspended during bulk inserts
+SEARCH_INSERT_TRIGGERS = ("task_search_insert", "subtask_search_insert")
+
+
+@contextmanager
+def bulk_search_indexing(cursor, first_task_id):
+    """
+    Context manager for bulk inserts of tasks with ids >= first_task_id and their subtasks.
+    The search index insert triggers are suspended and the new tasks are indexed with a
+    single INSERT ... SELECT at the end, which is about three times faster than the
+    triggers. Must be used inside a transaction; if the transaction is rolled back,
+    the triggers are restored as well.
+    Args:
+        cursor (sqlite3.Cursor): A cursor of the database connection.
+        first_task_id (int): The id of the first inserted task.
+    """
+    cursor.execute(f"""
+        SELECT sql FROM sqlite_master
+        WHERE type = 'trigger' AND name IN ({", ".join("?" * len(SEARCH_INSERT_TRIGGERS))});
+    """, SEARCH_INSERT_TRIGGERS)
+    trigger_sql = [row[0] for row in cursor.fetchall()]
+    for name in SEARCH_INSERT_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name};")
+    yield
+    cursor.execute("""
+        INSERT INTO TaskSearch (rowid, taskname, description, tag, subtasks)
+        SELECT id, taskname, description, tag,
+               (SELECT group_concat(description, ' ') FROM Subtasks WHERE task_id = Tasks.id)
+        FROM Tasks
+        WHERE id >= ?;
+    """, (first_task_id,))
+    for sql in trigger_sql:
+        cursor.execute(sql)
+
+@instrumented
 def save_focusme_model_to_db(conn, focusme_model):
     """
-    Saves the FocusMe model data to the database.
+    Saves the FocusMe model data to the database in one transaction.
     Args:
         conn (sqlite3.Connection): The SQLite database connection object.
-        focusme_model (FocusMeModel): The FocusMe model object containing projects, tasks, and subtasks.
+        focusme_model (FocusMeData): The FocusMe model object containing projects, tasks, and subtasks.
     The function performs the following operations:
-        1. Iterates over the projects in the focusme_model.
-        2. Inserts each project into the Projects `table`.
-        3. For each project, iterates over the kanban swimlanes and their associated tasks.
-        4. Inserts each task into the Tasks `table`, associating it with the corresponding project and kanban swimlane.
-        5. For each task, iterates over its subtasks and inserts them into the Subtasks `table`, associating them with the corresponding task.
-    The function commits the transaction to the database after all operations are completed.
+        1. Inserts the projects, tasks and subtasks without id (not stored yet).
+        2. Updates the tasks and subtasks that are already stored.
+    Projects whose tasks are not loaded (lazy mode) only have their header saved.
+    Raises:
+        sqlite3.Error: If an error occurs during the database operation.
     """
-    
-    cursor = conn.cursor()
-    
-    # Projekte speichern
-    for project in focusme_model.projects:  # Annahme: focusme_model.projects ist eine Liste von Projekten
-        cursor.execute("INSERT INTO Projects (name) VALUES (?);", (project.name,))
-        project_id = cursor.lastrowid
-        
-        # Tasks pro Kanban-Spalte speichern
-        for kanban_swimlane, tasks in project.kanban.items():
-            for task in tasks:
-                cursor.execute("""
-                    INSERT INTO Tasks (
-                        taskname, description, estimated_pomodoros, performed_pomodoros, 
-                        date_to_perform, repeat, assigned_project, assigned_kanban_swimlane, tag
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-                """, (
-                    task.taskname, task.description, task.estimated_pomodoros,
-                    task.performed_pomodoros,
-                    task.date_to_perform, task.repeat, project_id, kanban_swimlane,
-                    task.tag
-                ))
-                task_id = cursor.lastrowid
-                # Subtasks speichern
-                for subtask in task.subtasks:
-                    cursor.execute("INSERT INTO Subtasks (task_id, subtaskname) VALUES (?, ?);",
-                                   (task_id, subtask))
-    conn.commit()
+    with transaction(conn) as uow:
+        for project in focusme_model.projects:
+            if project.id is None:
+                uow.add_project(project)
+            for tasks in project.tasks.values():
+                for task in tasks:
+                    if task.id is None:
+                        uow.add_task(task)
+                        continue
+                    uow.update_task(task)
+                    for subtask in task.subtasks:
+                        if subtask.id is None:
+                            uow.add_subtask(subtask, task)
+                        else:
+                            uow.update_subtask(subtask)
 
 
+@instrumented
 def generate_focusme_data_obj(conn):
     """
     Generates a FocusMeData object by loading projects and their tasks from the database.
@@ -140,10 +838,13 @@ def generate_focusme_data_obj(conn):
         FocusMeData: An object containing all projects and their associated tasks.
     The function performs the following steps:
     1. Initializes a FocusMeData object.
-    2. Creates a cursor from the database connection.
-    3. Executes a SQL query to load all projects from the 'Projects' `table`.
-    4. Iterates over each project, loading its tasks and reconstructing the Project object.
+    2. Loads all projects, all tasks and all subtasks with one query per `table`.
+    3. Groups the tasks by their assigned project and the subtasks by their task id
+       in a single pass over the rows.
+    4. Reconstructs each Project object from its grouped task and subtask rows.
     5. Adds each reconstructed Project object to the FocusMeData object.
+    The number of queries does not depend on the number of projects and the object
+    graph is built in time proportional to the number of rows.
     """
     focusme_data = FocusMeData()
     cursor = conn.cursor()
@@ -151,19 +852,182 @@ def generate_focusme_data_obj(conn):
     # Load all projects from the database
     cursor.execute("SELECT id, name FROM Projects;")
     projects = cursor.fetchall()
-    
+
+    # group tasks by project (assigned_project holds the project name)
+    tasks_by_project = {}
+    for task_row in select_all_tasks_table(conn):
+        tasks_by_project.setdefault(task_row[9], []).append(task_row)
+    # group subtasks by task id
+    subtasks_by_task = {}
+    for subtask_row in select_all_subtasks_table(conn):
+        subtasks_by_task.setdefault(subtask_row[3], []).append(subtask_row)
+
     for project_id, project_name in projects:
-        project_table = select_project_table(conn, project_id)
-        # get alls tasks of the project
-        tasks_table = select_task_table(conn, project_name)
-        subtask_table= select_subtask_table(conn, project_id)
         # reconstruct Project-Object
-        project = generate_project_obj(project_table, tasks_table, subtask_table)
+        project = Project(project_name, project_id)
+        populate_project_obj(project, tasks_by_project.get(project_name, ()), subtasks_by_task)
         # Füge das Projekt zu FocusMeData hinzu
         focusme_data.add_project(project)
 
     return focusme_data
 
+
+@instrumented
+def populate_project_obj(project, tasks_table, subtasks_by_task):
+    """
+    Adds Task objects built from task rows to a project.
+    Args:
+        project (Project): The project the tasks are added to.
+        tasks_table (list of tuple): Task rows as returned by select_task_table.
+        subtasks_by_task (dict): Subtask rows grouped by task id.
+    Returns:
+        Project: The populated project.
+    """
+    for task_row in tasks_table:
+        task = generate_task_obj_2(task_row, subtasks_by_task.get(task_row[0], ()))
+        project.add_task(task)
+    project.tasks_loaded = True
+    return project
+
+
+@instrumented
+def generate_focusme_headers_obj(conn):
+    """
+    Generates a FocusMeData object that contains only the project headers
+    (id, name and number of tasks per kanban swimlane). The tasks of a project
+    are loaded on demand with load_project_tasks.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        FocusMeData: An object containing all projects without their tasks.
+    """
+    focusme_data = FocusMeData()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT assigned_project, assigned_kanban_swimlane, COUNT(*)
+        FROM Tasks
+        GROUP BY assigned_project, assigned_kanban_swimlane;
+    """)
+    task_counts = {}
+    for project_name, swimlane, count in cursor.fetchall():
+        task_counts.setdefault(project_name, {})[swimlane] = count
+
+    cursor.execute("SELECT id, name FROM Projects;")
+    for project_id, project_name in cursor.fetchall():
+        project = Project(project_name, project_id)
+        project.set_header(task_counts.get(project_name, {}))
+        focusme_data.add_project(project)
+    return focusme_data
+
+
+@instrumented
+def select_project_rows(conn, project_name):
+    """
+    Reads the task and subtask rows of a project. Only the database is
+    accessed, so it can run on the database worker while the GUI thread
+    uses the model; the rows are added with populate_project_obj.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        project_name (str): The name of the project.
+    Returns:
+        tuple: The task rows (see select_task_table) and the subtask rows grouped by task id.
+    """
+    tasks_table = select_task_table(conn, project_name)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT Subtasks.id, Subtasks.description, Subtasks.status, Subtasks.task_id
+        FROM Subtasks JOIN Tasks ON Subtasks.task_id = Tasks.id
+        WHERE Tasks.assigned_project = ?
+        ORDER BY Subtasks.id;
+    """, (project_name,))
+    subtasks_by_task = {}
+    for subtask_row in cursor.fetchall():
+        subtasks_by_task.setdefault(subtask_row[3], []).append(subtask_row)
+    return tasks_table, subtasks_by_task
+
+
+@instrumented
+def load_project_tasks(conn, project):
+    """
+    Loads the tasks and subtasks of a project header from the database.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        project (Project): The project whose tasks are to be loaded.
+    Returns:
+        Project: The project with its tasks loaded.
+    """
+    project.clear_tasks()
+    return populate_project_obj(project, *select_project_rows(conn, project.name))
+
+
+class LoadedProjectsLRU:
+    """
+    Keeps the tasks of the most recently viewed projects in memory.
+    Projects are loaded on first access and the task lists of the least
+    recently viewed projects are dropped when more than max_loaded_projects
+    are loaded.
+    With a database worker the rows are read on the worker with
+    select_project_rows and handed to add_rows on the thread that uses
+    the model, so the model is never changed by the worker:
+
+        rows = select_project_rows(conn, project.name)    # database worker
+        lru.add_rows(project, rows)                       # GUI thread
+    """
+    def __init__(self, conn=None, max_loaded_projects=DEFAULT_MAX_LOADED_PROJECTS):
+        """
+        Args:
+            conn (sqlite3.Connection, optional): The database connection object. Can be
+                                                 None if the connection is passed to load.
+            max_loaded_projects (int): Maximum number of projects with loaded tasks.
+        """
+        self.conn = conn
+        self.max_loaded_projects = max(1, max_loaded_projects)
+        self.loaded_projects = OrderedDict()
+
+    @instrumented
+    def load(self, project, conn=None):
+        """
+        Makes sure the tasks of the project are loaded and marks it as
+        most recently used.
+        Args:
+            project (Project): The project that is viewed.
+            conn (sqlite3.Connection, optional): The connection used instead of self.conn.
+        Returns:
+            Project: The project with its tasks loaded.
+        """
+        rows = None if project.tasks_loaded else select_project_rows(conn or self.conn, project.name)
+        return self.add_rows(project, rows)
+
+    def add_rows(self, project, rows=None):
+        """
+        Adds the rows read with select_project_rows to the project, unless its
+        tasks were loaded meanwhile, marks it as most recently used and drops
+        the tasks of the least recently viewed projects.
+        Args:
+            project (Project): The project that is viewed.
+            rows (tuple, optional): The result of select_project_rows. Can be None
+                                    if the tasks of the project are loaded.
+        Returns:
+            Project: The project with its tasks loaded.
+        """
+        if not project.tasks_loaded and rows is not None:
+            project.clear_tasks()
+            populate_project_obj(project, *rows)
+        if project in self.loaded_projects:
+            self.loaded_projects.move_to_end(project)
+        else:
+            self.loaded_projects[project] = True
+        while len(self.loaded_projects) > self.max_loaded_projects:
+            old_project, _ = self.loaded_projects.popitem(last=False)
+            old_project.unload_tasks()
+        return project
+
+    def discard(self, project):
+        """
+        Forgets a removed project, its tasks are not unloaded.
+        """
+        self.loaded_projects.pop(project, None)
+
 # def select_project_table(conn, project_name):
 #     """
 #     Retrieve a project by its name from the database.
@@ -191,6 +1055,7 @@ def generate_focusme_data_obj(conn):
 #     return project
 
 
+@instrumented
 def select_task_table(conn, project_name):
     """
     Load `tasks` associated with a specific project from the database.
@@ -209,6 +1074,8 @@ def select_task_table(conn, project_name):
             - tag (str): The tag associated with the task.
             - assigned_kanban_swimlane (str): The kanban swimlane the task is assigned to.
             - assigned_project (str): The project the task is assigned to.
+            - kanban_rank (float): The position of the task within its kanban swimlane.
+        The tasks are sorted by kanban_rank.
     """
     cursor = conn.cursor()
 
@@ -216,9 +1083,10 @@ def select_task_table(conn, project_name):
     try:
         cursor.execute("""
             SELECT id, taskname, description, estimated_pomodoros, performed_pomodoros, 
-                   date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project
+                   date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project, kanban_rank
             FROM Tasks
-            WHERE assigned_project = ?;
+            WHERE assigned_project = ?
+            ORDER BY kanban_rank IS NULL, kanban_rank, id;
         """, (project_name,))
     except sqlite3.Error as e:
         print(f"Fehler beim Laden der Aufgaben für das Projekt '{project_name}': {e}")
@@ -229,6 +1097,42 @@ def select_task_table(conn, project_name):
 
 
 
+@instrumented
+def select_all_tasks_table(conn):
+    """
+    Load all `tasks` of all projects from the database with a single query.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        list of tuple: A list of task tuples with the same field order as returned by
+        select_task_table.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, taskname, description, estimated_pomodoros, performed_pomodoros, 
+               date_to_perform, repeat, tag, assigned_kanban_swimlane, assigned_project, kanban_rank
+        FROM Tasks
+        ORDER BY kanban_rank IS NULL, kanban_rank, id;
+    """)
+    return cursor.fetchall()
+
+
+@instrumented
+def select_all_subtasks_table(conn):
+    """
+    Loads all subtasks of all tasks from the database with a single query.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        list of tuple: A list of tuples (id, description, status, task_id). The first
+        three fields have the same order as returned by select_subtask_table.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, description, status, task_id FROM Subtasks ORDER BY id;")
+    return cursor.fetchall()
+
+
+@instrumented
 def select_subtask_table(conn, task_id):
     """
     Loads subtasks for a given task from the database.
@@ -245,6 +1149,7 @@ def select_subtask_table(conn, task_id):
 
 
 
+@instrumented
 def add_project_to_db(conn, project) -> int:
     """
     Adds a project to the database.
@@ -258,23 +1163,40 @@ def add_project_to_db(conn, project) -> int:
     Raises:
         sqlite3.Error: If an error occurs during the database operation.
     """
-    cursor = conn.cursor()
     try:
-        # Transaktion starten
-        cursor.execute("BEGIN TRANSACTION;")
-
         # Projekt einfügen
-        cursor.execute("INSERT INTO Projects (name) VALUES (?);", (project.name,))
-        project.id = cursor.lastrowid
-        conn.commit()
+        with transaction(conn) as uow:
+            uow.add_project(project)
         return project.id
     
     except sqlite3.Error as e:
-        # Bei Fehler: Rollback und Fehler ausgeben
-        conn.rollback()
+        # Bei Fehler: Rollback (in UnitOfWork.commit) und Fehler ausgeben
         print(f"Fehler beim Speichern des Projekts: {e}")
         raise
 
+@instrumented
+def delete_project_from_db(conn, project):
+    """
+    Deletes a project with its tasks, their subtasks and logged pomodoro sessions from the database.
+
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        project (Project): The project to delete. The tasks are found by its name,
+                           the project row by its id or, without id, by its name.
+
+    Returns:
+        None
+    Raises:
+        sqlite3.Error: If an error occurs during the database operation.
+    """
+    try:
+        with transaction(conn) as uow:
+            uow.delete_project(project)
+    except sqlite3.Error as e:
+        print(f"Fehler beim Löschen des Projekts: {e}")
+        raise
+
+@instrumented
 def select_project_table(conn, project_id):
     """
     Retrieve a project by its name from the database.
@@ -299,6 +1221,7 @@ def select_project_table(conn, project_id):
     
     return result
 
+@instrumented
 def generate_project_obj(project_table, tasks_table, subtask_table):
     project = Project(project_table[0], project_table[1])
     for task_row in tasks_table:
@@ -306,6 +1229,18 @@ def generate_project_obj(project_table, tasks_table, subtask_table):
         project.add_task(task)
     return project
 
+def intern_string(value):
+    """
+    Interns a string value, so all tasks share one object for repeated
+    values like swimlane, repeat, tag and project name.
+    Args:
+        value: A value read from the database.
+    Returns:
+        The interned string or the unchanged value if it is not a string.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def generate_task_obj_2(task_row, subtask_table):
     """
     Generates a Task object from a database row.
@@ -321,6 +1256,7 @@ def generate_task_obj_2(task_row, subtask_table):
             - tag (str): A tag associated with the task.
             - assigned_kanban_swimlane (str): The kanban swimlane to which the task is assigned.
             - assigned_project (str): The project to which the task is assigned.
+            - kanban_rank (float, optional): The position of the task within its kanban swimlane.
     Returns:
         Task: An instance of the Task class populated with the provided data.
     """
@@ -331,10 +1267,11 @@ def generate_task_obj_2(task_row, subtask_table):
             estimated_pomodoros=task_row[3],
             performed_pomodoros=task_row[4],
             date_to_perform=task_row[5],
-            repeat=task_row[6],
-            tag=task_row[7],
-            assigned_kanban_swimlane=task_row[8],
-            assigned_project=task_row[9],
+            repeat=intern_string(task_row[6]),
+            tag=intern_string(task_row[7]),
+            assigned_kanban_swimlane=intern_string(task_row[8]),
+            assigned_project=intern_string(task_row[9]),
+            kanban_rank=task_row[10] if len(task_row) > 10 else None,
             )
     for subtask_row in subtask_table:
         subtask = Subtask(
@@ -362,6 +1299,7 @@ def generate_task_obj(conn, task_row):
             - tag (str): A tag associated with the task.
             - assigned_kanban_swimlane (str): The kanban swimlane to which the task is assigned.
             - assigned_project (str): The project to which the task is assigned.
+            - kanban_rank (float, optional): The position of the task within its kanban swimlane.
     Returns:
         Task: An instance of the Task class populated with the provided data.
     """
@@ -373,10 +1311,11 @@ def generate_task_obj(conn, task_row):
             estimated_pomodoros=task_row[3],
             performed_pomodoros=task_row[4],
             date_to_perform=task_row[5],
-            repeat=task_row[6],
-            tag=task_row[7],
-            assigned_kanban_swimlane=task_row[8],
-            assigned_project=task_row[9],
+            repeat=intern_string(task_row[6]),
+            tag=intern_string(task_row[7]),
+            assigned_kanban_swimlane=intern_string(task_row[8]),
+            assigned_project=intern_string(task_row[9]),
+            kanban_rank=task_row[10] if len(task_row) > 10 else None,
             )
     for subtask_row in subtask_rows:
         subtask = Subtask(
@@ -389,6 +1328,7 @@ def generate_task_obj(conn, task_row):
     
     return task
 
+@instrumented
 def get_table_schema(conn, table_name):
     """
     Retrieve the schema of a specified `table` in the database.
@@ -408,6 +1348,7 @@ def get_table_schema(conn, table_name):
     return schema
 
 
+@instrumented
 def update_task_in_db(conn, task):
     """
     Updates an existing task in the database with new values.
@@ -424,6 +1365,7 @@ def update_task_in_db(conn, task):
                      - assigned_project (int): The ID of the assigned project.
                      - assigned_kanban_swimlane (int): The ID of the assigned Kanban swimlane.
                      - tag (str): The tag associated with the task.
+                     - kanban_rank (float): The position of the task within its kanban swimlane.
                      - id (int): The ID of the task to be updated.
     Returns:
         None
@@ -432,43 +1374,15 @@ def update_task_in_db(conn, task):
     """
     
     try:
-        cursor = conn.cursor()
-        # SQL UPDATE statement to modify the fields of the task in the database
-        cursor.execute("""
-            UPDATE Tasks
-            SET
-                taskname = ?, 
-                description = ?, 
-                estimated_pomodoros = ?, 
-                performed_pomodoros = ?, 
-                date_to_perform = ?, 
-                repeat = ?, 
-                assigned_project = ?, 
-                assigned_kanban_swimlane = ?, 
-                tag = ? 
-            WHERE id = ?;
-        """, (
-            task.taskname,               # Task name
-            task.description,            # Task description
-            task.estimated_pomodoros,    # Estimated Pomodoros
-            task.performed_pomodoros,    # Performed Pomodoros
-            task.date_to_perform,        # Date to perform
-            task.repeat,                 # Repeat value
-            task.assigned_project,       # Assigned project ID
-            task.assigned_kanban_swimlane, # Assigned Kanban swimlane
-            task.tag,                    # Tag
-            task.id                      # ID of the task to locate the correct row
-        ))
-        
-        # Commit the changes to the database
-        conn.commit()
-        print(f"Task mit ID {task.id} erfolgreich aktualisiert.")
+        with transaction(conn) as uow:
+            uow.update_task(task)
     except sqlite3.Error as e:
         print(f"Fehler beim Aktualisieren der Task: {e}")
 
+@instrumented
 def add_task_to_db(conn, task):
     """
-    Adds a task to the database.
+    Adds a task and its subtasks to the database in one transaction.
     Parameters:
     conn (sqlite3.Connection): The connection object to the SQLite database.
     task (Task): An object containing the task details to be added to the database. 
@@ -483,60 +1397,390 @@ def add_task_to_db(conn, task):
                  - assigned_project (str): The project to which the task is assigned.
                  - assigned_kanban_swimlane (str): The kanban swimlane to which the task is assigned.
                  - tag (str): A tag associated with the task.
+                 The task id is passed on to the subtasks of the task.
     Returns:
     int: The ID of the newly inserted task.
     """
     
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Tasks (
-            taskname, description, estimated_pomodoros, performed_pomodoros, 
-            date_to_perform, repeat, assigned_project, assigned_kanban_swimlane, tag
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-    """, (
-        task.taskname, task.description, task.estimated_pomodoros, 
-        task.performed_pomodoros, task.date_to_perform, task.repeat, 
-        task.assigned_project, task.assigned_kanban_swimlane, task.tag
-    ))
-    
-    for subtask in task.subtasks:
-        add_subtask_to_db(conn, subtask)
-    
-    conn.commit()
-    task.id = cursor.lastrowid
+    with transaction(conn) as uow:
+        uow.add_task(task)
     return task.id
 
 
 
-def add_subtask_to_db(conn, subtask):
+@instrumented
+def add_subtask_to_db(conn, subtask, task=None):
     """
     Adds a subtask to the database.
     Args:
         conn (sqlite3.Connection): The database connection object.
         subtask (Subtask): The subtask object to be added, which should have 
                            the attributes 'task_id', 'description', and 'status'.
+                           If 'project_id' is not set, it is taken from the task.
+        task (Task, optional): The task of the subtask. If given, task.id is used as
+                               'task_id' when the subtask is written.
         id (int): The unique identifier of the task is filled after db insertion
     Returns:
         int: The ID of the newly inserted subtask.
     """
 
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Subtasks (task_id, project_id, description, status) 
-        VALUES (?, ?, ?, ?);
-    """, (subtask.task_id, subtask.project_id, subtask.description, subtask.status))
-    conn.commit()
-    subtask.id = cursor.lastrowid
+    with transaction(conn) as uow:
+        uow.add_subtask(subtask, task)
     return subtask.id
     
+@instrumented
 def update_subtask_in_db(conn, subtask):
     """
     Updates a subtask in the database.
     """
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE Subtasks
-        SET description = ?, status = ?
-        WHERE id = ?;
-    """, (subtask.description, subtask.status, subtask.id))
-    conn.commit()
\ No newline at end of file
+    with transaction(conn) as uow:
+        uow.update_subtask(subtask)
+
+
+@instrumented
+def next_row_id(cursor, table_name):
+    """
+    Returns the id the next row inserted into an AUTOINCREMENT `table` gets.
+    Only valid inside a write transaction.
+    Args:
+        cursor (sqlite3.Cursor): A cursor of the database connection.
+        table_name (str): The name of the `table`.
+    Returns:
+        int: The next row id.
+    """
+    cursor.execute(f"""
+        SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                   COALESCE((SELECT MAX(id) FROM {table_name}), 0)) + 1;
+    """, (table_name,))
+    return cursor.fetchone()[0]
+
+
+class UnitOfWork:
+    """
+    Collects inserts and updates of projects, tasks and subtasks and deletes
+    of projects and writes them with executemany in a single transaction on commit.
+    The ids of inserted rows are assigned before the inserts, so the ids of
+    new projects and tasks can be passed on to their subtasks.
+    Use it with the transaction context manager:
+
+        with transaction(conn) as uow:
+            uow.add_task(task)
+    """
+    def __init__(self, conn):
+        """
+        Args:
+            conn (sqlite3.Connection): The database connection object.
+        """
+        self.conn = conn
+        self.new_projects = []
+        self.new_tasks = []
+        self.new_subtasks = []  # (subtask, task) tuples, task is None if subtask.task_id is set
+        self.dirty_tasks = {}
+        self.dirty_subtasks = {}
+        self.deleted_projects = []
+
+    def add_project(self, project):
+        """
+        Queues a project insert. project.id is set on commit.
+        """
+        self.new_projects.append(project)
+
+    def add_task(self, task):
+        """
+        Queues a task insert together with the inserts of its subtasks
+        that are not stored yet. task.id is set on commit.
+        """
+        self.new_tasks.append(task)
+        for subtask in task.subtasks:
+            if subtask.id is None:
+                self.add_subtask(subtask, task)
+
+    def add_subtask(self, subtask, task=None):
+        """
+        Queues a subtask insert. subtask.id is set on commit.
+        Args:
+            subtask (Subtask): The subtask to insert.
+            task (Task, optional): The task of the subtask, if it is inserted in
+                the same unit of work. Its id is passed on to subtask.task_id.
+        """
+        self.new_subtasks.append((subtask, task))
+
+    def update_task(self, task):
+        """
+        Queues a task update. Repeated updates of the same task are merged.
+        """
+        self.dirty_tasks[task.id] = task
+
+    def update_subtask(self, subtask):
+        """
+        Queues a subtask update. Repeated updates of the same subtask are merged.
+        """
+        self.dirty_subtasks[subtask.id] = subtask
+
+    def delete_project(self, project):
+        """
+        Queues the delete of a project with its tasks, their subtasks and
+        logged pomodoro sessions. The deletes are written after the inserts and updates.
+        """
+        self.deleted_projects.append(project)
+
+    def has_changes(self):
+        """
+        Returns:
+            bool: True if inserts, updates or deletes are queued.
+        """
+        return bool(self.new_projects or self.new_tasks or self.new_subtasks
+                    or self.dirty_tasks or self.dirty_subtasks or self.deleted_projects)
+
+    @instrumented
+    def commit(self):
+        """
+        Writes all queued inserts and updates in one transaction.
+        If the connection is already in a transaction, the changes are
+        written in a savepoint and the outer transaction is left to the
+        caller (nothing is committed).
+        On error the transaction (or the savepoint) is rolled back, the ids
+        assigned to new objects are reset and the error is raised.
+        Raises:
+            sqlite3.Error: If an error occurs during the database operation.
+        """
+        if not self.has_changes():
+            return
+        cursor = self.conn.cursor()
+        ranked_tasks = []
+        savepoint = False
+        try:
+            if self.conn.in_transaction:
+                cursor.execute("SAVEPOINT unit_of_work;")
+                savepoint = True
+            else:
+                cursor.execute("BEGIN IMMEDIATE;")
+            if self.new_projects:
+                first_id = next_row_id(cursor, "Projects")
+                for offset, project in enumerate(self.new_projects):
+                    project.id = first_id + offset
+                cursor.executemany("INSERT INTO Projects (id, name) VALUES (?, ?);",
+                                   [(project.id, project.name) for project in self.new_projects])
+            if self.new_tasks:
+                first_id = next_row_id(cursor, "Tasks")
+                last_ranks = {}
+                for offset, task in enumerate(self.new_tasks):
+                    task.id = first_id + offset
+                    if task.kanban_rank is None:
+                        # append the task at the end of its swimlane
+                        key = (task.assigned_project, task.assigned_kanban_swimlane)
+                        if key not in last_ranks:
+                            cursor.execute("""
+                                SELECT MAX(kanban_rank) FROM Tasks
+                                WHERE assigned_project = ? AND assigned_kanban_swimlane = ?;
+                            """, key)
+                            last_ranks[key] = cursor.fetchone()[0] or 0.0
+                        last_ranks[key] += RANK_STEP
+                        task.kanban_rank = last_ranks[key]
+                        ranked_tasks.append(task)
+                cursor.executemany("""
+                    INSERT INTO Tasks (
+                        id, taskname, description, estimated_pomodoros, performed_pomodoros, 
+                        date_to_perform, repeat, assigned_project, assigned_kanban_swimlane, tag, kanban_rank
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """, [(task.id, task.taskname, task.description, task.estimated_pomodoros,
+                       task.performed_pomodoros, task.date_to_perform, task.repeat,
+                       task.assigned_project, task.assigned_kanban_swimlane, task.tag, task.kanban_rank)
+                      for task in self.new_tasks])
+            if self.new_subtasks:
+                project_ids = {}
+                first_id = next_row_id(cursor, "Subtasks")
+                for offset, (subtask, task) in enumerate(self.new_subtasks):
+                    subtask.id = first_id + offset
+                    if task is not None:
+                        subtask.task_id = task.id
+                    if subtask.project_id is None:
+                        subtask.project_id = self.lookup_project_id(cursor, subtask, task, project_ids)
+                cursor.executemany("""
+                    INSERT INTO Subtasks (id, task_id, project_id, description, status) 
+                    VALUES (?, ?, ?, ?, ?);
+                """, [(subtask.id, subtask.task_id, subtask.project_id, subtask.description, subtask.status)
+                      for subtask, _ in self.new_subtasks])
+            cursor.executemany("""
+                UPDATE Tasks
+                SET
+                    taskname = ?, 
+                    description = ?, 
+                    estimated_pomodoros = ?, 
+                    performed_pomodoros = ?, 
+                    date_to_perform = ?, 
+                    repeat = ?, 
+                    assigned_project = ?, 
+                    assigned_kanban_swimlane = ?, 
+                    tag = ?, 
+                    kanban_rank = ? 
+                WHERE id = ?;
+            """, [(task.taskname, task.description, task.estimated_pomodoros, task.performed_pomodoros,
+                   task.date_to_perform, task.repeat, task.assigned_project, task.assigned_kanban_swimlane,
+                   task.tag, task.kanban_rank, task.id) for task in self.dirty_tasks.values()])
+            cursor.executemany("""
+                UPDATE Subtasks
+                SET description = ?, status = ?
+                WHERE id = ?;
+            """, [(subtask.description, subtask.status, subtask.id) for subtask in self.dirty_subtasks.values()])
+            for project in self.deleted_projects:
+                # the tasks are assigned by project name, the subtasks are deleted first,
+                # so the TaskStats triggers subtract them once
+                cursor.execute("""
+                    DELETE FROM PomodoroSessions
+                    WHERE task_id IN (SELECT id FROM Tasks WHERE assigned_project = ?);
+                """, (project.name,))
+                cursor.execute("""
+                    DELETE FROM Subtasks
+                    WHERE task_id IN (SELECT id FROM Tasks WHERE assigned_project = ?);
+                """, (project.name,))
+                cursor.execute("DELETE FROM Tasks WHERE assigned_project = ?;", (project.name,))
+                if project.id is not None:
+                    cursor.execute("DELETE FROM Projects WHERE id = ?;", (project.id,))
+                else:
+                    cursor.execute("DELETE FROM Projects WHERE name = ?;", (project.name,))
+            if savepoint:
+                cursor.execute("RELEASE unit_of_work;")
+            else:
+                self.conn.commit()
+        except sqlite3.Error:
+            if savepoint:
+                cursor.execute("ROLLBACK TO unit_of_work;")
+                cursor.execute("RELEASE unit_of_work;")
+            else:
+                self.conn.rollback()
+            for obj in self.new_projects + self.new_tasks + [subtask for subtask, _ in self.new_subtasks]:
+                obj.id = None
+            for task in ranked_tasks:
+                task.kanban_rank = None
+            raise
+        self.new_projects.clear()
+        self.new_tasks.clear()
+        self.new_subtasks.clear()
+        self.dirty_tasks.clear()
+        self.dirty_subtasks.clear()
+        self.deleted_projects.clear()
+
+    def lookup_project_id(self, cursor, subtask, task, project_ids):
+        """
+        Returns the id of the project the task of a subtask is assigned to.
+        Args:
+            cursor (sqlite3.Cursor): A cursor of the database connection.
+            subtask (Subtask): The subtask without project_id.
+            task (Task): The task of the subtask or None.
+            project_ids (dict): Cache of project ids by project name.
+        Returns:
+            int: The project id or None if the project is not found.
+        """
+        if task is not None:
+            project_name = task.assigned_project
+        else:
+            cursor.execute("SELECT assigned_project FROM Tasks WHERE id = ?;", (subtask.task_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            project_name = row[0]
+        if project_name not in project_ids:
+            cursor.execute("SELECT MIN(id) FROM Projects WHERE name = ?;", (project_name,))
+            project_ids[project_name] = cursor.fetchone()[0]
+        return project_ids[project_name]
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Context manager that provides a UnitOfWork and commits it when the
+    block is left without an exception. If the block raises, nothing is written.
+
+        with transaction(conn) as uow:
+            uow.add_task(task)
+            uow.update_subtask(subtask)
+
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Yields:
+        UnitOfWork: The unit of work that collects the changes.
+    """
+    uow = UnitOfWork(conn)
+    yield uow
+    uow.commit()
+
+
+class WriteBehindQueue:
+    """
+    Collects edited tasks and subtasks and writes them to the database in
+    one transaction when flush is called.
+    Repeated edits of the same task or subtask are merged, i.e. only the
+    latest state of the object is written once per flush.
+    Edits can be marked on one thread and flushed on another one (e.g. the
+    database worker).
+    """
+    def __init__(self, conn=None):
+        """
+        Args:
+            conn (sqlite3.Connection, optional): The database connection object. Can be
+                                                 None if the connection is passed to flush.
+        """
+        self.conn = conn
+        self.lock = threading.Lock()
+        # keyed by object, new objects may get their id only when their insert is executed
+        self.dirty_tasks = {}
+        self.dirty_subtasks = {}
+
+    def mark_task_dirty(self, task):
+        """
+        Marks a task as changed. It is written with the next flush.
+        Args:
+            task (Task): The changed task.
+        """
+        with self.lock:
+            self.dirty_tasks[id(task)] = task
+
+    def mark_subtask_dirty(self, subtask):
+        """
+        Marks a subtask as changed. It is written with the next flush.
+        Args:
+            subtask (Subtask): The changed subtask.
+        """
+        with self.lock:
+            self.dirty_subtasks[id(subtask)] = subtask
+
+    def has_pending_writes(self):
+        """
+        Returns:
+            bool: True if there are changes that are not written yet.
+        """
+        return bool(self.dirty_tasks or self.dirty_subtasks)
+
+    @instrumented
+    def flush(self, conn=None):
+        """
+        Writes all changed tasks and subtasks with one commit.
+        If the transaction fails, it is rolled back and the changes stay
+        queued for the next flush.
+        Args:
+            conn (sqlite3.Connection, optional): The connection used instead of self.conn.
+        Returns:
+            int: The number of written rows.
+        """
+        with self.lock:
+            tasks, self.dirty_tasks = self.dirty_tasks, {}
+            subtasks, self.dirty_subtasks = self.dirty_subtasks, {}
+        if not tasks and not subtasks:
+            return 0
+        try:
+            with transaction(conn or self.conn) as uow:
+                for task in tasks.values():
+                    uow.update_task(task)
+                for subtask in subtasks.values():
+                    uow.update_subtask(subtask)
+        except sqlite3.Error as e:
+            print(f"Fehler beim Speichern der Änderungen: {e}")
+            with self.lock:
+                # keep the changes, edits marked in the meantime refer to the same objects
+                for key, task in tasks.items():
+                    self.dirty_tasks.setdefault(key, task)
+                for key, subtask in subtasks.items():
+                    self.dirty_subtasks.setdefault(key, subtask)
+            return 0
+        return len(tasks) + len(subtasks)
@@ -0,0 +1,101 @@
+"""
+focusme_db_worker runs the database access of the FocusMe application on a
+background thread.
+
+The worker owns the sqlite3 connection. Commands are functions of the
+focusme_db module (or any function that takes the connection as first
+argument). They are executed one after the other in the order they were
+submitted, so the write order is the same as the order of the user actions.
+The results are returned as concurrent.futures.Future objects.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from model.focusme_db import initialize_database
+
+
+class DatabaseWorker:
+    """
+    Executes database commands on a dedicated thread that owns the connection.
+    """
+    def __init__(self, db_name=None, profile="default"):
+        """
+        Starts the worker thread and initializes the database on it.
+
+        Args:
+            db_name (str, optional): The name of the SQLite database file. Defaults to None (in-memory).
+            profile (str): Name of a performance profile in focusme_db.PERFORMANCE_PROFILES.
+
+        Raises:
+            sqlite3.Error: If the database cannot be initialized.
+        """
+        self.db_name = db_name
+        self.profile = profile
+        self.commands = queue.Queue()
+        ready = Future()
+        self.thread = threading.Thread(target=self.run, args=(ready,), name="FocusMeDatabaseWorker", daemon=True)
+        self.thread.start()
+        ready.result()
+
+    def run(self, ready):
+        """
+        Main loop of the worker thread. Executes the queued commands until
+        close is called.
+
+        Args:
+            ready (Future): is resolved when the database is initialized
+        """
+        try:
+            conn = initialize_database(db_name=self.db_name, profile=self.profile)
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(True)
+        while True:
+            command = self.commands.get()
+            if command is None:
+                break
+            func, args, kwargs, future = command
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(conn, *args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        conn.close()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues a command for the worker thread.
+
+        Args:
+            func (function): function that is called as func(conn, *args, **kwargs)
+
+        Returns:
+            Future: provides the return value or the exception of the command
+        """
+        future = Future()
+        self.commands.put((func, args, kwargs, future))
+        return future
+
+    def call(self, func, *args, **kwargs):
+        """
+        Queues a command and waits for its result. Must not be used from the
+        GUI thread while the application is running.
+
+        Args:
+            func (function): function that is called as func(conn, *args, **kwargs)
+
+        Returns:
+            The return value of the command
+        """
+        return self.submit(func, *args, **kwargs).result()
+
+    def close(self):
+        """
+        Executes all queued commands, closes the connection and stops the
+        worker thread.
+        """
+        if self.thread.is_alive():
+            self.commands.put(None)
+            self.thread.join()
@@ -0,0 +1,309 @@
+"""
+focusme_import_export moves projects, tasks and subtasks in and out of the
+FocusMe database as JSON Lines or CSV files.
+
+Both directions work on a stream of records (dicts), so the memory use does
+not depend on the size of the database or the file:
+
+* project: {"type": "project", "name": ...}
+* task: {"type": "task", "id": ..., "project": ..., "taskname": ..., ...}
+  with the fields of TASK_FIELDS
+* subtask: {"type": "subtask", "task_id": ..., "description": ..., "status": ...}
+
+The subtask records of a task follow directly after the task record, the
+"id" of a task record is only used to match its subtasks. On import the
+rows get new ids.
+
+A CSV file has one column per record key (CSV_COLUMNS), cells that do not
+belong to the record type are empty.
+
+    Functions:
+        export_records(conn):
+            Yields the records of the database.
+
+        import_records(conn, records, chunk_size=CHUNK_SIZE):
+            Inserts records with executemany in chunks in one transaction.
+
+        read_jsonl(file), read_csv(file), write_jsonl(records, file), write_csv(records, file):
+            Convert between records and file contents.
+
+        export_file(conn, file_name), import_file(conn, file_name):
+            Export and import of .jsonl and .csv files.
+"""
+import csv
+import json
+import sqlite3
+from model.focusme_model import RANK_STEP, KanbanBoardColumns, RepeatEnum, to_iso_date
+from model.focusme_db import next_row_id, bulk_search_indexing
+from model.focusme_instrumentation import instrumented
+
+# rows per executemany call
+CHUNK_SIZE = 10000
+
+TASK_FIELDS = ("taskname", "description", "estimated_pomodoros", "performed_pomodoros", "date_to_perform",
+               "repeat", "tag", "assigned_kanban_swimlane", "kanban_rank")
+CSV_COLUMNS = ("type", "name", "id", "project") + TASK_FIELDS + ("task_id", "status")
+INTEGER_COLUMNS = ("id", "task_id", "estimated_pomodoros", "performed_pomodoros", "status")
+FLOAT_COLUMNS = ("kanban_rank",)
+
+
+def export_records(conn):
+    """
+    Yields the projects, tasks and subtasks of the database as records.
+    The tasks and subtasks are read with two cursors in id order and merged,
+    only one row of each is held in memory.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        iterator of dict: The records, the subtasks of a task follow its task record.
+    """
+    for (name,) in conn.execute("SELECT name FROM Projects ORDER BY id;"):
+        yield {"type": "project", "name": name}
+    subtasks = conn.execute("SELECT task_id, description, status FROM Subtasks ORDER BY task_id, id;")
+    subtask = subtasks.fetchone()
+    for row in conn.execute(f"SELECT id, assigned_project, {', '.join(TASK_FIELDS)} FROM Tasks ORDER BY id;"):
+        task_id = row[0]
+        record = {"type": "task", "id": task_id, "project": row[1]}
+        record.update(zip(TASK_FIELDS, row[2:]))
+        yield record
+        # subtasks of tasks that do not exist any more are skipped
+        while subtask is not None and subtask[0] < task_id:
+            subtask = subtasks.fetchone()
+        while subtask is not None and subtask[0] == task_id:
+            yield {"type": "subtask", "task_id": task_id, "description": subtask[1], "status": subtask[2]}
+            subtask = subtasks.fetchone()
+
+
+@instrumented
+def import_records(conn, records, chunk_size=CHUNK_SIZE):
+    """
+    Inserts a stream of records into the database. Tasks and subtasks are
+    collected in chunks of chunk_size rows and written with executemany.
+    The whole import is one transaction (a savepoint if the connection is already
+    in a transaction, which is left to the caller), a failed import changes nothing.
+    Missing text fields (e.g. the empty cells of a CSV file) are imported as "".
+    The imported tasks are added to the search index at the end (bulk_search_indexing).
+    Projects are matched by name, projects that do not exist yet are created.
+    The kanban_rank of the file is only the relative order of the imported tasks:
+    the imported tasks of a swimlane are placed after its existing tasks in the
+    order of their ranks, tasks without kanban_rank after the tasks read before them.
+    Dates in the format dd.MM.yyyy of older files are converted to YYYY-MM-DD.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        records (iterable of dict): The records, e.g. from read_jsonl or read_csv.
+        chunk_size (int, optional): Rows per executemany call. Defaults to CHUNK_SIZE.
+    Returns:
+        dict: The number of inserted projects, tasks and subtasks.
+    Raises:
+        ValueError: If a record is invalid, e.g. a subtask does not follow its task.
+        sqlite3.Error: If an error occurs during the database operation.
+    """
+    cursor = conn.cursor()
+    counts = {"projects": 0, "tasks": 0, "subtasks": 0}
+    task_rows = []
+    subtask_rows = []
+    # (project, swimlane) -> [highest existing rank, lowest and highest rank of the file]
+    ranks = {}
+
+    def flush():
+        # the tasks first, the subtask triggers look up the task of a subtask
+        cursor.executemany("""
+            INSERT INTO Tasks (id, assigned_project, taskname, description, estimated_pomodoros, performed_pomodoros,
+                               date_to_perform, repeat, tag, assigned_kanban_swimlane, kanban_rank)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, task_rows)
+        cursor.executemany("INSERT INTO Subtasks (id, task_id, project_id, description, status) VALUES (?, ?, ?, ?, ?);",
+                           subtask_rows)
+        task_rows.clear()
+        subtask_rows.clear()
+
+    def project_id(name):
+        if name not in project_ids:
+            cursor.execute("INSERT INTO Projects (name) VALUES (?);", (name,))
+            project_ids[name] = cursor.lastrowid
+            counts["projects"] += 1
+        return project_ids[name]
+
+    def kanban_rank(project, swimlane, rank):
+        # the rank of the file, shifted behind the existing tasks by shift_ranks
+        key = (project, swimlane)
+        if key not in ranks:
+            cursor.execute("SELECT MAX(kanban_rank) FROM Tasks WHERE assigned_project = ? AND assigned_kanban_swimlane = ?;",
+                           key)
+            ranks[key] = [cursor.fetchone()[0] or 0.0, None, None]
+        file_ranks = ranks[key]
+        if rank is None:
+            rank = (file_ranks[2] or 0.0) + RANK_STEP
+        file_ranks[1] = rank if file_ranks[1] is None else min(file_ranks[1], rank)
+        file_ranks[2] = rank if file_ranks[2] is None else max(file_ranks[2], rank)
+        return rank
+
+    def shift_ranks(first_task_id):
+        # the lowest imported rank of a swimlane becomes its highest existing rank + RANK_STEP
+        for (project, swimlane), (last_rank, first_rank, _) in ranks.items():
+            offset = last_rank + RANK_STEP - first_rank
+            if offset:
+                cursor.execute("""
+                    UPDATE Tasks SET kanban_rank = kanban_rank + ?
+                    WHERE assigned_project = ? AND assigned_kanban_swimlane = ? AND id >= ?;
+                """, (offset, project, swimlane, first_task_id))
+
+    # inside an open transaction of the caller the import is written in a savepoint, like UnitOfWork.commit
+    savepoint = conn.in_transaction
+    try:
+        cursor.execute("SAVEPOINT import_records;" if savepoint else "BEGIN IMMEDIATE;")
+        # a name of several projects is matched to the first one (lowest id), like lookup_project_id
+        project_ids = {name: id for id, name in cursor.execute("SELECT id, name FROM Projects ORDER BY id DESC;")}
+        first_task_id = next_task_id = next_row_id(cursor, "Tasks")
+        next_subtask_id = next_row_id(cursor, "Subtasks")
+        # (id in the file, id in the database, project id) of the last task record
+        current_task = None
+        with bulk_search_indexing(cursor, next_task_id):
+            for number, record in enumerate(records, start=1):
+                record_type = record.get("type")
+                if record_type == "project":
+                    project_id(record["name"])
+                elif record_type == "task":
+                    if len(task_rows) >= chunk_size or len(subtask_rows) >= chunk_size:
+                        flush()
+                    project = record["project"]
+                    swimlane = record.get("assigned_kanban_swimlane") or KanbanBoardColumns.BACKLOG.value
+                    current_task = (record.get("id"), next_task_id, project_id(project))
+                    task_rows.append((next_task_id, project, record.get("taskname", ""), record.get("description", ""),
+                                      record.get("estimated_pomodoros") or 0, record.get("performed_pomodoros") or 0,
+                                      to_iso_date(record.get("date_to_perform")),
+                                      record.get("repeat") or RepeatEnum.NEVER.value,
+                                      record.get("tag", ""), swimlane,
+                                      kanban_rank(project, swimlane, record.get("kanban_rank"))))
+                    next_task_id += 1
+                    counts["tasks"] += 1
+                elif record_type == "subtask":
+                    if current_task is None or record.get("task_id") not in (None, current_task[0]):
+                        raise ValueError(f"Record {number}: Subtask folgt nicht auf ihre Task")
+                    subtask_rows.append((next_subtask_id, current_task[1], current_task[2],
+                                         record.get("description", ""), record.get("status") or 0))
+                    next_subtask_id += 1
+                    counts["subtasks"] += 1
+                else:
+                    raise ValueError(f"Record {number}: unbekannter Typ {record_type!r}")
+            flush()
+        shift_ranks(first_task_id)
+        if savepoint:
+            cursor.execute("RELEASE import_records;")
+        else:
+            conn.commit()
+    except (sqlite3.Error, ValueError, KeyError) as e:
+        if savepoint:
+            cursor.execute("ROLLBACK TO import_records;")
+            cursor.execute("RELEASE import_records;")
+        else:
+            conn.rollback()
+        print(f"Fehler beim Import: {e!r}")
+        raise
+    return counts
+
+
+def read_jsonl(file):
+    """
+    Yields the records of a JSON Lines file, one JSON object per line.
+    Args:
+        file (file object): The opened text file.
+    """
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def write_jsonl(records, file):
+    """
+    Writes records to a JSON Lines file.
+    Args:
+        records (iterable of dict): The records, e.g. from export_records.
+        file (file object): The opened text file.
+    Returns:
+        int: The number of written records.
+    """
+    count = 0
+    for record in records:
+        file.write(json.dumps(record, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def read_csv(file):
+    """
+    Yields the records of a CSV file with a header row of CSV_COLUMNS.
+    Empty cells are left out, numbers are converted.
+    Args:
+        file (file object): The text file opened with newline="".
+    """
+    for row in csv.DictReader(file):
+        record = {}
+        for column, value in row.items():
+            if value is None or value == "":
+                continue
+            if column in INTEGER_COLUMNS:
+                value = int(value)
+            elif column in FLOAT_COLUMNS:
+                value = float(value)
+            record[column] = value
+        yield record
+
+
+def write_csv(records, file):
+    """
+    Writes records to a CSV file with a header row of CSV_COLUMNS.
+    Args:
+        records (iterable of dict): The records, e.g. from export_records.
+        file (file object): The text file opened with newline="".
+    Returns:
+        int: The number of written records.
+    """
+    writer = csv.DictWriter(file, CSV_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def file_format(file_name):
+    if file_name.endswith(".jsonl"):
+        return read_jsonl, write_jsonl
+    if file_name.endswith(".csv"):
+        return read_csv, write_csv
+    raise ValueError(f"Unbekanntes Dateiformat: {file_name} (.jsonl oder .csv)")
+
+
+@instrumented
+def export_file(conn, file_name):
+    """
+    Exports the database to a .jsonl or .csv file.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        file_name (str): The name of the file, the format is taken from the extension.
+    Returns:
+        int: The number of written records.
+    """
+    _, write = file_format(file_name)
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        return write(export_records(conn), file)
+
+
+@instrumented
+def import_file(conn, file_name, chunk_size=CHUNK_SIZE):
+    """
+    Imports a .jsonl or .csv file into the database, see import_records.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        file_name (str): The name of the file, the format is taken from the extension.
+        chunk_size (int, optional): Rows per executemany call. Defaults to CHUNK_SIZE.
+    Returns:
+        dict: The number of inserted projects, tasks and subtasks.
+    """
+    read, _ = file_format(file_name)
+    with open(file_name, encoding="utf-8", newline="") as file:
+        return import_records(conn, read(file), chunk_size)
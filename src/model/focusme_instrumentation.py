@@ -0,0 +1,214 @@
+"""
+focusme_instrumentation records how often and how long the database
+functions and the main UI slots of the FocusMe application run.
+
+The instrumentation is opt-in. Functions are marked with the decorator
+instrumented; as long as INSTRUMENTATION is disabled the decorator only
+checks a flag and calls the function. When enabled, each call site gets
+
+* the number of calls, the total time and latency percentiles (p50, p95, p99)
+* the rows touched: rows changed in the database (sqlite3 total_changes)
+  plus the rows returned as a list
+* the SQL statements and commits executed during the call, if the
+  connection has been attached with Instrumentation.attach
+
+Rows, statements and commits of nested instrumented calls are counted for
+the inner and the outer call site.
+
+The data is exported as JSON (export_json) or written as a logging
+summary (log_summary), e.g. when the application exits.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# latency samples kept per call site for the percentiles
+MAX_SAMPLES = 10000
+
+logger = logging.getLogger(__name__)
+
+
+class CallStats:
+    """
+    Statistics of a single call site
+    """
+    __slots__ = ("count", "total_time", "samples", "rows", "queries", "commits")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        # the latest MAX_SAMPLES durations
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.rows = 0
+        self.queries = 0
+        self.commits = 0
+
+    def percentile(self, fraction):
+        """
+        Provides a latency percentile of the kept samples in seconds
+
+        Args:
+            fraction (float): e.g. 0.95 for p95
+        """
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total_time * 1000,
+            "mean_ms": self.total_time * 1000 / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "rows": self.rows,
+            "queries": self.queries,
+            "commits": self.commits,
+        }
+
+
+class Instrumentation:
+    """
+    Collects the CallStats of all instrumented call sites
+    """
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self.lock = threading.Lock()
+        # running call sites per thread, the SQL statements are counted for them
+        self.active = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def attach(self, conn):
+        """
+        Counts the SQL statements and commits executed on a connection.
+        Must be called in the thread that uses the connection (e.g. with
+        DatabaseWorker.call).
+
+        Args:
+            conn (sqlite3.Connection): The database connection object.
+        """
+        conn.set_trace_callback(self.trace_statement)
+
+    def trace_statement(self, statement):
+        """
+        Trace callback of an attached connection. Statements of triggers and
+        virtual tables start with "--" and are not counted.
+        """
+        if not self.enabled or statement.startswith("--"):
+            return
+        stack = getattr(self.active, "stack", None)
+        if not stack:
+            return
+        is_commit = statement.lstrip()[:6].upper() == "COMMIT"
+        with self.lock:
+            for stats in set(stack):
+                stats.queries += 1
+                if is_commit:
+                    stats.commits += 1
+
+    def call(self, name, func, args, kwargs):
+        """
+        Calls func and records the call for the call site name
+        """
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CallStats()
+        conn = find_connection(args, kwargs)
+        changes_before = conn.total_changes if conn is not None else 0
+        stack = getattr(self.active, "stack", None)
+        if stack is None:
+            stack = self.active.stack = []
+        stack.append(stats)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            with self.lock:
+                stats.count += 1
+                stats.total_time += duration
+                stats.samples.append(duration)
+                if conn is not None:
+                    stats.rows += conn.total_changes - changes_before
+        if isinstance(result, list):
+            with self.lock:
+                stats.rows += len(result)
+        return result
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: call site -> statistics, sorted by total time
+        """
+        with self.lock:
+            items = [(name, stats.to_dict()) for name, stats in self.stats.items()]
+        items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        return dict(items)
+
+    def export_json(self, file_name):
+        """
+        Writes the statistics to a JSON file
+
+        Args:
+            file_name (str): name of the JSON file
+        """
+        with open(file_name, "w", encoding="utf-8") as output:
+            json.dump(self.to_dict(), output, indent=2)
+
+    def log_summary(self, log=logger, level=logging.INFO):
+        """
+        Writes one line per call site to a logger
+        """
+        for name, stats in self.to_dict().items():
+            log.log(level, "%s: %d calls, %.1f ms total, p50 %.3f ms, p95 %.3f ms, p99 %.3f ms, "
+                           "%d rows, %d queries, %d commits",
+                    name, stats["count"], stats["total_ms"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+                    stats["rows"], stats["queries"], stats["commits"])
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def find_connection(args, kwargs):
+    """
+    Provides the connection a call works on: a sqlite3.Connection argument
+    or the conn attribute of the object a method is called on.
+    """
+    for arg in (*args, *kwargs.values()):
+        if isinstance(arg, sqlite3.Connection):
+            return arg
+    conn = getattr(args[0], "conn", None) if args else None
+    return conn if isinstance(conn, sqlite3.Connection) else None
+
+
+def instrumented(func):
+    """
+    Decorator that records the calls of func in INSTRUMENTATION while it is enabled.
+    The call site is named module.qualname, e.g. focusme_db.add_task_to_db.
+    """
+    name = f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not INSTRUMENTATION.enabled:
+            return func(*args, **kwargs)
+        return INSTRUMENTATION.call(name, func, args, kwargs)
+    return wrapper
@@ -6,6 +6,58 @@ projects.
 """
 
 from enum import Enum
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from operator import attrgetter
+
+# distance between the kanban ranks of neighbouring tasks, a task moved
+# between two tasks gets the mean of their ranks
+RANK_STEP = 1024.0
+# date_to_perform is stored as ISO 8601 date (YYYY-MM-DD), the strings sort like the dates
+DATE_FORMAT = "%Y-%m-%d"
+# format of older databases and files (dd.MM.yyyy)
+LEGACY_DATE_FORMAT = "%d.%m.%Y"
+# Task.tag holds the tag names of a task separated by commas, e.g. "Haushalt, dringend"
+TAG_SEPARATOR = ","
+
+def split_tags(value):
+    """
+    Splits the tag text of a task into tag names. The surrounding spaces are
+    removed, empty and repeated names are left out (like the Tags table does it).
+
+    Args:
+        value (str | None): Task.tag
+
+    Returns:
+        tuple of str: The tag names in the order of the text.
+    """
+    if not value:
+        return ()
+    return tuple(dict.fromkeys(name.strip(" ") for name in value.split(TAG_SEPARATOR) if name.strip(" ")))
+
+def to_iso_date(value):
+    """
+    Converts a date to the ISO 8601 string used for date_to_perform.
+
+    Args:
+        value (date | str | None): date object, ISO string or string in LEGACY_DATE_FORMAT
+
+    Returns:
+        str: The date as YYYY-MM-DD, None for None or an empty string.
+
+    Raises:
+        ValueError: If the string is not a valid date.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    for date_format in (DATE_FORMAT, LEGACY_DATE_FORMAT):
+        try:
+            return datetime.strptime(value, date_format).strftime(DATE_FORMAT)
+        except ValueError:
+            pass
+    raise ValueError(f"Ungültiges Datum: {value!r}")
    
 class RepeatEnum(Enum):
     """
@@ -33,15 +85,117 @@ class KanbanBoardColumns(Enum):
     IN_PROGRESS = "In Progress"
     DONE = "DONE"
 
+
+class ChangeEvent(Enum):
+    """
+    Kinds of changes published on the ChangeBus of FocusMeData.
+    The subject of the event and its details are:
+
+    * PROJECT_ADDED, PROJECT_REMOVED: the project
+    * TASK_ADDED: the task, project
+    * TASK_REMOVED: the task, project, position (row in its swimlane before the removal)
+    * TASK_MOVED: the task, project, source (swimlane and position before the move)
+      and changed_tasks (tasks whose kanban_rank or swimlane has changed)
+    * TASK_CHANGED: the task, project, fields (names of the changed attributes)
+    * SUBTASK_ABOUT_TO_BE_ADDED: the subtask, task, project, position (before it is appended)
+    * SUBTASK_ADDED: the subtask, task, project
+    * SUBTASK_CHANGED: the subtask, task, project, fields (names of the changed attributes)
+
+    The row events bracket every insert into and removal from a swimlane list
+    (Project.tasks), so list models can call beginInsertRows/beginRemoveRows
+    before and endInsertRows/endRemoveRows after the change of the list:
+
+    * TASK_ROW_ABOUT_TO_BE_INSERTED, TASK_ROW_INSERTED: the task, project, swimlane, position
+    * TASK_ROW_ABOUT_TO_BE_REMOVED, TASK_ROW_REMOVED: the task, project, swimlane, position
+    """
+    PROJECT_ADDED = "project_added"
+    PROJECT_REMOVED = "project_removed"
+    TASK_ADDED = "task_added"
+    TASK_REMOVED = "task_removed"
+    TASK_MOVED = "task_moved"
+    TASK_CHANGED = "task_changed"
+    SUBTASK_ABOUT_TO_BE_ADDED = "subtask_about_to_be_added"
+    SUBTASK_ADDED = "subtask_added"
+    SUBTASK_CHANGED = "subtask_changed"
+    TASK_ROW_ABOUT_TO_BE_INSERTED = "task_row_about_to_be_inserted"
+    TASK_ROW_INSERTED = "task_row_inserted"
+    TASK_ROW_ABOUT_TO_BE_REMOVED = "task_row_about_to_be_removed"
+    TASK_ROW_REMOVED = "task_row_removed"
+
+
+class ChangeBus:
+    """
+    Observer bus for the changes of the data model. Views subscribe to the
+    kinds of changes they show and update only the affected widgets.
+    The callbacks are called synchronously as callback(subject, **details)
+    in the thread of the change. Publishing a change without subscribers
+    costs one dictionary lookup.
+    The subscribers are not pickled (see focusme_snapshot).
+    """
+    def __init__(self):
+        # ChangeEvent -> list of callbacks
+        self.subscribers = {}
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.subscribers = {}
+
+    def subscribe(self, kind, callback):
+        """
+        Registers a callback for a kind of change
+
+        Args:
+            kind (ChangeEvent): kind of change
+            callback (function): called as callback(subject, **details)
+        """
+        self.subscribers.setdefault(kind, []).append(callback)
+
+    def unsubscribe(self, kind, callback):
+        """
+        Removes a callback registered with subscribe
+
+        Args:
+            kind (ChangeEvent): kind of change
+            callback (function): registered callback
+        """
+        callbacks = self.subscribers.get(kind, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self.subscribers.pop(kind, None)
+
+    def publish(self, kind, subject, **details):
+        """
+        Calls the callbacks of a kind of change
+
+        Args:
+            kind (ChangeEvent): kind of change
+            subject (Project, Task or Subtask): changed object
+            details: further information, see ChangeEvent
+        """
+        callbacks = self.subscribers.get(kind)
+        if callbacks:
+            # a callback may unsubscribe itself
+            for callback in tuple(callbacks):
+                callback(subject, **details)
+
 class Task:
     """
     Attributes and methods for dealing with kanban tasks
+    Tasks use __slots__ to keep large projects compact in memory. The
+    subtasks list is only created when it is accessed or a subtask is added.
     """
+    __slots__ = ("id", "taskname", "description", "estimated_pomodoros", "performed_pomodoros",
+                 "date_to_perform", "repeat", "tag", "assigned_kanban_swimlane", "assigned_project",
+                 "kanban_rank", "_subtasks", "subtask_positions", "subtasks_without_id")
+
     def __init__(self, id=None, taskname="", description="", estimated_pomodoros=0,  \
                        performed_pomodoros=0, date_to_perform=None, \
                        repeat=RepeatEnum.NEVER.value, tag="",\
                        assigned_kanban_swimlane=KanbanBoardColumns.BACKLOG.value, \
-                       assigned_project="", subtasks=None):
+                       assigned_project="", subtasks=None, kanban_rank=None):
         
         self.id = id
         self.taskname = taskname
@@ -53,7 +207,13 @@ class Task:
         self.tag = tag
         self.assigned_kanban_swimlane = assigned_kanban_swimlane
         self.assigned_project = assigned_project
-        self.subtasks = subtasks or []
+        # sort key of the task within its kanban swimlane
+        self.kanban_rank = kanban_rank
+        self._subtasks = subtasks or None
+        # subtask id -> position in subtasks, built on the first lookup
+        self.subtask_positions = None
+        # positions of the indexed subtasks that are not yet stored in the database
+        self.subtasks_without_id = None
         
 
     def __repr__(self):
@@ -61,6 +221,21 @@ class Task:
                        date_to_perform={self.date_to_perform}, repeat={self.repeat}, assigned_kanban_swimlane={self.assigned_kanban_swimlane}, \
                        tag={self.tag}, assigned_project={self.assigned_project},  subtasks={self.subtasks})>"
 
+    @property
+    def subtasks(self):
+        """
+        list of Subtask objects of the task
+        """
+        if self._subtasks is None:
+            self._subtasks = []
+        return self._subtasks
+
+    @subtasks.setter
+    def subtasks(self, subtasks):
+        self._subtasks = subtasks
+        self.subtask_positions = None
+        self.subtasks_without_id = None
+
     def add_subtask(self, subtask):
         """
         Adds a subtask to the task object
@@ -71,7 +246,72 @@ class Task:
         Returns:
             nothing
         """
-        self.subtasks.append(subtask)
+        if self._subtasks is None:
+            self._subtasks = [subtask]
+        else:
+            self._subtasks.append(subtask)
+        if self.subtask_positions is not None:
+            if subtask.id is None:
+                self.subtasks_without_id.append(len(self._subtasks) - 1)
+            else:
+                self.subtask_positions.setdefault(subtask.id, len(self._subtasks) - 1)
+
+    def index_subtasks(self):
+        """
+        Builds the index subtask id -> position of the subtasks
+        """
+        self.subtask_positions = {}
+        self.subtasks_without_id = []
+        for position, st in enumerate(self.subtasks):
+            if st.id is None:
+                self.subtasks_without_id.append(position)
+            else:
+                self.subtask_positions.setdefault(st.id, position)
+
+    def get_subtask_position(self, subtask_id):
+        """
+        Provides the position of a subtask in the subtasks list
+
+        Args:
+            subtask_id (int): id of the subtask
+
+        Returns:
+            int: position of the subtask or None if not found
+        """
+        subtasks = self.subtasks
+        # the index is rebuilt only if the list was changed without add_subtask
+        if self.subtask_positions is None or \
+           len(self.subtask_positions) + len(self.subtasks_without_id) != len(subtasks):
+            self.index_subtasks()
+        position = self.subtask_positions.get(subtask_id)
+        if position is None and self.subtasks_without_id:
+            # subtasks get their id after they were added, only these are indexed again
+            pending = []
+            for p in self.subtasks_without_id:
+                if subtasks[p].id is None:
+                    pending.append(p)
+                else:
+                    self.subtask_positions.setdefault(subtasks[p].id, p)
+            self.subtasks_without_id = pending
+            position = self.subtask_positions.get(subtask_id)
+        if position is not None and subtasks[position].id != subtask_id:
+            # a subtask was replaced in the list
+            self.index_subtasks()
+            position = self.subtask_positions.get(subtask_id)
+        return position
+
+    def get_subtask(self, subtask_id):
+        """
+        Provides a subtask of the task object
+
+        Args:
+            subtask_id (int): id of the subtask
+
+        Returns:
+            Subtask: Subtask object or None if not found
+        """
+        position = self.get_subtask_position(subtask_id)
+        return None if position is None else self.subtasks[position]
     
     def update_subtask(self, subtask):
         """
@@ -83,12 +323,65 @@ class Task:
         Returns:
             nothing
         """
-        for i, st in enumerate(self.subtasks):
-            if st.id == subtask.id:
-                self.subtasks[i] = subtask
-                break
+        position = self.get_subtask_position(subtask.id)
+        if position is not None:
+            self.subtasks[position] = subtask
+
+rank_of = attrgetter("kanban_rank")
+# attributes that can be changed with Project.update_task and Project.update_subtask,
+# swimlane and kanban_rank are changed with Project.move_task
+TASK_FIELDS = frozenset({"taskname", "description", "estimated_pomodoros", "performed_pomodoros",
+                         "date_to_perform", "repeat", "tag", "assigned_project"})
+SUBTASK_FIELDS = frozenset({"description", "status"})
+
+
+def find_task_position(tasks, task):
+    """
+    Provides the position of a task in a swimlane list that is sorted by kanban_rank
+
+    Args:
+        tasks (list): task list of a swimlane
+        task (Task): Task object of the list
+
+    Returns:
+        int: position of the task or None if it is not in the list
+    """
+    position = bisect_left(tasks, task.kanban_rank, key=rank_of)
+    while position < len(tasks) and tasks[position].kanban_rank == task.kanban_rank:
+        if tasks[position] is task:
+            return position
+        position += 1
+    return None
+
+
+def filtered_row_position(tasks, filtered_tasks, row):
+    """
+    Converts a row of a filtered swimlane list (see Project.filter_tasks) into
+    the position in the full swimlane list, e.g. for Project.move_task.
+    A task dropped on a row is placed before the task shown in the row,
+    a task dropped after the last row is placed after the last shown task.
+
+    Args:
+        tasks (list): task list of the swimlane
+        filtered_tasks (list): the shown tasks of the swimlane, sorted by kanban_rank
+        row (int): row in filtered_tasks, None for the end of the list
+
+    Returns:
+        int: position in tasks or None for the end of the swimlane
+    """
+    if row is not None and row < len(filtered_tasks):
+        return find_task_position(tasks, filtered_tasks[row])
+    if not filtered_tasks:
+        return None
+    return find_task_position(tasks, filtered_tasks[-1]) + 1
+
 
 class Subtask:
+    """
+    Attributes of a subtask (checklist entry) of a kanban task
+    """
+    __slots__ = ("id", "task_id", "project_id", "description", "status")
+
     def __init__(self, id=None, task_id=None, project_id = None, description="", status=0):
         self.id = id
         self.task_id = task_id
@@ -100,24 +393,122 @@ class Subtask:
 class Project:
     """
     Attributes and methods for dealing with projects tasks that are organized as kanban tasks
+    The tasks are indexed by id, by name per kanban swimlane and by tag
+    (inverted index tag name -> set of tasks). Use add_task, update_task,
+    move_task and remove_task to keep the indexes in sync. These methods and
+    add_subtask and update_subtask publish their changes on the ChangeBus of
+    FocusMeData (see ChangeEvent), while the tasks of the project are loaded
+    (no events while a project is populated from the database).
     """
     def __init__(self,  name="", db_id=None):
         self.tasks = {KanbanBoardColumns.BACKLOG.value: [
         ], KanbanBoardColumns.IN_PROGRESS.value: [], KanbanBoardColumns.DONE.value: []}
         self.id = db_id
         self.name = name
+        # False if only the project header (id, name, task counts) is loaded
+        self.tasks_loaded = True
+        self.task_counts = {}
+        # set by FocusMeData.add_project to keep the global task index in sync
+        self.focusme_data = None
+        self.tasks_by_id = {}
+        self.tasks_by_name = {swimlane: {} for swimlane in self.tasks}
+        # tag name -> set of the tasks with this tag
+        self.tasks_by_tag = {}
+        # tasks that are not yet stored in the database get their id later
+        self.tasks_without_id = []
 
     def add_task(self, task):
         """
         Adds a task according to its attribute "assigned_kanban_swimlane" 
-        to the tasks dictionary
+        to the tasks dictionary. The swimlane lists are sorted by kanban_rank,
+        a task without rank is added at the end of the swimlane.
         Args:
             task (Task): Task object that has to be added to a swimlane.
 
         Returns:
             nothing
         """
-        self.tasks[task.assigned_kanban_swimlane].append(task)
+        tasks = self.tasks[task.assigned_kanban_swimlane]
+        if task.kanban_rank is None:
+            task.kanban_rank = tasks[-1].kanban_rank + RANK_STEP if tasks else RANK_STEP
+        if not tasks or task.kanban_rank >= tasks[-1].kanban_rank:
+            position = len(tasks)
+        else:
+            position = bisect_right(tasks, task.kanban_rank, key=rank_of)
+        self.insert_task_row(task, position)
+        self.tasks_by_name[task.assigned_kanban_swimlane].setdefault(task.taskname, []).append(task)
+        self.index_task_tags(task)
+        self.index_task_id(task)
+        self.publish(ChangeEvent.TASK_ADDED, task)
+
+    def insert_task_row(self, task, position):
+        """
+        Inserts a task into the list of its swimlane, between the events
+        TASK_ROW_ABOUT_TO_BE_INSERTED and TASK_ROW_INSERTED.
+
+        Args:
+            task (Task): Task object of the project
+            position (int): position in the swimlane list
+        """
+        swimlane = task.assigned_kanban_swimlane
+        self.publish(ChangeEvent.TASK_ROW_ABOUT_TO_BE_INSERTED, task, swimlane=swimlane, position=position)
+        self.tasks[swimlane].insert(position, task)
+        self.publish(ChangeEvent.TASK_ROW_INSERTED, task, swimlane=swimlane, position=position)
+
+    def remove_task_row(self, task, position):
+        """
+        Removes a task from the list of its swimlane, between the events
+        TASK_ROW_ABOUT_TO_BE_REMOVED and TASK_ROW_REMOVED.
+
+        Args:
+            task (Task): Task object of the project
+            position (int): position of the task in the swimlane list
+        """
+        swimlane = task.assigned_kanban_swimlane
+        self.publish(ChangeEvent.TASK_ROW_ABOUT_TO_BE_REMOVED, task, swimlane=swimlane, position=position)
+        del self.tasks[swimlane][position]
+        self.publish(ChangeEvent.TASK_ROW_REMOVED, task, swimlane=swimlane, position=position)
+
+    def publish(self, kind, subject, **details):
+        """
+        Publishes a change of the project on the ChangeBus of FocusMeData.
+        Nothing is published for a project without FocusMeData or while its
+        tasks are loaded (tasks_loaded is False), e.g. on the database worker.
+
+        Args:
+            kind (ChangeEvent): kind of change
+            subject (Task or Subtask): changed object
+            details: further information, see ChangeEvent
+        """
+        if self.focusme_data is not None and self.tasks_loaded:
+            self.focusme_data.changes.publish(kind, subject, project=self, **details)
+
+    def index_task_id(self, task):
+        """
+        Adds a task to the id indexes of the project and of FocusMeData
+
+        Args:
+            task (Task): Task object of the project
+        """
+        if task.id is None:
+            self.tasks_without_id.append(task)
+            if self.focusme_data is not None:
+                self.focusme_data.tasks_without_id.append(task)
+            return
+        self.tasks_by_id[task.id] = task
+        if self.focusme_data is not None:
+            self.focusme_data.tasks_by_id[task.id] = task
+
+    def index_new_task_ids(self):
+        """
+        Adds the tasks that got their id after they were added to the id index
+
+        Returns:
+            nothing
+        """
+        tasks, self.tasks_without_id = self.tasks_without_id, []
+        for task in tasks:
+            self.index_task_id(task)
     
     def get_task(self, task_name, assigned_kanban_swimlane):
         """
@@ -130,17 +521,337 @@ class Project:
         Returns:
             Task: Task object
         """
-        for task in self.tasks[assigned_kanban_swimlane]:
-            if task.taskname == task_name:
-                return task
-        return None
+        tasks = self.tasks_by_name[assigned_kanban_swimlane].get(task_name)
+        return tasks[0] if tasks else None
+
+    def get_task_by_id(self, task_id):
+        """
+        provides task object depending on its id
+
+        Args:
+            task_id (int): id of task
+        
+        Returns:
+            Task: Task object or None if not found
+        """
+        task = self.tasks_by_id.get(task_id)
+        if task is None and self.tasks_without_id:
+            self.index_new_task_ids()
+            task = self.tasks_by_id.get(task_id)
+        return task
+
+    def update_task(self, task, **fields):
+        """
+        Changes attributes of a task of the project, keeps the name and tag
+        indexes in sync and publishes TASK_CHANGED with the changed fields.
+        Use move_task to change the swimlane or the position.
+
+        Args:
+            task (Task): Task object of the project
+            fields: new values by attribute name, e.g. taskname="Einkaufen"
+
+        Returns:
+            tuple: names of the changed attributes
+        """
+        if not TASK_FIELDS.issuperset(fields):
+            raise ValueError(f"Unbekannte Task-Attribute: {', '.join(sorted(set(fields) - TASK_FIELDS))}")
+        changed = tuple(name for name, value in fields.items() if getattr(task, name) != value)
+        if not changed:
+            return changed
+        if "taskname" in changed:
+            self.unindex_task_name(task)
+        if "tag" in changed:
+            self.unindex_task_tags(task)
+        for name in changed:
+            setattr(task, name, fields[name])
+        if "taskname" in changed:
+            self.tasks_by_name[task.assigned_kanban_swimlane].setdefault(task.taskname, []).append(task)
+        if "tag" in changed:
+            self.index_task_tags(task)
+        self.publish(ChangeEvent.TASK_CHANGED, task, fields=changed)
+        return changed
+
+    def rename_task(self, task, taskname):
+        """
+        Changes the name of a task of the project
+
+        Args:
+            task (Task): Task object of the project
+            taskname (string): new name of the task
+        """
+        self.update_task(task, taskname=taskname)
+
+    def set_task_tag(self, task, tag):
+        """
+        Changes the tags of a task of the project
+
+        Args:
+            task (Task): Task object of the project
+            tag (string): new tag text, see split_tags
+        """
+        self.update_task(task, tag=tag)
+
+    def add_subtask(self, task, subtask):
+        """
+        Adds a subtask to a task of the project between the events
+        SUBTASK_ABOUT_TO_BE_ADDED and SUBTASK_ADDED
+
+        Args:
+            task (Task): Task object of the project
+            subtask (Subtask): new subtask
+        """
+        self.publish(ChangeEvent.SUBTASK_ABOUT_TO_BE_ADDED, subtask, task=task, position=len(task.subtasks))
+        task.add_subtask(subtask)
+        self.publish(ChangeEvent.SUBTASK_ADDED, subtask, task=task)
+
+    def update_subtask(self, task, subtask, **fields):
+        """
+        Changes attributes of a subtask (description, status) and publishes
+        SUBTASK_CHANGED with the changed fields.
+
+        Args:
+            task (Task): Task object of the project
+            subtask (Subtask): subtask of the task
+            fields: new values by attribute name, e.g. status=True
+
+        Returns:
+            tuple: names of the changed attributes
+        """
+        if not SUBTASK_FIELDS.issuperset(fields):
+            raise ValueError(f"Unbekannte Subtask-Attribute: {', '.join(sorted(set(fields) - SUBTASK_FIELDS))}")
+        changed = tuple(name for name, value in fields.items() if getattr(subtask, name) != value)
+        for name in changed:
+            setattr(subtask, name, fields[name])
+        if changed:
+            self.publish(ChangeEvent.SUBTASK_CHANGED, subtask, task=task, fields=changed)
+        return changed
+
+    def index_task_tags(self, task):
+        """
+        Adds a task to the tag index
+        """
+        for name in split_tags(task.tag):
+            self.tasks_by_tag.setdefault(name, set()).add(task)
+
+    def unindex_task_tags(self, task):
+        """
+        Removes a task from the tag index
+        """
+        for name in split_tags(task.tag):
+            tasks = self.tasks_by_tag.get(name)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self.tasks_by_tag[name]
+
+    def filter_tasks(self, tags, match_all=False):
+        """
+        Provides the tasks with one (match_all=False) or all (match_all=True) of
+        the tags per kanban swimlane. The tasks are taken from the tag index, so
+        the cost depends on the number of tasks with these tags, not on the
+        number of tasks of the project: a union of the tag sets, or the
+        smallest tag set checked against the others.
+
+        Args:
+            tags (iterable of str): tag names
+            match_all (bool, optional): True for tasks with all tags. Defaults to False.
+
+        Returns:
+            dict: kanban swimlane -> list of the matching tasks sorted by kanban_rank
+        """
+        task_sets = [self.tasks_by_tag.get(name, set()) for name in dict.fromkeys(tags)]
+        if not task_sets:
+            matches = set()
+        elif match_all:
+            task_sets.sort(key=len)
+            matches = task_sets[0].intersection(*task_sets[1:])
+        else:
+            matches = set().union(*task_sets)
+        filtered = {swimlane: [] for swimlane in self.tasks}
+        for task in matches:
+            filtered[task.assigned_kanban_swimlane].append(task)
+        for tasks in filtered.values():
+            tasks.sort(key=rank_of)
+        return filtered
+
+    def move_task(self, task, assigned_kanban_swimlane, position=None):
+        """
+        Moves a task of the project to another kanban swimlane or to another
+        position in its swimlane. The task gets a kanban_rank between the ranks
+        of its new neighbours, so usually only the moved task changes.
+
+        Args:
+            task (Task): Task object of the project
+            assigned_kanban_swimlane (string) : kanban swimlane according to KanbanBoardColumns enumeration
+            position (int, optional): position in the target swimlane list (before the move)
+                                      the task is inserted at. Defaults to None (end of the swimlane).
+
+        Returns:
+            list: Task objects whose kanban_rank or swimlane has changed
+        """
+        source_swimlane = task.assigned_kanban_swimlane
+        source = self.tasks[source_swimlane]
+        source_position = find_task_position(source, task)
+        self.unindex_task_name(task)
+        self.remove_task_row(task, source_position)
+        target = self.tasks[assigned_kanban_swimlane]
+        if position is None or position > len(target):
+            position = len(target)
+        elif source is target and position > source_position:
+            position -= 1
+        if not target:
+            rank = RANK_STEP
+        elif position == len(target):
+            rank = target[-1].kanban_rank + RANK_STEP
+        elif position == 0:
+            rank = target[0].kanban_rank - RANK_STEP
+        else:
+            rank = (target[position - 1].kanban_rank + target[position].kanban_rank) / 2
+        task.assigned_kanban_swimlane = assigned_kanban_swimlane
+        task.kanban_rank = rank
+        self.insert_task_row(task, position)
+        self.tasks_by_name[assigned_kanban_swimlane].setdefault(task.taskname, []).append(task)
+        changed_tasks = [task]
+        if 0 < position < len(target) - 1 and not (target[position - 1].kanban_rank < rank < target[position + 1].kanban_rank):
+            # no float left between the neighbours
+            changed_tasks = self.rebalance_ranks(assigned_kanban_swimlane)
+        self.publish(ChangeEvent.TASK_MOVED, task, source=(source_swimlane, source_position),
+                     changed_tasks=changed_tasks)
+        return changed_tasks
+
+    def rebalance_ranks(self, assigned_kanban_swimlane):
+        """
+        Renumbers the kanban ranks of a swimlane with RANK_STEP distance
+
+        Args:
+            assigned_kanban_swimlane (string) : kanban swimlane according to KanbanBoardColumns enumeration
+
+        Returns:
+            list: Task objects of the swimlane
+        """
+        tasks = self.tasks[assigned_kanban_swimlane]
+        for position, task in enumerate(tasks, start=1):
+            task.kanban_rank = position * RANK_STEP
+        return list(tasks)
+
+    def remove_task(self, task):
+        """
+        Removes a task from the project
+
+        Args:
+            task (Task): Task object of the project
+        """
+        position = find_task_position(self.tasks[task.assigned_kanban_swimlane], task)
+        self.remove_task_row(task, position)
+        self.unindex_task_name(task)
+        self.unindex_task_tags(task)
+        self.index_new_task_ids()
+        if self.tasks_by_id.get(task.id) is task:
+            del self.tasks_by_id[task.id]
+            if self.focusme_data is not None:
+                self.focusme_data.tasks_by_id.pop(task.id, None)
+        if task in self.tasks_without_id:
+            self.tasks_without_id.remove(task)
+        if self.focusme_data is not None and task in self.focusme_data.tasks_without_id:
+            self.focusme_data.tasks_without_id.remove(task)
+        self.publish(ChangeEvent.TASK_REMOVED, task, position=position)
+
+    def unindex_task_name(self, task):
+        """
+        Removes a task from the name index of its kanban swimlane
+
+        Args:
+            task (Task): Task object of the project
+        """
+        names = self.tasks_by_name[task.assigned_kanban_swimlane]
+        tasks = names.get(task.taskname, [])
+        for i, t in enumerate(tasks):
+            if t is task:
+                del tasks[i]
+                break
+        if not tasks:
+            names.pop(task.taskname, None)
+
+    def clear_tasks(self):
+        """
+        Removes all tasks from the project and its indexes
+
+        Returns:
+            nothing
+        """
+        self.index_new_task_ids()
+        if self.focusme_data is not None:
+            for task_id in self.tasks_by_id:
+                self.focusme_data.tasks_by_id.pop(task_id, None)
+            if self.focusme_data.tasks_without_id:
+                own_tasks = {id(task) for tasks in self.tasks.values() for task in tasks}
+                self.focusme_data.tasks_without_id = [task for task in self.focusme_data.tasks_without_id
+                                                      if id(task) not in own_tasks]
+        for swimlane in self.tasks:
+            self.tasks[swimlane] = []
+            self.tasks_by_name[swimlane] = {}
+        self.tasks_by_tag = {}
+        self.tasks_by_id = {}
+        self.tasks_without_id = []
+
+    def set_header(self, task_counts):
+        """
+        Marks the project as header only, i.e. its tasks are not loaded yet
+
+        Args:
+            task_counts (dict): number of tasks per kanban swimlane
+        
+        Returns:
+            nothing
+        """
+        self.task_counts = dict(task_counts)
+        self.tasks_loaded = False
+
+    def unload_tasks(self):
+        """
+        Drops the task lists of the project and keeps only the task counts.
+        The tasks can be loaded again from the database.
+
+        Returns:
+            nothing
+        """
+        self.set_header({swimlane: len(tasks) for swimlane, tasks in self.tasks.items()})
+        self.clear_tasks()
+
+    def get_task_count(self, assigned_kanban_swimlane=None):
+        """
+        provides the number of tasks of the project, also if the tasks are not loaded
+
+        Args:
+            assigned_kanban_swimlane (string, optional): kanban swimlane according to 
+            KanbanBoardColumns enumeration. Defaults to None (all swimlanes)
+        
+        Returns:
+            int: number of tasks
+        """
+        if self.tasks_loaded:
+            counts = {swimlane: len(tasks) for swimlane, tasks in self.tasks.items()}
+        else:
+            counts = self.task_counts
+        if assigned_kanban_swimlane is None:
+            return sum(counts.values())
+        return counts.get(assigned_kanban_swimlane, 0)
 
 class FocusMeData:
     """
     Attributes and methods for dealing with serveral projects with tasks that are organized as kanban tasks
+    Projects are indexed by id and name, tasks of all projects by id.
+    The changes of the projects, tasks and subtasks are published on changes.
     """
     def __init__(self):
         self.projects = []
+        self.projects_by_id = {}
+        self.projects_by_name = {}
+        self.tasks_by_id = {}
+        # projects and tasks that are not yet stored in the database get their id later
+        self.projects_without_id = []
+        self.tasks_without_id = []
+        self.changes = ChangeBus()
 
     def add_project(self, project):
         """
@@ -153,6 +864,41 @@ class FocusMeData:
             nothing
         """
         self.projects.append(project)
+        self.projects_by_name.setdefault(project.name, project)
+        if project.id is None:
+            self.projects_without_id.append(project)
+        else:
+            self.projects_by_id.setdefault(project.id, project)
+        project.focusme_data = self
+        self.tasks_by_id.update(project.tasks_by_id)
+        self.tasks_without_id.extend(project.tasks_without_id)
+        self.changes.publish(ChangeEvent.PROJECT_ADDED, project)
+
+    def remove_project(self, project):
+        """
+        Removes a project and its tasks from the global data structure
+
+        Args:
+            project (Project): Project object of the global data structure.
+
+        Returns:
+            nothing
+        """
+        project.clear_tasks()
+        project.focusme_data = None
+        self.projects.remove(project)
+        if self.projects_by_name.get(project.name) is project:
+            del self.projects_by_name[project.name]
+            # another project with the same name takes the place in the index
+            for other in self.projects:
+                if other.name == project.name:
+                    self.projects_by_name[other.name] = other
+                    break
+        if self.projects_by_id.get(project.id) is project:
+            del self.projects_by_id[project.id]
+        if project in self.projects_without_id:
+            self.projects_without_id.remove(project)
+        self.changes.publish(ChangeEvent.PROJECT_REMOVED, project)
 
     def get_project(self, project_name):
         """
@@ -166,7 +912,62 @@ class FocusMeData:
             Project: Project data of the named project
             None: If Project name is not in data structure
         """
-        for project in self.projects:
-            if project_name == project.name:
-                return project
-        return None
+        return self.projects_by_name.get(project_name)
+
+    def get_project_by_id(self, project_id):
+        """
+        Returns the project with the database id project_id
+
+        Args:
+            project_id (int): database id of the project
+
+        Returns:
+            Project: Project data or None if not found
+        """
+        project = self.projects_by_id.get(project_id)
+        if project is None and self.projects_without_id:
+            projects, self.projects_without_id = self.projects_without_id, []
+            for p in projects:
+                if p.id is None:
+                    self.projects_without_id.append(p)
+                else:
+                    self.projects_by_id.setdefault(p.id, p)
+            project = self.projects_by_id.get(project_id)
+        return project
+
+    def filter_tasks(self, tags, match_all=False):
+        """
+        Returns the tasks of all loaded projects with one (match_all=False) or
+        all (match_all=True) of the tags, see Project.filter_tasks.
+
+        Args:
+            tags (iterable of str): tag names
+            match_all (bool, optional): True for tasks with all tags. Defaults to False.
+
+        Returns:
+            list: Task objects ordered by project, kanban swimlane and kanban_rank
+        """
+        tags = tuple(tags)
+        return [task for project in self.projects if project.tasks_by_tag
+                for tasks in project.filter_tasks(tags, match_all).values() for task in tasks]
+
+    def get_task_by_id(self, task_id):
+        """
+        Returns the task with the database id task_id of any project
+
+        Args:
+            task_id (int): database id of the task
+
+        Returns:
+            Task: Task object or None if not found
+        """
+        task = self.tasks_by_id.get(task_id)
+        if task is None and self.tasks_without_id:
+            tasks, self.tasks_without_id = self.tasks_without_id, []
+            for t in tasks:
+                if t.id is None:
+                    self.tasks_without_id.append(t)
+                else:
+                    self.tasks_by_id[t.id] = t
+            task = self.tasks_by_id.get(task_id)
+        return task
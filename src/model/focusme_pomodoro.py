@@ -0,0 +1,310 @@
+"""
+focusme_pomodoro runs pomodoro timers and logs the sessions.
+
+PomodoroEngine runs all timers on one background thread. The running
+sessions are kept in a heap ordered by their deadline, the thread sleeps
+until the next deadline or tick, so the cost of a tick does not depend on
+the length of the sessions and many timers need no extra threads. The GUI
+thread is never blocked, the callbacks are called on the engine thread
+(the GUI forwards them with a Qt signal).
+
+The engine never changes a task: a completed session is handed to
+on_finished and the thread that owns the model counts it with
+Project.update_task, so performed_pomodoros is written like every other
+task edit. The finished sessions (completed or aborted) are collected and
+written with flush: one transaction inserts them into the PomodoroSessions
+table (schema migration 6). The board never reads PomodoroSessions, the
+loaded counter is performed_pomodoros, so the session history does not
+slow it down.
+
+    Functions:
+        PomodoroEngine:
+            Timers, ticks and the batched session log.
+
+        select_pomodoro_sessions(conn, task_id=None, first_day=None, last_day=None, limit=None):
+            Sessions of a task or of a date range, the newest first.
+"""
+import heapq
+import itertools
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from model.focusme_model import to_iso_date
+from model.focusme_instrumentation import instrumented
+
+# length of a pomodoro
+POMODORO_SECONDS = 25 * 60
+# seconds between two calls of on_tick
+TICK_SECONDS = 1.0
+
+
+def timestamp():
+    """
+    Returns:
+        str: The current local time as ISO 8601 string (YYYY-MM-DDTHH:MM:SS), sorts like the time.
+    """
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class PomodoroSession:
+    """
+    A running or finished pomodoro of a task.
+    """
+    __slots__ = ("task", "duration", "started_at", "ended_at", "completed", "deadline")
+
+    def __init__(self, task, duration, deadline):
+        self.task = task
+        self.duration = duration
+        self.started_at = timestamp()
+        self.ended_at = None
+        self.completed = False
+        # time.monotonic() at the end of the session
+        self.deadline = deadline
+
+    def remaining(self, now=None):
+        """
+        Args:
+            now (float, optional): time.monotonic(), computed if not given.
+
+        Returns:
+            float: The remaining seconds of a running session, 0 for a finished session.
+        """
+        if self.ended_at is not None:
+            return 0.0
+        return max(0.0, self.deadline - (time.monotonic() if now is None else now))
+
+
+class PomodoroEngine:
+    """
+    Runs pomodoro timers on a background thread and collects the finished
+    sessions for a batched write (flush).
+    """
+    def __init__(self, on_tick=None, on_finished=None, tick_seconds=TICK_SECONDS):
+        """
+        Args:
+            on_tick (function, optional): called as on_tick(sessions) every tick_seconds
+                                          while sessions are running, with the running sessions.
+            on_finished (function, optional): called as on_finished(session) when a session is
+                                               completed or aborted.
+            tick_seconds (float, optional): Seconds between two ticks. Defaults to TICK_SECONDS.
+        """
+        self.on_tick = on_tick
+        self.on_finished = on_finished
+        self.tick_seconds = tick_seconds
+        self.condition = threading.Condition()
+        # (deadline, sequence number, session), the sequence number keeps equal deadlines in order
+        self.deadlines = []
+        self.sequence = itertools.count()
+        self.running_sessions = set()
+        self.finished_sessions = []
+        self.thread = None
+        self.closed = False
+
+    def start(self, task, duration=POMODORO_SECONDS):
+        """
+        Starts a pomodoro for a task.
+
+        Args:
+            task (Task): The task the pomodoro is performed for.
+            duration (float, optional): Length in seconds. Defaults to POMODORO_SECONDS.
+
+        Returns:
+            PomodoroSession: The running session, e.g. to abort it.
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Die Pomodoro-Engine ist beendet.")
+            session = PomodoroSession(task, duration, time.monotonic() + duration)
+            heapq.heappush(self.deadlines, (session.deadline, next(self.sequence), session))
+            self.running_sessions.add(session)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="FocusMePomodoroEngine", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return session
+
+    def abort(self, session):
+        """
+        Aborts a running session, it is logged as not completed.
+
+        Args:
+            session (PomodoroSession): The session returned by start.
+
+        Returns:
+            bool: False if the session was not running.
+        """
+        with self.condition:
+            if not self.finish(session, completed=False):
+                return False
+            # the heap entry is skipped when its deadline is reached
+            self.condition.notify()
+        if self.on_finished:
+            self.on_finished(session)
+        return True
+
+    def running(self):
+        """
+        Returns:
+            list: The running sessions.
+        """
+        with self.condition:
+            return list(self.running_sessions)
+
+    def finish(self, session, completed):
+        # must be called with the condition locked
+        if session not in self.running_sessions:
+            return False
+        self.running_sessions.remove(session)
+        session.ended_at = timestamp()
+        session.completed = completed
+        self.finished_sessions.append(session)
+        return True
+
+    def run(self):
+        """
+        Main loop of the engine thread: completes the sessions whose deadline
+        is reached and calls on_tick.
+        """
+        next_tick = time.monotonic() + self.tick_seconds
+        while True:
+            with self.condition:
+                while not self.closed:
+                    now = time.monotonic()
+                    if self.deadlines and self.deadlines[0][0] <= now:
+                        break
+                    if self.running_sessions and next_tick <= now:
+                        break
+                    if not self.running_sessions:
+                        self.deadlines.clear()
+                        self.condition.wait()
+                        next_tick = time.monotonic() + self.tick_seconds
+                        continue
+                    wake_up = min(next_tick, self.deadlines[0][0]) if self.deadlines else next_tick
+                    self.condition.wait(wake_up - now)
+                if self.closed:
+                    return
+                now = time.monotonic()
+                completed = []
+                while self.deadlines and self.deadlines[0][0] <= now:
+                    session = heapq.heappop(self.deadlines)[2]
+                    if self.finish(session, completed=True):
+                        completed.append(session)
+                running = None
+                if next_tick <= now:
+                    next_tick = now + self.tick_seconds
+                    running = list(self.running_sessions)
+            # callbacks without the lock, they may start or abort sessions
+            if self.on_finished:
+                for session in completed:
+                    self.on_finished(session)
+            if running and self.on_tick:
+                self.on_tick(running)
+
+    def close(self):
+        """
+        Aborts the running sessions and stops the engine thread. The aborted
+        sessions are logged with the next flush.
+        """
+        with self.condition:
+            aborted = list(self.running_sessions)
+            for session in aborted:
+                self.finish(session, completed=False)
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+        if self.on_finished:
+            for session in aborted:
+                self.on_finished(session)
+
+    def has_pending_sessions(self):
+        """
+        Returns:
+            bool: True if there are finished sessions that are not written yet.
+        """
+        return bool(self.finished_sessions)
+
+    @instrumented
+    def flush(self, conn):
+        """
+        Writes the finished sessions in one transaction. Sessions of tasks
+        that are not stored yet stay queued. If the connection is already in a
+        transaction, the sessions are written in a savepoint and the outer
+        transaction is left to the caller. If the write fails, it is rolled
+        back and the sessions stay queued for the next flush.
+
+        Args:
+            conn (sqlite3.Connection): The database connection object.
+
+        Returns:
+            int: The number of written sessions.
+        """
+        with self.condition:
+            sessions, self.finished_sessions = self.finished_sessions, []
+        stored = [session for session in sessions if session.task.id is not None]
+        waiting = [session for session in sessions if session.task.id is None]
+        if stored:
+            cursor = conn.cursor()
+            savepoint = conn.in_transaction
+            try:
+                cursor.execute("SAVEPOINT pomodoro_sessions;" if savepoint else "BEGIN IMMEDIATE;")
+                cursor.executemany("""
+                    INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed) VALUES (?, ?, ?, ?);
+                """, [(session.task.id, session.started_at, session.ended_at, int(session.completed))
+                      for session in stored])
+                if savepoint:
+                    cursor.execute("RELEASE pomodoro_sessions;")
+                else:
+                    conn.commit()
+            except sqlite3.Error as e:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO pomodoro_sessions;")
+                    cursor.execute("RELEASE pomodoro_sessions;")
+                else:
+                    conn.rollback()
+                print(f"Fehler beim Speichern der Pomodoros: {e}")
+                waiting = sessions
+                stored = []
+        if waiting:
+            with self.condition:
+                self.finished_sessions[:0] = waiting
+        return len(stored)
+
+
+@instrumented
+def select_pomodoro_sessions(conn, task_id=None, first_day=None, last_day=None, limit=None):
+    """
+    Selects logged sessions with the index of PomodoroSessions, the newest first.
+
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        task_id (int, optional): Only the sessions of this task.
+        first_day (date | str, optional): Only sessions started on or after this day.
+        last_day (date | str, optional): Only sessions started on or before this day.
+        limit (int, optional): The maximum number of sessions, None for all.
+
+    Returns:
+        list of tuple: (id, task_id, started_at, ended_at, completed)
+    """
+    conditions = []
+    params = []
+    if task_id is not None:
+        conditions.append("task_id = ?")
+        params.append(task_id)
+    if first_day is not None:
+        conditions.append("started_at >= ?")
+        params.append(to_iso_date(first_day))
+    if last_day is not None:
+        # the timestamps of last_day sort before the next day
+        conditions.append("started_at < ?")
+        params.append((datetime.fromisoformat(to_iso_date(last_day)) + timedelta(days=1)).date().isoformat())
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT id, task_id, started_at, ended_at, completed FROM PomodoroSessions
+        {where}
+        ORDER BY started_at DESC, id DESC
+        LIMIT ?;
+    """, (*params, -1 if limit is None else limit))
+    return cursor.fetchall()
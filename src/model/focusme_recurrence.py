@@ -0,0 +1,329 @@
+"""
+focusme_recurrence computes the occurrences of repeating tasks (RepeatEnum).
+
+A repeating task is stored once, its date_to_perform is the anchor of the
+series: every day, every 7 days or on the same day of every month (the last
+day of shorter months for the days 29-31). Occurrences are only generated
+for a requested date window, a series is never materialized:
+
+* occurrences(anchor, repeat, first_day, last_day=None):
+    Generator of the dates of one series, unbounded if last_day is None.
+
+* RecurrenceIndex:
+    Index of many repeating tasks for "what is due between A and B". The
+    tasks are grouped by repeat kind and phase (the weekday for WEEK, the day
+    of the month for MONTH) and sorted by anchor in each group. A task of a
+    group is due at an occurrence date of the group if its anchor is not
+    later, so a window query needs one bisect per (group, occurrence date)
+    instead of one computation per task.
+
+* roll_over_done_tasks(focusme_data, today=None):
+    Moves the repeating tasks in the DONE swimlane back to the backlog with
+    the date of their next occurrence, the caller writes them in one batch.
+
+* roll_over_project(project, today=None):
+    The same for one project, e.g. when its tasks are loaded on demand.
+"""
+import calendar
+from bisect import bisect_right, bisect_left
+from datetime import date, timedelta
+from model.focusme_model import RepeatEnum, KanbanBoardColumns, to_iso_date
+
+ONE_DAY = timedelta(days=1)
+# lower case repeat value -> RepeatEnum
+REPEAT_BY_VALUE = {repeat.value.lower(): repeat for repeat in RepeatEnum}
+
+
+def repeat_of(value):
+    """
+    Returns the RepeatEnum of a repeat value of a task. The values are
+    compared case-insensitively (the detail view uses "week", RepeatEnum "Week").
+
+    Args:
+        value (str): The repeat value of a task.
+
+    Returns:
+        RepeatEnum: The repeat kind, RepeatEnum.NEVER for unknown values.
+    """
+    if not value:
+        return RepeatEnum.NEVER
+    return REPEAT_BY_VALUE.get(value.lower(), RepeatEnum.NEVER)
+
+
+def anchor_of(task):
+    """
+    Returns the date of the first occurrence of a task.
+
+    Args:
+        task (Task): The task.
+
+    Returns:
+        date: The date_to_perform of the task, None if it has no valid date.
+    """
+    try:
+        return date.fromisoformat(task.date_to_perform)
+    except (TypeError, ValueError):
+        pass
+    try:
+        iso_date = to_iso_date(task.date_to_perform)
+    except ValueError:
+        return None
+    return date.fromisoformat(iso_date) if iso_date else None
+
+
+def add_months(day, months):
+    """
+    Adds months to a date. The day of the month is limited to the length of the month.
+
+    Args:
+        day (date): The date.
+        months (int): The number of months.
+
+    Returns:
+        date: The date months later.
+    """
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(anchor, repeat, first_day, last_day=None):
+    """
+    Yields the occurrences of a series from first_day to last_day (both included).
+    The first yielded occurrence is computed directly, earlier occurrences are
+    not iterated. The monthly occurrences are computed from the anchor, so a
+    series on the 31st returns to the 31st after shorter months.
+
+    Args:
+        anchor (date): The first occurrence of the series.
+        repeat (RepeatEnum): The repeat kind, NEVER yields only the anchor.
+        first_day (date): The first day of the window.
+        last_day (date, optional): The last day of the window, None for an unbounded series.
+
+    Yields:
+        date: The occurrences in ascending order.
+    """
+    if repeat == RepeatEnum.NEVER:
+        if first_day <= anchor and (last_day is None or anchor <= last_day):
+            yield anchor
+        return
+    if repeat == RepeatEnum.MONTH:
+        months = max(0, (first_day.year - anchor.year) * 12 + first_day.month - anchor.month - 1)
+        while True:
+            day = add_months(anchor, months)
+            if last_day is not None and day > last_day:
+                return
+            if day >= first_day:
+                yield day
+            months += 1
+    step = 7 if repeat == RepeatEnum.WEEK else 1
+    day = anchor
+    if first_day > anchor:
+        day += timedelta(days=-((anchor - first_day).days // step) * step)
+    while last_day is None or day <= last_day:
+        yield day
+        day += timedelta(days=step)
+
+
+def next_occurrence(anchor, repeat, after):
+    """
+    Returns the first occurrence of a series after a day.
+
+    Args:
+        anchor (date): The first occurrence of the series.
+        repeat (RepeatEnum): The repeat kind.
+        after (date): The day.
+
+    Returns:
+        date: The occurrence, None for a task that does not repeat.
+    """
+    return next(occurrences(anchor, repeat, after + ONE_DAY), None)
+
+
+class RecurrenceIndex:
+    """
+    Index of repeating tasks for date window queries, see the module docstring.
+    Tasks that do not repeat or have no date are not indexed. After the date or
+    the repeat value of an indexed task was changed, call update.
+    """
+    def __init__(self, tasks=()):
+        """
+        Args:
+            tasks (iterable of Task, optional): The tasks to index, e.g. FocusMeData.tasks_by_id.values().
+        """
+        # (repeat, phase) -> ([anchor ordinals], [tasks]), both sorted by anchor
+        self.groups = {}
+        # id(task) -> (group key, anchor ordinal) the task is indexed with
+        self.entries = {}
+        # bulk load: the groups are sorted once instead of one insert per task
+        entries = {}
+        for task in tasks:
+            key, ordinal = self.group_key(task)
+            if key is not None and id(task) not in self.entries:
+                self.entries[id(task)] = (key, ordinal)
+                entries.setdefault(key, []).append((ordinal, task))
+        for key, group in entries.items():
+            group.sort(key=lambda entry: entry[0])
+            self.groups[key] = ([ordinal for ordinal, _ in group], [task for _, task in group])
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def group_key(task):
+        """
+        Returns the group (repeat, phase) and the anchor ordinal of a task,
+        (None, None) if the task does not repeat or has no date.
+        """
+        repeat = repeat_of(task.repeat)
+        anchor = anchor_of(task)
+        if repeat == RepeatEnum.NEVER or anchor is None:
+            return None, None
+        if repeat == RepeatEnum.WEEK:
+            return (repeat, anchor.toordinal() % 7), anchor.toordinal()
+        if repeat == RepeatEnum.MONTH:
+            return (repeat, anchor.day), anchor.toordinal()
+        return (repeat, 0), anchor.toordinal()
+
+    def add(self, task):
+        """
+        Adds a task. A task that does not repeat or has no date is ignored.
+
+        Args:
+            task (Task): The task.
+        """
+        key, ordinal = self.group_key(task)
+        if key is None or id(task) in self.entries:
+            return
+        anchors, tasks = self.groups.setdefault(key, ([], []))
+        position = bisect_right(anchors, ordinal)
+        anchors.insert(position, ordinal)
+        tasks.insert(position, task)
+        self.entries[id(task)] = (key, ordinal)
+
+    def remove(self, task):
+        """
+        Removes a task, e.g. a deleted task. Tasks that are not indexed are ignored.
+
+        Args:
+            task (Task): The task.
+        """
+        entry = self.entries.pop(id(task), None)
+        if entry is None:
+            return
+        key, ordinal = entry
+        anchors, tasks = self.groups[key]
+        position = bisect_left(anchors, ordinal)
+        while tasks[position] is not task:
+            position += 1
+        del anchors[position]
+        del tasks[position]
+
+    def update(self, task):
+        """
+        Indexes a task again after its date_to_perform or repeat value was changed.
+
+        Args:
+            task (Task): The task.
+        """
+        self.remove(task)
+        self.add(task)
+
+    def group_occurrences(self, key, first_day, last_day):
+        """
+        Returns the occurrence dates of a group within the window.
+        """
+        repeat, phase = key
+        if repeat == RepeatEnum.DAY:
+            return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+        if repeat == RepeatEnum.WEEK:
+            day = first_day + timedelta(days=(phase - first_day.toordinal()) % 7)
+            return list(occurrences(day, repeat, first_day, last_day))
+        days = []
+        year, month = first_day.year, first_day.month
+        while (year, month) <= (last_day.year, last_day.month):
+            day = date(year, month, min(phase, calendar.monthrange(year, month)[1]))
+            if first_day <= day <= last_day:
+                days.append(day)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return days
+
+    def due_between(self, first_day, last_day):
+        """
+        Yields the indexed tasks that have at least one occurrence between
+        first_day and last_day (both included), each with its first occurrence
+        in the window. The tasks are yielded in the order of these dates.
+
+        Args:
+            first_day (date): The first day of the window.
+            last_day (date): The last day of the window.
+
+        Yields:
+            tuple: (date of the first occurrence in the window, Task)
+        """
+        # (occurrence, group tasks, start, end): tasks[start:end] are first due at occurrence
+        slices = []
+        for key, (anchors, tasks) in self.groups.items():
+            start = 0
+            for day in self.group_occurrences(key, first_day, last_day):
+                end = bisect_right(anchors, day.toordinal())
+                if end > start:
+                    slices.append((day, tasks, start, end))
+                    start = end
+        slices.sort(key=lambda item: item[0])
+        for day, tasks, start, end in slices:
+            for position in range(start, end):
+                yield day, tasks[position]
+
+
+def roll_over_done_tasks(focusme_data, today=None):
+    """
+    Moves the repeating tasks of the DONE swimlanes back to the end of the
+    backlog, see roll_over_project.
+    Projects whose tasks are not loaded are skipped, they are rolled over
+    with roll_over_project when their tasks are loaded. The returned tasks
+    are written together, e.g. with a WriteBehindQueue or a transaction.
+
+    Args:
+        focusme_data (FocusMeData): The model.
+        today (date, optional): The current day. Defaults to date.today().
+
+    Returns:
+        list: The changed tasks (moved tasks and tasks whose kanban_rank was renumbered)
+    """
+    changed = []
+    for project in focusme_data.projects:
+        if project.tasks_loaded:
+            changed.extend(roll_over_project(project, today))
+    return changed
+
+
+def roll_over_project(project, today=None):
+    """
+    Moves the repeating tasks of the DONE swimlane of a project back to the
+    end of the backlog. Their date_to_perform becomes the next occurrence
+    after the current date, but not before today. The next occurrence is
+    computed from the current date, so a monthly task on the 29th-31st keeps
+    the last day of a shorter month it rolled over. The date is changed with
+    Project.update_task, so the subscribers of TASK_CHANGED see it.
+
+    Args:
+        project (Project): A project whose tasks are loaded.
+        today (date, optional): The current day. Defaults to date.today().
+
+    Returns:
+        list: The changed tasks (moved tasks and tasks whose kanban_rank was renumbered)
+    """
+    today = today or date.today()
+    changed = {}
+    for task in list(project.tasks[KanbanBoardColumns.DONE.value]):
+        repeat = repeat_of(task.repeat)
+        anchor = anchor_of(task)
+        if repeat == RepeatEnum.NEVER or anchor is None:
+            continue
+        project.update_task(task, date_to_perform=to_iso_date(next_occurrence(anchor, repeat,
+                                                                              max(anchor, today - ONE_DAY))))
+        for moved in project.move_task(task, KanbanBoardColumns.BACKLOG.value):
+            changed[id(moved)] = moved
+    return list(changed.values())
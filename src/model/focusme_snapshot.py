@@ -0,0 +1,210 @@
+"""
+focusme_snapshot keeps a binary snapshot (pickle) of the loaded FocusMeData
+next to the database file, so the application can start without rebuilding
+the model from SQL.
+
+The snapshot is tied to the database by a change stamp stored in the
+ChangeStamp table (schema migration 4):
+
+* database_id: random id of the database, written once by the migration
+* counter: increased every time a snapshot is saved
+* changed: set to 1 by triggers on every insert, update and delete of
+  Projects, Tasks and Subtasks
+
+save_snapshot increases the counter, resets changed and writes the counter
+into the snapshot (claim_change_stamp does the same for other caches). A snapshot is valid as long as the database still has
+the same database_id, the same counter and changed = 0, i.e. nothing was
+written since the snapshot was saved. Any write (also by an older program
+version or the sqlite3 shell) invalidates it.
+
+Loading a snapshot creates several objects per task. The cyclic garbage
+collector is paused meanwhile (gc_paused), otherwise its repeated passes
+over the growing model take most of the load time.
+
+The snapshot is a local cache: it is only read from the file next to the
+database, which is as trustworthy as the database itself.
+
+    Functions:
+        snapshot_file_name(db_name):
+            Returns the name of the snapshot file of a database file.
+
+        read_change_stamp(conn):
+            Returns the change stamp of the database.
+
+        claim_change_stamp(conn):
+            Returns a stamp that stays the same until the next change, e.g. for in-memory caches.
+
+        load_snapshot(conn, file_name):
+            Returns the FocusMeData of a valid snapshot, otherwise None.
+
+        save_snapshot(conn, focusme_data, file_name):
+            Writes the snapshot of a fully loaded FocusMeData on clean shutdown.
+
+        load_focusme_data(conn, file_name):
+            Loads the snapshot, falls back to generate_focusme_data_obj.
+"""
+import gc
+import os
+import pickle
+import sqlite3
+from contextlib import contextmanager
+from model.focusme_db import generate_focusme_data_obj, get_schema_version
+from model.focusme_instrumentation import instrumented
+
+# increase when the classes of focusme_model change, older snapshots are ignored
+SNAPSHOT_FORMAT = 4
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def snapshot_file_name(db_name):
+    """
+    Args:
+        db_name (str): The name of the SQLite database file.
+    Returns:
+        str: The name of the snapshot file, None for an in-memory database.
+    """
+    if not db_name or db_name == ":memory:":
+        return None
+    return db_name + SNAPSHOT_SUFFIX
+
+
+def read_change_stamp(conn):
+    """
+    Returns the change stamp of the database.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        tuple: (database_id, counter, changed)
+    """
+    return conn.execute("SELECT database_id, counter, changed FROM ChangeStamp;").fetchone()
+
+
+def claim_change_stamp(conn):
+    """
+    Returns a stamp that stays the same until Projects, Tasks or Subtasks are
+    changed, e.g. to check if data cached in memory is still valid. If the
+    database was changed since the counter was last increased, the counter is
+    increased and changed is reset, like save_snapshot does it. Data read after
+    this call is at least as new as the stamp.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+    Returns:
+        tuple: (database_id, counter)
+    """
+    database_id, counter, changed = read_change_stamp(conn)
+    if not changed:
+        return database_id, counter
+    try:
+        conn.execute("BEGIN IMMEDIATE;")
+        conn.execute("UPDATE ChangeStamp SET counter = counter + 1, changed = 0;")
+        database_id, counter, _ = read_change_stamp(conn)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Fehler beim Aktualisieren des Änderungsstempels: {e}")
+        raise
+    return database_id, counter
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pauses the cyclic garbage collector, e.g. while many objects are created
+    that are all kept alive.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def snapshot_header(conn, database_id, counter):
+    return (SNAPSHOT_FORMAT, get_schema_version(conn), database_id, counter)
+
+
+@instrumented
+def load_snapshot(conn, file_name):
+    """
+    Loads the FocusMeData of a snapshot if it matches the database.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        file_name (str): The name of the snapshot file.
+    Returns:
+        FocusMeData: The model of the snapshot, or None if there is no valid snapshot.
+    """
+    if not file_name or not os.path.exists(file_name):
+        return None
+    database_id, counter, changed = read_change_stamp(conn)
+    if changed:
+        return None
+    try:
+        with open(file_name, "rb") as file:
+            if pickle.load(file) != snapshot_header(conn, database_id, counter):
+                return None
+            with gc_paused():
+                return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Fehler beim Laden des Snapshots {file_name}: {e!r}")
+        return None
+
+
+@instrumented
+def save_snapshot(conn, focusme_data, file_name):
+    """
+    Writes the snapshot of focusme_data, e.g. on clean shutdown after all
+    changes were written. The file is written to a temporary file and then
+    renamed, an interrupted write leaves no broken snapshot.
+    A model with projects or tasks that are not stored yet, or with projects
+    whose tasks are not loaded (lazy mode), is not saved.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        focusme_data (FocusMeData): The model, it must match the database.
+        file_name (str): The name of the snapshot file.
+    Returns:
+        bool: True if the snapshot was written.
+    """
+    if not file_name:
+        return False
+    if focusme_data.projects_without_id or focusme_data.tasks_without_id or \
+       not all(project.tasks_loaded for project in focusme_data.projects):
+        return False
+    try:
+        # a new counter invalidates the old snapshot before the new one is written
+        conn.execute("BEGIN IMMEDIATE;")
+        conn.execute("UPDATE ChangeStamp SET counter = counter + 1, changed = 0;")
+        database_id, counter, _ = read_change_stamp(conn)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Fehler beim Speichern des Snapshots: {e}")
+        raise
+    temp_file_name = file_name + ".tmp"
+    try:
+        with open(temp_file_name, "wb") as file, gc_paused():
+            pickle.dump(snapshot_header(conn, database_id, counter), file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(focusme_data, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_name, file_name)
+    except OSError as e:
+        print(f"Fehler beim Schreiben des Snapshots {file_name}: {e}")
+        return False
+    return True
+
+
+@instrumented
+def load_focusme_data(conn, file_name):
+    """
+    Loads the FocusMeData from the snapshot if it is valid, otherwise from
+    the database with generate_focusme_data_obj.
+    Args:
+        conn (sqlite3.Connection): The database connection object.
+        file_name (str): The name of the snapshot file, None to always load from the database.
+    Returns:
+        tuple: (FocusMeData, True if the snapshot was used)
+    """
+    focusme_data = load_snapshot(conn, file_name)
+    if focusme_data is not None:
+        return focusme_data, True
+    return generate_focusme_data_obj(conn), False
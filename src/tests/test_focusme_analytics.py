@@ -0,0 +1,122 @@
+import unittest
+import math
+from unittest import mock
+from model.focusme_model import Project, Task, KanbanBoardColumns
+from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db
+from model.focusme_analytics import np, load_task_columns, load_session_columns, AnalyticsCache, burndown, \
+                                    velocity, estimate_accuracy
+
+def fill(conn):
+    add_project_to_db(conn, Project("P1"))
+    add_project_to_db(conn, Project("P2"))
+    done = KanbanBoardColumns.DONE.value
+    for name, project, estimated, performed, swimlane, tag, day in (
+            ("T1", "P1", 4, 5, done, "A", "2025-03-01"),
+            ("T2", "P1", 2, 1, done, None, None),
+            ("T3", "P1", 3, 0, KanbanBoardColumns.BACKLOG.value, "A", "2025-04-01"),
+            ("T4", "P2", 0, 1, done, None, None)):
+        add_task_to_db(conn, Task(taskname=name, assigned_project=project, estimated_pomodoros=estimated,
+                                  performed_pomodoros=performed, assigned_kanban_swimlane=swimlane, tag=tag,
+                                  date_to_perform=day))
+    conn.executemany("INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed) VALUES (?, ?, ?, ?);", [
+        (4, "2025-02-20T09:00:00", "2025-02-20T09:25:00", 1),
+        (1, "2025-03-03T09:00:00", "2025-03-03T09:25:00", 1),
+        (1, "2025-03-03T10:00:00", "2025-03-03T10:25:00", 1),
+        (1, "2025-03-04T09:00:00", "2025-03-04T09:10:00", 0),
+        (1, "2025-03-05T09:00:00", "2025-03-05T09:25:00", 1),
+        (2, "2025-03-10T09:00:00", "2025-03-10T09:25:00", 1),
+    ])
+    conn.commit()
+
+@unittest.skipIf(np is None, "NumPy ist nicht installiert")
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.conn=initialize_database() #in memory data base
+        fill(self.conn)
+        self.tasks = load_task_columns(self.conn, chunk_size=3)
+        self.sessions = load_session_columns(self.conn, chunk_size=4)
+
+    def test_load_columns(self):
+        tasks = self.tasks
+        self.assertEqual(len(tasks), 4)
+        self.assertEqual((tasks.projects, tasks.tags), (("P1", "P2"), ("", "A")))
+        self.assertEqual(tasks.project.tolist(), [0, 0, 0, 1])
+        self.assertEqual([tasks.swimlanes[code] for code in tasks.swimlane],
+                         [KanbanBoardColumns.DONE.value] * 2 + [KanbanBoardColumns.BACKLOG.value, KanbanBoardColumns.DONE.value])
+        self.assertEqual(tasks.tag.tolist(), [1, 0, 1, 0])
+        self.assertEqual(tasks.tag_row.tolist(), [0, 1, 2, 3])
+        self.assertEqual(tasks.estimated.tolist(), [4, 2, 3, 0])
+        self.assertEqual(str(tasks.date[0]), "2025-03-01")
+        self.assertTrue(np.isnat(tasks.date[1]))
+        sessions = self.sessions
+        self.assertEqual(sessions.task_id.tolist(), [4, 1, 1, 1, 1, 2])
+        self.assertEqual(sessions.completed.tolist(), [True, True, True, False, True, True])
+        self.assertEqual(sessions.duration.tolist(), [1500, 1500, 1500, 600, 1500, 1500])
+        self.assertEqual(str(sessions.day[-1]), "2025-03-10")
+        window = load_session_columns(self.conn, "2025-03-03", "2025-03-04")
+        self.assertEqual(window.completed.tolist(), [True, True, False])
+        self.assertEqual(load_session_columns(self.conn, after_id=4).task_id.tolist(), [1, 2])
+
+    def test_burndown(self):
+        days, remaining, ideal = burndown(self.tasks, self.sessions, "2025-03-02", "2025-03-05", project="P1")
+        self.assertEqual([str(day) for day in days], ["2025-03-02", "2025-03-03", "2025-03-04", "2025-03-05"])
+        self.assertEqual(remaining.tolist(), [9, 7, 7, 6])
+        self.assertEqual((ideal[0], ideal[-1]), (9, 0))
+        # the session of P2 before the first day is subtracted from the start
+        _, remaining, _ = burndown(self.tasks, self.sessions, "2025-03-02", "2025-03-05")
+        self.assertEqual(remaining.tolist(), [8, 6, 6, 5])
+
+    def test_velocity(self):
+        starts, completed = velocity(self.tasks, self.sessions, "2025-03-03", "2025-03-16")
+        self.assertEqual([str(day) for day in starts], ["2025-03-03", "2025-03-10"])
+        self.assertEqual(completed.tolist(), [3, 1])
+        _, completed = velocity(self.tasks, self.sessions, "2025-02-01", "2025-03-16", days=30, project="P2")
+        self.assertEqual(completed.tolist(), [1, 0])
+        _, completed = velocity(self.tasks, self.sessions, "2025-03-03", "2025-03-16", project="unknown")
+        self.assertEqual(completed.tolist(), [0, 0])
+
+    def test_estimate_accuracy(self):
+        accuracy = estimate_accuracy(self.tasks)
+        self.assertEqual(accuracy["names"], ("P1", "P2"))
+        self.assertEqual(accuracy["tasks"].tolist(), [2, 0])
+        self.assertEqual((accuracy["estimated"].tolist(), accuracy["performed"].tolist()), ([6, 0], [6, 0]))
+        self.assertEqual(accuracy["ratio"][0], 1.0)
+        self.assertTrue(math.isnan(accuracy["ratio"][1]))
+        self.assertEqual(accuracy["median_ratio"], 0.875)
+        accuracy = estimate_accuracy(self.tasks, by="tag", done_only=False)
+        self.assertEqual(accuracy["ratio"].tolist(), [0.5, 5 / 7])
+        # a task with two tags is counted in both
+        self.conn.execute("UPDATE Tasks SET tag = 'A, B' WHERE id = 3;")
+        tasks = load_task_columns(self.conn)
+        self.assertEqual(tasks.tags, ("", "A", "B"))
+        self.assertEqual((tasks.tag.tolist(), tasks.tag_row.tolist()), ([1, 0, 1, 2, 0], [0, 1, 2, 2, 3]))
+        accuracy = estimate_accuracy(tasks, by="tag", done_only=False)
+        self.assertEqual(accuracy["tasks"].tolist(), [1, 2, 1])
+        self.assertEqual(accuracy["ratio"].tolist(), [0.5, 5 / 7, 0.0])
+        with self.assertRaises(ValueError):
+            estimate_accuracy(self.tasks, by="taskname")
+
+    def test_analytics_cache(self):
+        cache = AnalyticsCache()
+        tasks = cache.tasks(self.conn)
+        self.assertIs(cache.tasks(self.conn), tasks)
+        self.conn.execute("UPDATE Tasks SET estimated_pomodoros = 8 WHERE id = 3;")
+        self.conn.commit()
+        self.assertEqual(cache.tasks(self.conn).estimated.tolist(), [4, 2, 8, 0])
+        self.assertEqual(len(cache.sessions(self.conn)), 6)
+        self.conn.execute("""
+            INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed)
+            VALUES (3, '2025-03-11T09:00:00', '2025-03-11T09:25:00', 1);
+        """)
+        sessions = cache.sessions(self.conn)
+        self.assertEqual((len(sessions), sessions.task_id[-1]), (7, 3))
+
+class TestAnalyticsWithoutNumPy(unittest.TestCase):
+    def test_requires_numpy(self):
+        conn=initialize_database() #in memory data base
+        with mock.patch("model.focusme_analytics.np", None):
+            with self.assertRaises(ImportError):
+                load_task_columns(conn)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,27 @@
 import unittest
 import sqlite3
-from model.focusme_model import Task, Subtask, Project, KanbanBoardColumns
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+from model.focusme_model import Task, Subtask, Project, FocusMeData, KanbanBoardColumns, RANK_STEP
 from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db, add_subtask_to_db, get_table_schema, select_project_table, \
-                             generate_focusme_data_obj, select_project_table, generate_project_obj, select_task_table, select_subtask_table
+                             generate_focusme_data_obj, select_project_table, generate_project_obj, select_task_table, select_subtask_table, \
+                             generate_focusme_headers_obj, load_project_tasks, select_project_rows, LoadedProjectsLRU, WriteBehindQueue, transaction, update_task_in_db, \
+                             MIGRATIONS, migrate_database, get_schema_version, apply_performance_profile, \
+                             search_tasks, save_focusme_model_to_db, select_tasks_due_between, select_overdue_tasks, \
+                             select_statistics, select_project_statistics, select_tags, select_tasks_by_tags, \
+                             delete_project_from_db
                              
 
 class TestFocusMeDB(unittest.TestCase):
     def test_initialize_db(self):
-        db = initialize_database(db_name="test.db")
-        db.total_changes
-        self.assertEqual(db.total_changes,0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = initialize_database(db_name=os.path.join(tmp_dir, "test.db"))
+            # creating the FTS5 search table writes its configuration, but no data is added
+            for table in ("Projects", "Tasks", "Subtasks", "TaskSearch"):
+                self.assertEqual(db.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0], 0)
+            db.close()
 
     def test_add_task_to_db(self):
         conn=initialize_database() #in memory data base 
@@ -34,6 +46,27 @@ class TestFocusMeDB(unittest.TestCase):
         project = Project("P1")
         add_project_to_db(conn, project)
         print("yepp")
+
+    def test_delete_project_from_db(self):
+        conn=initialize_database() #in memory data base
+        for name in ("P1", "P2"):
+            add_project_to_db(conn, Project(name))
+        task1 = Task(taskname="Milch holen", assigned_project="P1", tag="Home")
+        task1.add_subtask(Subtask(description="Bauernmilch"))
+        task2 = Task(taskname="Milch trinken", assigned_project="P2")
+        for task in (task1, task2):
+            add_task_to_db(conn, task)
+        conn.execute("""
+            INSERT INTO PomodoroSessions (task_id, started_at, ended_at, completed)
+            VALUES (?, '2025-03-01T09:00:00', '2025-03-01T09:25:00', 1);
+        """, (task1.id,))
+        project = generate_focusme_data_obj(conn).get_project("P1")
+        delete_project_from_db(conn, project)
+        self.assertEqual([p.name for p in generate_focusme_data_obj(conn).projects], ["P2"])
+        for table in ("Subtasks", "PomodoroSessions", "TaskTags"):
+            self.assertEqual(conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0], 0)
+        self.assertEqual(list(select_project_statistics(conn)), ["P2"])
+        self.assertEqual([row[0] for row in search_tasks(conn, "milch")], [task2.id])
     
     # def test_get_project_by_name(self):
     #     conn=initialize_database() #in memory data base 
@@ -290,4 +323,425 @@ class TestFocusMeDB(unittest.TestCase):
         
         task1_id=add_task_to_db(conn, task1)
         tasks_table = select_task_table(conn, project.name)
-        self.assertEqual(tasks_table[0][0],task1_id)
\ No newline at end of file
+        self.assertEqual(tasks_table[0][0],task1_id)
+
+    def test_generate_focusme_data_obj_subtasks(self):
+        """
+        Subtasks are attached only to the task they belong to and tasks
+        are assigned to their own project.
+        """
+        conn=initialize_database() #in memory data base
+        project1 = Project("P1")
+        project2 = Project("P2")
+        prj1_id=add_project_to_db(conn, project1)
+        prj2_id=add_project_to_db(conn, project2)
+        task1 = Task(taskname="Task1", assigned_project="P1")
+        task2 = Task(taskname="Task2", assigned_project="P2")
+        add_task_to_db(conn, task1)
+        add_task_to_db(conn, task2)
+        subtask1 = Subtask(task_id=task1.id, project_id=prj1_id, description="Subtask1", status=0)
+        subtask2 = Subtask(task_id=task2.id, project_id=prj2_id, description="Subtask2", status=1)
+        subtask3 = Subtask(task_id=task2.id, project_id=prj2_id, description="Subtask3", status=0)
+        add_subtask_to_db(conn, subtask1)
+        add_subtask_to_db(conn, subtask2)
+        add_subtask_to_db(conn, subtask3)
+        focusme_data = generate_focusme_data_obj(conn)
+        loaded_task1 = focusme_data.get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value][0]
+        loaded_task2 = focusme_data.get_project("P2").tasks[KanbanBoardColumns.BACKLOG.value][0]
+        self.assertEqual(focusme_data.get_project("P2").id, prj2_id)
+        self.assertEqual([s.description for s in loaded_task1.subtasks], ["Subtask1"])
+        self.assertEqual([s.description for s in loaded_task2.subtasks], ["Subtask2", "Subtask3"])
+        self.assertEqual(loaded_task2.subtasks[0].task_id, task2.id)
+
+
+    def test_generate_focusme_headers_obj(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        add_project_to_db(conn, Project("P2"))
+        add_task_to_db(conn, Task(taskname="Task1", assigned_project="P1"))
+        add_task_to_db(conn, Task(taskname="Task2", assigned_project="P1",
+                                  assigned_kanban_swimlane=KanbanBoardColumns.DONE.value))
+        focusme_data = generate_focusme_headers_obj(conn)
+        project1 = focusme_data.get_project("P1")
+        self.assertFalse(project1.tasks_loaded)
+        self.assertEqual(project1.tasks[KanbanBoardColumns.BACKLOG.value], [])
+        self.assertEqual(project1.get_task_count(), 2)
+        self.assertEqual(project1.get_task_count(KanbanBoardColumns.DONE.value), 1)
+        self.assertEqual(focusme_data.get_project("P2").get_task_count(), 0)
+        load_project_tasks(conn, project1)
+        self.assertTrue(project1.tasks_loaded)
+        self.assertEqual(project1.tasks[KanbanBoardColumns.DONE.value][0].taskname, "Task2")
+
+    def test_loaded_projects_lru(self):
+        conn=initialize_database() #in memory data base
+        for name in ("P1", "P2", "P3"):
+            add_project_to_db(conn, Project(name))
+            add_task_to_db(conn, Task(taskname="Task " + name, assigned_project=name))
+        focusme_data = generate_focusme_headers_obj(conn)
+        p1, p2, p3 = focusme_data.projects
+        lru = LoadedProjectsLRU(conn, max_loaded_projects=2)
+        lru.load(p1)
+        lru.load(p2)
+        lru.load(p1)
+        lru.load(p3) # p2 is the least recently viewed project
+        self.assertTrue(p1.tasks_loaded)
+        self.assertFalse(p2.tasks_loaded)
+        self.assertTrue(p3.tasks_loaded)
+        self.assertEqual(p2.tasks[KanbanBoardColumns.BACKLOG.value], [])
+        self.assertEqual(p2.get_task_count(), 1)
+        lru.load(p2)
+        self.assertEqual(p2.tasks[KanbanBoardColumns.BACKLOG.value][0].taskname, "Task P2")
+        self.assertFalse(p1.tasks_loaded)
+        # rows read on the database worker are added on the thread of the model
+        rows = select_project_rows(conn, "P1")
+        self.assertFalse(p1.tasks_loaded)
+        lru.add_rows(p1, rows)
+        self.assertEqual(p1.tasks[KanbanBoardColumns.BACKLOG.value][0].taskname, "Task P1")
+        self.assertFalse(p3.tasks_loaded)
+        # rows of a project that was loaded meanwhile are not added twice
+        lru.add_rows(p1, rows)
+        self.assertEqual(p1.get_task_count(), 1)
+
+    def test_write_behind_queue(self):
+        conn=initialize_database() #in memory data base
+        prj_id=add_project_to_db(conn, Project("P1"))
+        task = Task(taskname="Task", assigned_project="P1")
+        add_task_to_db(conn, task)
+        subtask = Subtask(task_id=task.id, project_id=prj_id, description="Subtask", status=0)
+        add_subtask_to_db(conn, subtask)
+        queue = WriteBehindQueue(conn)
+        changes_before = conn.total_changes
+        for i in range(1, 6): # typing "Tasks" character by character
+            task.taskname = "Tasks"[:i]
+            queue.mark_task_dirty(task)
+            subtask.description = "Sub"[:i]
+            queue.mark_subtask_dirty(subtask)
+        self.assertEqual(conn.total_changes, changes_before)
+        self.assertTrue(queue.has_pending_writes())
+        self.assertEqual(queue.flush(), 2)
+        self.assertFalse(queue.has_pending_writes())
+        self.assertEqual(select_task_table(conn, "P1")[0][1], "Tasks")
+        self.assertEqual(select_subtask_table(conn, task.id)[0][1], "Sub")
+        self.assertEqual(queue.flush(), 0)
+        # the five merged edits cost as many row changes (incl. search index) as a single edit
+        merged_changes = conn.total_changes - changes_before
+        changes_before = conn.total_changes
+        task.taskname = "Task"
+        queue.mark_task_dirty(task)
+        subtask.description = "S"
+        queue.mark_subtask_dirty(subtask)
+        self.assertEqual(queue.flush(), 2)
+        self.assertEqual(conn.total_changes - changes_before, merged_changes)
+
+    def test_transaction_add_task_with_subtasks(self):
+        conn=initialize_database() #in memory data base
+        prj_id=add_project_to_db(conn, Project("P1"))
+        task = Task(taskname="Task", assigned_project="P1")
+        for i in range(50):
+            task.add_subtask(Subtask(description=f"Subtask {i}"))
+        commits = []
+        conn.set_trace_callback(lambda statement: commits.append(statement) if statement.startswith("COMMIT") else None)
+        with transaction(conn) as uow:
+            uow.add_task(task)
+        conn.set_trace_callback(None)
+        self.assertEqual(len(commits), 1)
+        subtask_table = select_subtask_table(conn, task.id)
+        self.assertEqual(len(subtask_table), 50)
+        self.assertEqual(subtask_table[0][0], task.subtasks[0].id)
+        self.assertEqual(task.subtasks[49].task_id, task.id)
+        self.assertEqual(task.subtasks[49].project_id, prj_id)
+
+    def test_transaction_rollback(self):
+        conn=initialize_database() #in memory data base
+        task = Task(taskname="Task", assigned_project="unknown project")
+        task.add_subtask(Subtask(description="Subtask")) # project_id cannot be resolved
+        with self.assertRaises(sqlite3.IntegrityError):
+            with transaction(conn) as uow:
+                uow.add_task(task)
+        self.assertIsNone(task.id)
+        self.assertEqual(select_task_table(conn, "unknown project"), [])
+
+    def test_transaction_nested(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        conn.execute("UPDATE Projects SET name = 'P2' WHERE name = 'P1';") # outer transaction of the caller
+        with transaction(conn) as uow:
+            uow.add_task(Task(taskname="Task", assigned_project="P2"))
+        # the unit of work does not commit the outer transaction
+        self.assertTrue(conn.in_transaction)
+        conn.rollback()
+        self.assertEqual(conn.execute("SELECT name FROM Projects;").fetchall(), [("P1",)])
+        self.assertEqual(select_task_table(conn, "P2"), [])
+        # a failed unit of work rolls back only its savepoint
+        conn.execute("UPDATE Projects SET name = 'P2' WHERE name = 'P1';")
+        task = Task(taskname="Task", assigned_project="unknown project")
+        task.add_subtask(Subtask(description="Subtask")) # project_id cannot be resolved
+        with self.assertRaises(sqlite3.IntegrityError):
+            with transaction(conn) as uow:
+                uow.add_task(task)
+        self.assertIsNone(task.id)
+        conn.commit()
+        self.assertEqual(conn.execute("SELECT name FROM Projects;").fetchall(), [("P2",)])
+        self.assertEqual(select_task_table(conn, "unknown project"), [])
+
+    def test_migrate_database(self):
+        # a database created before the migrations existed
+        with mock.patch("model.focusme_db.MIGRATIONS", []):
+            conn=initialize_database() #in memory data base
+        conn.execute("INSERT INTO Tasks (taskname, assigned_project, assigned_kanban_swimlane) VALUES ('T1', 'P1', 'Backlog');")
+        conn.execute("INSERT INTO Tasks (taskname, assigned_project, assigned_kanban_swimlane) VALUES ('T2', 'P1', 'Backlog');")
+        conn.execute("INSERT INTO Tasks (taskname, assigned_project, assigned_kanban_swimlane, date_to_perform) VALUES ('T3', 'P1', 'Backlog', '24.12.2024');")
+        conn.execute("INSERT INTO Tasks (taskname, assigned_project, assigned_kanban_swimlane, date_to_perform) VALUES ('T4', 'P1', 'Backlog', 'dd.MM.yyyy');")
+        conn.execute("INSERT INTO Subtasks (task_id, project_id, description, status) VALUES (2, 1, 'Milch kaufen', 0);")
+        conn.execute("UPDATE Tasks SET tag = 'Haushalt, Einkauf' WHERE id = 2;")
+        conn.execute("UPDATE Tasks SET tag = 'Einkauf' WHERE id = 3;")
+        conn.commit()
+        self.assertEqual(get_schema_version(conn), 0)
+        initialize_database(conn)
+        self.assertEqual(get_schema_version(conn), len(MIGRATIONS))
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(Subtasks);")]
+        self.assertIn("idx_subtasks_task_id", indexes)
+        # existing tasks keep their order in the swimlane
+        ranks = [row[0] for row in conn.execute("SELECT kanban_rank FROM Tasks ORDER BY id;")]
+        self.assertEqual(ranks, [RANK_STEP, 2 * RANK_STEP, 3 * RANK_STEP, 4 * RANK_STEP])
+        # dates are converted to ISO 8601, the placeholder of new tasks is removed
+        dates = [row[0] for row in conn.execute("SELECT date_to_perform FROM Tasks ORDER BY id;")]
+        self.assertEqual(dates, [None, None, "2024-12-24", None])
+        # existing tasks and subtasks are added to the search index
+        self.assertEqual([row[0] for row in search_tasks(conn, "milch")], [2])
+        # the statistics of existing tasks are summed up
+        self.assertEqual(select_project_statistics(conn), {"P1": (4, 0, 0, 1, 0)})
+        # the tags of the tag texts are normalized
+        self.assertEqual(select_tags(conn), [("Einkauf", 2), ("Haushalt", 1)])
+        # repeated initialization does not apply migrations again
+        self.assertEqual(migrate_database(conn), len(MIGRATIONS))
+
+    def test_query_plans_use_indexes(self):
+        conn=initialize_database() #in memory data base
+        def query_plan(sql, params):
+            return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+        uses_index = "USING (COVERING )?INDEX "
+        plan = query_plan("SELECT id, taskname FROM Tasks WHERE assigned_project = ?;", ("P1",))
+        self.assertRegex(plan, uses_index + "idx_tasks_project_swimlane")
+        plan = query_plan("SELECT id FROM Tasks WHERE assigned_project = ? AND assigned_kanban_swimlane = ?;",
+                          ("P1", KanbanBoardColumns.DONE.value))
+        self.assertRegex(plan, uses_index + "idx_tasks_project_swimlane")
+        plan = query_plan("SELECT id FROM Tasks WHERE date_to_perform BETWEEN ? AND ?;", ("2024-01-01", "2024-12-31"))
+        self.assertRegex(plan, uses_index + "idx_tasks_date_to_perform")
+        plan = query_plan("""
+            SELECT id, taskname, assigned_project, assigned_kanban_swimlane, date_to_perform FROM Tasks
+            WHERE date_to_perform IS NOT NULL AND date_to_perform <= ? AND assigned_kanban_swimlane != ?
+            ORDER BY date_to_perform, id;
+        """, ("2024-12-31", KanbanBoardColumns.DONE.value))
+        # the range is read in index order, no sorting
+        self.assertRegex(plan, uses_index + "idx_tasks_date_to_perform")
+        self.assertNotIn("TEMP B-TREE", plan)
+        plan = query_plan("SELECT id, description, status FROM Subtasks WHERE task_id = ?;", (1,))
+        self.assertRegex(plan, uses_index + "idx_subtasks_task_id")
+        # the lookup of the statistics triggers (one row per edit)
+        plan = query_plan("""
+            UPDATE TaskStats SET subtasks = subtasks + 1
+            WHERE (project, tag, swimlane) = (SELECT assigned_project, COALESCE(tag, ''), assigned_kanban_swimlane
+                                              FROM Tasks WHERE id = ?);
+        """, (1,))
+        self.assertIn("SEARCH TaskStats USING PRIMARY KEY", plan)
+
+    def test_select_tasks_due_between(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        add_project_to_db(conn, Project("P2"))
+        for name, project, day, swimlane in (("T1", "P1", "2024-03-01", KanbanBoardColumns.BACKLOG.value),
+                                             ("T2", "P2", "2024-02-01", KanbanBoardColumns.DONE.value),
+                                             ("T3", "P1", None, KanbanBoardColumns.BACKLOG.value),
+                                             ("T4", "P2", "2024-03-01", KanbanBoardColumns.IN_PROGRESS.value),
+                                             ("T5", "P1", "2024-04-15", KanbanBoardColumns.BACKLOG.value)):
+            add_task_to_db(conn, Task(taskname=name, assigned_project=project, date_to_perform=day,
+                                      assigned_kanban_swimlane=swimlane))
+        def names(rows):
+            return [row[1] for row in rows]
+        self.assertEqual(names(select_tasks_due_between(conn, "2024-02-01", date(2024, 3, 1))), ["T2", "T1", "T4"])
+        self.assertEqual(select_tasks_due_between(conn, "01.03.2024", "2024-03-01")[1],
+                         (4, "T4", "P2", KanbanBoardColumns.IN_PROGRESS.value, "2024-03-01"))
+        self.assertEqual(names(select_tasks_due_between(conn)), ["T2", "T1", "T4", "T5"])
+        self.assertEqual(names(select_tasks_due_between(conn, first_day="2024-03-02")), ["T5"])
+        self.assertEqual(names(select_tasks_due_between(conn, include_done=False, limit=2)), ["T1", "T4"])
+        self.assertEqual(names(select_overdue_tasks(conn, today="2024-04-15")), ["T1", "T4"])
+        with self.assertRaises(ValueError):
+            select_tasks_due_between(conn, "2024-02-30")
+
+    def test_statistics(self):
+        def recomputed(conn):
+            # the statistics computed from all tasks and subtasks
+            return conn.execute("""
+                SELECT assigned_project, COALESCE(tag, ''), assigned_kanban_swimlane, COUNT(*),
+                       TOTAL(estimated_pomodoros), TOTAL(performed_pomodoros),
+                       (SELECT COUNT(*) FROM Subtasks JOIN Tasks AS t ON t.id = task_id
+                        WHERE (t.assigned_project, COALESCE(t.tag, ''), t.assigned_kanban_swimlane) =
+                              (Tasks.assigned_project, COALESCE(Tasks.tag, ''), Tasks.assigned_kanban_swimlane)),
+                       (SELECT COUNT(*) FROM Subtasks JOIN Tasks AS t ON t.id = task_id
+                        WHERE (t.assigned_project, COALESCE(t.tag, ''), t.assigned_kanban_swimlane) =
+                              (Tasks.assigned_project, COALESCE(Tasks.tag, ''), Tasks.assigned_kanban_swimlane)
+                              AND status != 0)
+                FROM Tasks GROUP BY 1, 2, 3 ORDER BY 1, 2, 3;
+            """).fetchall()
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        task1 = Task(taskname="T1", assigned_project="P1", estimated_pomodoros=3, tag="Home")
+        task1.add_subtask(Subtask(description="S1"))
+        task1.add_subtask(Subtask(description="S2", status=1))
+        task2 = Task(taskname="T2", assigned_project="P1", estimated_pomodoros=2, performed_pomodoros=1)
+        task3 = Task(taskname="T3", assigned_project="P2", assigned_kanban_swimlane=KanbanBoardColumns.DONE.value)
+        for task in (task1, task2, task3):
+            add_task_to_db(conn, task)
+        self.assertEqual(select_project_statistics(conn), {"P1": (2, 5, 1, 2, 1), "P2": (1, 0, 0, 0, 0)})
+        self.assertEqual(select_statistics(conn, ()), [(3, 5, 1, 2, 1)])
+        self.assertEqual([row[:2] for row in select_statistics(conn, ("tag", "swimlane"))],
+                         [("", KanbanBoardColumns.BACKLOG.value), ("", KanbanBoardColumns.DONE.value),
+                          ("Home", KanbanBoardColumns.BACKLOG.value)])
+        # edits move the task between the rows
+        task1.assigned_kanban_swimlane = KanbanBoardColumns.DONE.value
+        task1.performed_pomodoros = 3
+        update_task_in_db(conn, task1)
+        task1.subtasks[0].status = 1
+        conn.execute("UPDATE Subtasks SET status = 1 WHERE id = ?;", (task1.subtasks[0].id,))
+        task2.tag = "Home"
+        update_task_in_db(conn, task2)
+        self.assertEqual([row[1:] for row in select_statistics(conn, ("swimlane",))],
+                         [(1, 2, 1, 0, 0), (2, 3, 3, 2, 2)])
+        self.assertEqual([row[3:] for row in select_statistics(conn, ("project", "tag", "swimlane"))],
+                         [row[3:] for row in recomputed(conn)])
+        # grouped by tag a task is counted in each of its tags
+        task2.tag = "Home, Work"
+        update_task_in_db(conn, task2)
+        self.assertEqual(select_statistics(conn, ("tag",)),
+                         [("", 1, 0, 0, 0, 0), ("Home", 2, 5, 4, 2, 2), ("Work", 1, 2, 1, 0, 0)])
+        self.assertEqual(select_statistics(conn, ()), [(3, 5, 4, 2, 2)])
+        # deleted subtasks and tasks are subtracted, empty rows removed
+        conn.execute("DELETE FROM Subtasks WHERE id = ?;", (task1.subtasks[1].id,))
+        conn.execute("DELETE FROM Tasks WHERE id = ?;", (task3.id,))
+        conn.execute("DELETE FROM Tasks WHERE id = ?;", (task1.id,))
+        self.assertEqual(select_project_statistics(conn), {"P1": (1, 2, 1, 0, 0)})
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM TaskStats;").fetchone()[0], 1)
+        with self.assertRaises(ValueError):
+            select_statistics(conn, ("taskname",))
+
+    def test_select_tasks_by_tags(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        add_project_to_db(conn, Project("P2"))
+        tasks = [Task(taskname="T1", assigned_project="P1", tag="Haushalt, dringend"),
+                 Task(taskname="T2", assigned_project="P1", tag="Haushalt"),
+                 Task(taskname="T3", assigned_project="P2", tag=" dringend,dringend ")]
+        for task in tasks:
+            add_task_to_db(conn, task)
+        def names(rows):
+            return [row[1] for row in rows]
+        self.assertEqual(names(select_tasks_by_tags(conn, ["Haushalt", "dringend"])), ["T1", "T2", "T3"])
+        self.assertEqual(names(select_tasks_by_tags(conn, ["dringend", "Haushalt"], match_all=True)), ["T1"])
+        self.assertEqual(names(select_tasks_by_tags(conn, ["dringend"], project_name="P2")), ["T3"])
+        self.assertEqual(select_tasks_by_tags(conn, []), [])
+        # the tag table follows the tag text of the tasks
+        tasks[0].tag = "Garten"
+        update_task_in_db(conn, tasks[0])
+        conn.execute("DELETE FROM Tasks WHERE id = ?;", (tasks[2].id,))
+        self.assertEqual(select_tags(conn), [("Garten", 1), ("Haushalt", 1), ("dringend", 0)])
+        self.assertEqual(names(select_tasks_by_tags(conn, ["Garten", "Haushalt"])), ["T1", "T2"])
+
+    def test_performance_profile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = initialize_database(db_name=os.path.join(tmp_dir, "profile.db"), profile="balanced")
+            self.assertEqual(conn.execute("PRAGMA journal_mode;").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous;").fetchone()[0], 1) # NORMAL
+            self.assertEqual(conn.execute("PRAGMA busy_timeout;").fetchone()[0], 5000)
+            conn.close()
+        with self.assertRaises(ValueError):
+            apply_performance_profile(sqlite3.connect(":memory:"), "unknown")
+
+    def test_generate_focusme_data_obj_interns_strings(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        add_task_to_db(conn, Task(taskname="Task1", assigned_project="P1", tag="Important"))
+        add_task_to_db(conn, Task(taskname="Task2", assigned_project="P1", tag="Important"))
+        task1, task2 = generate_focusme_data_obj(conn).get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value]
+        self.assertIs(task1.assigned_kanban_swimlane, task2.assigned_kanban_swimlane)
+        self.assertIs(task1.tag, task2.tag)
+        self.assertIs(task1.repeat, task2.repeat)
+        self.assertIs(task1.assigned_project, task2.assigned_project)
+
+    def test_move_task_persists_rank_and_swimlane(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        for name in ("Task1", "Task2", "Task3"):
+            add_task_to_db(conn, Task(taskname=name, assigned_project="P1"))
+        project = generate_focusme_data_obj(conn).get_project("P1")
+        backlog = KanbanBoardColumns.BACKLOG.value
+        done = KanbanBoardColumns.DONE.value
+        self.assertEqual([task.kanban_rank for task in project.tasks[backlog]], [RANK_STEP, 2 * RANK_STEP, 3 * RANK_STEP])
+        # move Task3 in front of Task1, then Task2 into the DONE swimlane
+        with transaction(conn) as uow:
+            for task in project.move_task(project.get_task("Task3", backlog), backlog, 0):
+                uow.update_task(task)
+            for task in project.move_task(project.get_task("Task2", backlog), done):
+                uow.update_task(task)
+        project = generate_focusme_data_obj(conn).get_project("P1")
+        self.assertEqual([task.taskname for task in project.tasks[backlog]], ["Task3", "Task1"])
+        self.assertEqual([task.taskname for task in project.tasks[done]], ["Task2"])
+        # a new task is appended at the end of its swimlane
+        add_task_to_db(conn, Task(taskname="Task4", assigned_project="P1"))
+        project = generate_focusme_data_obj(conn).get_project("P1")
+        self.assertEqual([task.taskname for task in project.tasks[backlog]], ["Task3", "Task1", "Task4"])
+
+    def test_search_tasks(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        add_project_to_db(conn, Project("P2"))
+        task1 = Task(taskname="Einkaufen", description="Brot und Milch", assigned_project="P1")
+        task2 = Task(taskname="Milch holen", description="beim Bauern", assigned_project="P2", tag="Haushalt")
+        task1.add_subtask(Subtask(description="Käse aussuchen"))
+        add_task_to_db(conn, task1)
+        add_task_to_db(conn, task2)
+        # matches of all projects, a match in the task name ranks first
+        self.assertEqual([row[0] for row in search_tasks(conn, "milch")], [task2.id, task1.id])
+        self.assertEqual(search_tasks(conn, "milch")[0], (task2.id, "Milch holen", "P2", KanbanBoardColumns.BACKLOG.value))
+        # prefix of the last word, tag, subtask description without diacritics
+        self.assertEqual([row[0] for row in search_tasks(conn, "einka")], [task1.id])
+        self.assertEqual([row[0] for row in search_tasks(conn, "haushalt")], [task2.id])
+        self.assertEqual([row[0] for row in search_tasks(conn, "kase")], [task1.id])
+        self.assertEqual([row[0] for row in search_tasks(conn, "brot milch")], [task1.id])
+        # FTS5 syntax typed by the user is searched as text
+        self.assertEqual(search_tasks(conn, 'milch" OR "bauern'), [])
+        self.assertEqual(search_tasks(conn, "  "), [])
+        # the triggers keep the index current
+        task2.taskname = "Eier holen"
+        update_task_in_db(conn, task2)
+        self.assertEqual([row[0] for row in search_tasks(conn, "eier")], [task2.id])
+        add_subtask_to_db(conn, Subtask(description="Senf", task_id=task2.id), task2)
+        self.assertEqual([row[0] for row in search_tasks(conn, "senf")], [task2.id])
+        conn.execute("DELETE FROM Subtasks WHERE description = 'Senf';")
+        self.assertEqual(search_tasks(conn, "senf"), [])
+        conn.execute("DELETE FROM Tasks WHERE id = ?;", (task1.id,))
+        self.assertEqual(search_tasks(conn, "einkaufen"), [])
+        # all matches are ranked, also an old best match behind many newer ones
+        with transaction(conn) as uow:
+            for number in range(1200):
+                uow.add_task(Task(taskname=f"Task{number}", description="Eier kochen", assigned_project="P1"))
+        self.assertEqual(search_tasks(conn, "eier", limit=3)[0][0], task2.id)
+        self.assertEqual(len(search_tasks(conn, "eier", limit=3)), 3)
+
+    def test_save_focusme_model_to_db(self):
+        conn=initialize_database() #in memory data base
+        focusme_data = FocusMeData()
+        project = Project("P1")
+        focusme_data.add_project(project)
+        task = Task(taskname="Task1", assigned_project="P1")
+        task.add_subtask(Subtask(description="Subtask1"))
+        project.add_task(task)
+        save_focusme_model_to_db(conn, focusme_data)
+        self.assertIsNotNone(task.id)
+        # stored objects are updated, new subtasks are inserted
+        task.taskname = "Renamed"
+        task.add_subtask(Subtask(description="Subtask2"))
+        save_focusme_model_to_db(conn, focusme_data)
+        loaded_task = generate_focusme_data_obj(conn).get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value][0]
+        self.assertEqual(loaded_task.taskname, "Renamed")
+        self.assertEqual([subtask.description for subtask in loaded_task.subtasks], ["Subtask1", "Subtask2"])
@@ -0,0 +1,44 @@
+import unittest
+import threading
+from model.focusme_model import Project, Task, Subtask, KanbanBoardColumns
+from model.focusme_db import add_project_to_db, add_task_to_db, add_subtask_to_db, select_task_table, \
+                             select_subtask_table, WriteBehindQueue
+from model.focusme_db_worker import DatabaseWorker
+
+class TestDatabaseWorker(unittest.TestCase):
+    def test_commands_run_on_worker_thread(self):
+        worker = DatabaseWorker() #in memory data base
+        thread_name = worker.call(lambda conn: threading.current_thread().name)
+        self.assertEqual(thread_name, worker.thread.name)
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+        worker.close()
+
+    def test_write_order(self):
+        worker = DatabaseWorker() #in memory data base
+        project = Project("P1")
+        task = Task(taskname="Task", assigned_project="P1")
+        subtask = Subtask(description="Subtask")
+        pending_writes = WriteBehindQueue()
+        # submitted without waiting, the ids are set by the worker
+        worker.submit(add_project_to_db, project)
+        worker.submit(add_task_to_db, task)
+        worker.submit(add_subtask_to_db, subtask, task)
+        task.taskname = "Renamed Task"
+        pending_writes.mark_task_dirty(task)
+        worker.submit(pending_writes.flush)
+        tasks_table = worker.call(select_task_table, "P1")
+        subtask_table = worker.call(select_subtask_table, task.id)
+        worker.close()
+        self.assertEqual(tasks_table[0][1], "Renamed Task")
+        self.assertEqual(tasks_table[0][8], KanbanBoardColumns.BACKLOG.value)
+        self.assertEqual(subtask_table[0][0], subtask.id)
+        self.assertEqual(subtask.project_id, project.id)
+
+    def test_exception_is_returned(self):
+        worker = DatabaseWorker() #in memory data base
+        future = worker.submit(lambda conn: conn.execute("SELECT * FROM NoTable;"))
+        with self.assertRaises(Exception):
+            future.result()
+        # the worker keeps running after a failed command
+        self.assertEqual(worker.call(lambda conn: 1), 1)
+        worker.close()
@@ -0,0 +1,167 @@
+import unittest
+import io
+import os
+import tempfile
+from model.focusme_model import Project, Task, Subtask, KanbanBoardColumns, RANK_STEP
+from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db, generate_focusme_data_obj, \
+                             search_tasks, SEARCH_INSERT_TRIGGERS
+from model.focusme_import_export import export_records, import_records, read_jsonl, write_jsonl, read_csv, \
+                                        write_csv, export_file, import_file
+
+def fill(conn):
+    add_project_to_db(conn, Project("P1"))
+    add_project_to_db(conn, Project("P2"))
+    task1 = Task(taskname="Task1", description="Beschreibung, mit \"Zeichen\"\nund Zeilen", assigned_project="P1",
+                 estimated_pomodoros=3, date_to_perform="2025-02-01", tag="Tag")
+    task1.add_subtask(Subtask(description="Subtask1"))
+    task1.add_subtask(Subtask(description="Subtask2", status=1))
+    task2 = Task(taskname="Task2", assigned_project="P2", assigned_kanban_swimlane=KanbanBoardColumns.DONE.value)
+    task3 = Task(taskname="Task3", assigned_project="P1")
+    task3.add_subtask(Subtask(description="Subtask3"))
+    for task in (task1, task2, task3):
+        add_task_to_db(conn, task)
+
+def board(conn):
+    """
+    project -> swimlane -> [(taskname, description, subtasks)] of a database
+    """
+    focusme_data = generate_focusme_data_obj(conn)
+    return {project.name: {swimlane: [(task.taskname, task.description, task.estimated_pomodoros, task.tag,
+                                       [(subtask.description, subtask.status) for subtask in task.subtasks])
+                                      for task in tasks]
+                           for swimlane, tasks in project.tasks.items()}
+            for project in focusme_data.projects}
+
+class TestImportExport(unittest.TestCase):
+    def test_export_records(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        records = list(export_records(conn))
+        self.assertEqual([record["type"] for record in records],
+                         ["project", "project", "task", "subtask", "subtask", "task", "task", "subtask"])
+        self.assertEqual(records[2]["project"], "P1")
+        self.assertEqual(records[3]["task_id"], records[2]["id"])
+
+    def test_round_trip_jsonl_and_csv(self):
+        source=initialize_database() #in memory data base
+        fill(source)
+        for write, read in ((write_jsonl, read_jsonl), (write_csv, read_csv)):
+            file = io.StringIO(newline="")
+            self.assertEqual(write(export_records(source), file), 8)
+            file.seek(0)
+            target=initialize_database() #in memory data base
+            counts = import_records(target, read(file), chunk_size=2)
+            self.assertEqual(counts, {"projects": 2, "tasks": 3, "subtasks": 3})
+            self.assertEqual(board(target), board(source))
+
+    def test_import_into_existing_project(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        records = [
+            {"type": "task", "id": 7, "project": "P1", "taskname": "Imported", "date_to_perform": "24.12.2024"},
+            {"type": "subtask", "task_id": 7, "description": "Imported subtask"},
+            {"type": "task", "project": "P3", "taskname": "New project"},
+        ]
+        self.assertEqual(import_records(conn, records), {"projects": 1, "tasks": 2, "subtasks": 1})
+        project = generate_focusme_data_obj(conn).get_project("P1")
+        backlog = project.tasks[KanbanBoardColumns.BACKLOG.value]
+        # appended at the end of the swimlane, the file id is not used
+        self.assertEqual([task.taskname for task in backlog], ["Task1", "Task3", "Imported"])
+        self.assertEqual(backlog[-1].kanban_rank, backlog[-2].kanban_rank + RANK_STEP)
+        self.assertNotEqual(backlog[-1].id, 7)
+        # dates of older files are converted
+        self.assertEqual(backlog[-1].date_to_perform, "2024-12-24")
+        self.assertEqual(backlog[-1].subtasks[0].description, "Imported subtask")
+        project_id = conn.execute("SELECT project_id FROM Subtasks WHERE task_id = ?;", (backlog[-1].id,)).fetchone()[0]
+        self.assertEqual(project_id, project.id)
+
+    def test_import_ranks_are_relative(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        # the ranks of the file collide with the ranks of Task1 and Task3
+        records = [
+            {"type": "task", "project": "P1", "taskname": "Second", "kanban_rank": 2 * RANK_STEP},
+            {"type": "subtask", "description": "Subtask of second", "status": 1},
+            {"type": "task", "project": "P1", "taskname": "First", "kanban_rank": RANK_STEP / 2},
+            {"type": "task", "project": "P1", "taskname": "Third"},
+        ]
+        import_records(conn, records, chunk_size=1)
+        backlog = generate_focusme_data_obj(conn).get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value]
+        self.assertEqual([task.taskname for task in backlog], ["Task1", "Task3", "First", "Second", "Third"])
+        self.assertEqual(backlog[2].kanban_rank, backlog[1].kanban_rank + RANK_STEP)
+        # the subtasks are counted in the statistics of their imported task
+        self.assertEqual(conn.execute("SELECT TOTAL(subtasks), TOTAL(subtasks_done) FROM TaskStats;").fetchone(),
+                         (4.0, 2.0))
+
+    def test_imported_tasks_are_searchable(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        records = [
+            {"type": "task", "id": 1, "project": "P1", "taskname": "Imported"},
+            {"type": "subtask", "task_id": 1, "description": "Checkliste"},
+        ]
+        import_records(conn, records)
+        self.assertEqual([row[1] for row in search_tasks(conn, "checkl")], ["Imported"])
+        triggers = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger';")}
+        self.assertTrue(set(SEARCH_INSERT_TRIGGERS) <= triggers)
+        add_task_to_db(conn, Task(taskname="Added later", assigned_project="P1"))
+        self.assertEqual([row[1] for row in search_tasks(conn, "later")], ["Added later"])
+
+    def test_csv_round_trip_with_empty_texts(self):
+        source=initialize_database() #in memory data base
+        add_project_to_db(source, Project("P1"))
+        task = Task(taskname="Task", description="", assigned_project="P1", tag="")
+        task.add_subtask(Subtask(description=""))
+        add_task_to_db(source, task)
+        file = io.StringIO(newline="")
+        write_csv(export_records(source), file)
+        file.seek(0)
+        target=initialize_database() #in memory data base
+        self.assertEqual(import_records(target, read_csv(file)), {"projects": 1, "tasks": 1, "subtasks": 1})
+        self.assertEqual(board(target), board(source))
+
+    def test_import_in_open_transaction(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        # a second project with the name P1, the tasks are matched to the first one
+        conn.execute("INSERT INTO Projects (name) VALUES ('P1');")
+        import_records(conn, [{"type": "task", "project": "P1", "taskname": "Imported"},
+                              {"type": "subtask", "description": "Imported subtask"}])
+        project_id = conn.execute("SELECT project_id FROM Subtasks WHERE description = 'Imported subtask';").fetchone()[0]
+        self.assertEqual(project_id, 1)
+        # the outer transaction is left to the caller, also by a failed import
+        self.assertTrue(conn.in_transaction)
+        with self.assertRaises(ValueError):
+            import_records(conn, [{"type": "unknown"}])
+        self.assertTrue(conn.in_transaction)
+        conn.rollback()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM Projects;").fetchone()[0], 2)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM Tasks WHERE taskname = 'Imported';").fetchone()[0], 0)
+
+    def test_failed_import_changes_nothing(self):
+        conn=initialize_database() #in memory data base
+        fill(conn)
+        before = board(conn)
+        records = [
+            {"type": "task", "id": 1, "project": "P1", "taskname": "Imported"},
+            {"type": "subtask", "task_id": 2, "description": "Subtask of another task"},
+        ]
+        with self.assertRaises(ValueError):
+            import_records(conn, records)
+        self.assertEqual(board(conn), before)
+
+    def test_export_import_file(self):
+        source=initialize_database() #in memory data base
+        fill(source)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for file_name in ("focusme.jsonl", "focusme.csv"):
+                file_name = os.path.join(tmp_dir, file_name)
+                self.assertEqual(export_file(source, file_name), 8)
+                target=initialize_database() #in memory data base
+                import_file(target, file_name)
+                self.assertEqual(board(target), board(source))
+            with self.assertRaises(ValueError):
+                export_file(source, os.path.join(tmp_dir, "focusme.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import json
+import logging
+import os
+import tempfile
+from model.focusme_model import Project, Task, Subtask
+from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db, select_task_table, \
+                             WriteBehindQueue
+from model.focusme_instrumentation import INSTRUMENTATION, Instrumentation, instrumented
+
+@instrumented
+def failing():
+    raise ValueError("failed")
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        INSTRUMENTATION.reset()
+
+    def tearDown(self):
+        INSTRUMENTATION.disable()
+        INSTRUMENTATION.reset()
+
+    def test_disabled_records_nothing(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        self.assertEqual(INSTRUMENTATION.to_dict(), {})
+
+    def test_database_calls(self):
+        conn=initialize_database() #in memory data base
+        INSTRUMENTATION.enable()
+        INSTRUMENTATION.attach(conn)
+        add_project_to_db(conn, Project("P1"))
+        task = Task(taskname="Task", assigned_project="P1")
+        task.add_subtask(Subtask(description="Subtask 1"))
+        task.add_subtask(Subtask(description="Subtask 2"))
+        add_task_to_db(conn, task)
+        select_task_table(conn, "P1")
+        select_task_table(conn, "P1")
+        stats = INSTRUMENTATION.to_dict()
+        self.assertEqual(stats["focusme_db.add_task_to_db"]["count"], 1)
+        self.assertEqual(stats["focusme_db.add_task_to_db"]["commits"], 1)
+        # the project, and the task with its subtasks, are written by one commit of a unit of work each
+        self.assertEqual(stats["focusme_db.UnitOfWork.commit"]["count"], 2)
+        self.assertGreaterEqual(stats["focusme_db.add_task_to_db"]["rows"], 3)
+        self.assertEqual(stats["focusme_db.select_task_table"]["count"], 2)
+        self.assertEqual(stats["focusme_db.select_task_table"]["rows"], 2)
+        self.assertEqual(stats["focusme_db.select_task_table"]["queries"], 2)
+        self.assertEqual(stats["focusme_db.select_task_table"]["commits"], 0)
+        self.assertGreater(stats["focusme_db.select_task_table"]["p99_ms"], 0.0)
+
+    def test_method_call_site(self):
+        conn=initialize_database() #in memory data base
+        add_project_to_db(conn, Project("P1"))
+        task = Task(taskname="Task", assigned_project="P1")
+        add_task_to_db(conn, task)
+        INSTRUMENTATION.enable()
+        INSTRUMENTATION.attach(conn)
+        queue = WriteBehindQueue(conn)
+        task.taskname = "Renamed"
+        queue.mark_task_dirty(task)
+        queue.flush()
+        stats = INSTRUMENTATION.to_dict()["focusme_db.WriteBehindQueue.flush"]
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(stats["commits"], 1)
+        self.assertGreaterEqual(stats["rows"], 1)
+
+    def test_exception_is_recorded(self):
+        INSTRUMENTATION.enable()
+        with self.assertRaises(ValueError):
+            failing()
+        self.assertEqual(INSTRUMENTATION.to_dict()["test_focusme_instrumentation.failing"]["count"], 1)
+        self.assertEqual(Instrumentation().to_dict(), {})
+
+    def test_export(self):
+        conn=initialize_database() #in memory data base
+        INSTRUMENTATION.enable()
+        add_project_to_db(conn, Project("P1"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, "stats.json")
+            INSTRUMENTATION.export_json(file_name)
+            with open(file_name, encoding="utf-8") as json_file:
+                self.assertEqual(json.load(json_file)["focusme_db.add_project_to_db"]["count"], 1)
+        with self.assertLogs("model.focusme_instrumentation", level=logging.INFO) as logs:
+            INSTRUMENTATION.log_summary()
+        self.assertTrue(any("focusme_db.add_project_to_db: 1 calls" in line for line in logs.output))
+
+if __name__ == '__main__':
+    unittest.main()
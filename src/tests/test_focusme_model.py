@@ -1,6 +1,10 @@
 import unittest
+import math
 import sqlite3
-from model.focusme_model import Project, FocusMeData, Task, KanbanBoardColumns
+from datetime import date
+import pickle
+from model.focusme_model import Project, FocusMeData, Task, Subtask, KanbanBoardColumns, RANK_STEP, to_iso_date, \
+                                split_tags, filtered_row_position, ChangeBus, ChangeEvent
 from model.focusme_db import initialize_database, add_task_to_db, update_task_in_db
 
 class TestFocusMeModel(unittest.TestCase):
@@ -21,7 +25,169 @@ class TestFocusMeModel(unittest.TestCase):
         self.assertEqual(project_2.name, project_name_2)
         project_3 = focusme.get_project(false_name)
         self.assertEqual(project_3, None)
+
+    def test_get_project_by_id(self):
+        focusme = FocusMeData()
+        project_1 = Project("First Project", 1)
+        project_2 = Project("Second Project") # not yet stored in the database
+        focusme.add_project(project_1)
+        focusme.add_project(project_2)
+        self.assertIs(focusme.get_project_by_id(1), project_1)
+        self.assertEqual(focusme.get_project_by_id(2), None)
+        project_2.id = 2
+        self.assertIs(focusme.get_project_by_id(2), project_2)
+        focusme.remove_project(project_1)
+        self.assertEqual(focusme.get_project_by_id(1), None)
+        self.assertEqual(focusme.get_project("First Project"), None)
+        self.assertEqual(focusme.projects, [project_2])
+
+    def test_get_task_by_id(self):
+        focusme = FocusMeData()
+        project_1 = Project("First Project", 1)
+        project_1.add_task(Task(id=10, taskname="Task 10"))
+        focusme.add_project(project_1)
+        project_2 = Project("Second Project", 2)
+        focusme.add_project(project_2)
+        task_11 = Task(taskname="Task 11")
+        project_2.add_task(task_11)
+        task_11.id = 11 # id set after the insert into the database
+        self.assertEqual(focusme.get_task_by_id(10).taskname, "Task 10")
+        self.assertIs(focusme.get_task_by_id(11), task_11)
+        self.assertIs(project_2.get_task_by_id(11), task_11)
+        self.assertEqual(project_1.get_task_by_id(11), None)
+        project_2.remove_task(task_11)
+        self.assertEqual(focusme.get_task_by_id(11), None)
+        project_1.unload_tasks()
+        self.assertEqual(focusme.get_task_by_id(10), None)
         
+# events that bracket the changes of the lists, tested in test_task_row_events
+ROW_EVENTS = {ChangeEvent.TASK_ROW_ABOUT_TO_BE_INSERTED, ChangeEvent.TASK_ROW_INSERTED,
+              ChangeEvent.TASK_ROW_ABOUT_TO_BE_REMOVED, ChangeEvent.TASK_ROW_REMOVED}
+
+class TestChangeNotifications(unittest.TestCase):
+    def setUp(self):
+        self.focusme = FocusMeData()
+        self.events = []
+        for kind in set(ChangeEvent) - ROW_EVENTS:
+            self.focusme.changes.subscribe(kind, lambda subject, kind=kind, **details:
+                                           self.events.append((kind, subject, details)))
+
+    def subscribe_row_events(self, project):
+        """
+        Records the row events with the length of the swimlane list at the time of the event
+        """
+        rows = []
+        for kind in ROW_EVENTS:
+            self.focusme.changes.subscribe(kind, lambda task, project, swimlane, position, kind=kind:
+                                           rows.append((kind.name, swimlane, position, len(project.tasks[swimlane]))))
+        return rows
+
+    def test_change_bus(self):
+        bus = ChangeBus()
+        calls = []
+        callback = lambda subject, **details: calls.append((subject, details))
+        bus.publish(ChangeEvent.TASK_ADDED, "no subscribers")
+        bus.subscribe(ChangeEvent.TASK_ADDED, callback)
+        bus.publish(ChangeEvent.TASK_ADDED, "task", project="project")
+        bus.publish(ChangeEvent.TASK_REMOVED, "other kind")
+        bus.unsubscribe(ChangeEvent.TASK_ADDED, callback)
+        bus.publish(ChangeEvent.TASK_ADDED, "unsubscribed")
+        self.assertEqual(calls, [("task", {"project": "project"})])
+        self.assertEqual(bus.subscribers, {})
+        # the subscribers are not part of the snapshot
+        bus.subscribe(ChangeEvent.TASK_ADDED, callback)
+        self.assertEqual(pickle.loads(pickle.dumps(bus)).subscribers, {})
+
+    def test_project_events(self):
+        project = Project("Project", 1)
+        self.focusme.add_project(project)
+        self.focusme.remove_project(project)
+        self.assertEqual([(kind, subject) for kind, subject, _ in self.events],
+                         [(ChangeEvent.PROJECT_ADDED, project), (ChangeEvent.PROJECT_REMOVED, project)])
+
+    def test_task_events(self):
+        project = Project("Project", 1)
+        self.focusme.add_project(project)
+        backlog, done = KanbanBoardColumns.BACKLOG.value, KanbanBoardColumns.DONE.value
+        task_1 = Task(id=1, taskname="Task 1")
+        task_2 = Task(id=2, taskname="Task 2")
+        self.events.clear()
+        project.add_task(task_1)
+        project.add_task(task_2)
+        project.move_task(task_1, done)
+        self.assertEqual(project.update_task(task_2, taskname="Renamed", tag="a", description=""), ("taskname", "tag"))
+        project.update_task(task_2, tag="a")
+        project.remove_task(task_2)
+        project_details = {"project": project}
+        self.assertEqual(self.events, [
+            (ChangeEvent.TASK_ADDED, task_1, project_details),
+            (ChangeEvent.TASK_ADDED, task_2, project_details),
+            (ChangeEvent.TASK_MOVED, task_1, dict(project_details, source=(backlog, 0), changed_tasks=[task_1])),
+            (ChangeEvent.TASK_CHANGED, task_2, dict(project_details, fields=("taskname", "tag"))),
+            (ChangeEvent.TASK_REMOVED, task_2, dict(project_details, position=0)),
+        ])
+        self.assertIs(project.get_task("Task 1", done), task_1)
+        self.assertEqual(project.filter_tasks(["a"])[backlog], [])
+        with self.assertRaises(ValueError):
+            project.update_task(task_1, assigned_kanban_swimlane=backlog)
+
+    def test_task_row_events(self):
+        project = Project("Project", 1)
+        self.focusme.add_project(project)
+        rows = self.subscribe_row_events(project)
+        backlog, done = KanbanBoardColumns.BACKLOG.value, KanbanBoardColumns.DONE.value
+        task_1 = Task(id=1, taskname="Task 1")
+        project.add_task(task_1)
+        project.add_task(Task(id=2, taskname="Task 2", kanban_rank=RANK_STEP / 2))
+        project.remove_task(task_1)
+        # the about to events see the list before, the other events after the change
+        self.assertEqual(rows, [
+            ("TASK_ROW_ABOUT_TO_BE_INSERTED", backlog, 0, 0), ("TASK_ROW_INSERTED", backlog, 0, 1),
+            ("TASK_ROW_ABOUT_TO_BE_INSERTED", backlog, 0, 1), ("TASK_ROW_INSERTED", backlog, 0, 2),
+            ("TASK_ROW_ABOUT_TO_BE_REMOVED", backlog, 1, 2), ("TASK_ROW_REMOVED", backlog, 1, 1),
+        ])
+        task_3 = Task(id=3, taskname="Task 3")
+        project.add_task(task_3)
+        del rows[:]
+        # a move removes the row from the source and then inserts it into the target
+        project.move_task(task_3, done)
+        project.move_task(task_3, backlog, 0)
+        self.assertEqual(rows, [
+            ("TASK_ROW_ABOUT_TO_BE_REMOVED", backlog, 1, 2), ("TASK_ROW_REMOVED", backlog, 1, 1),
+            ("TASK_ROW_ABOUT_TO_BE_INSERTED", done, 0, 0), ("TASK_ROW_INSERTED", done, 0, 1),
+            ("TASK_ROW_ABOUT_TO_BE_REMOVED", done, 0, 1), ("TASK_ROW_REMOVED", done, 0, 0),
+            ("TASK_ROW_ABOUT_TO_BE_INSERTED", backlog, 0, 1), ("TASK_ROW_INSERTED", backlog, 0, 2),
+        ])
+
+    def test_subtask_events(self):
+        project = Project("Project", 1)
+        self.focusme.add_project(project)
+        task = Task(id=1, taskname="Task")
+        project.add_task(task)
+        subtask = Subtask(description="Subtask")
+        self.events.clear()
+        project.add_subtask(task, subtask)
+        self.assertEqual(project.update_subtask(task, subtask, status=True, description="Subtask"), ("status",))
+        self.assertEqual(project.update_subtask(task, subtask, status=True), ())
+        self.assertEqual(task.subtasks, [subtask])
+        self.assertEqual(self.events, [
+            # published before the subtask is appended
+            (ChangeEvent.SUBTASK_ABOUT_TO_BE_ADDED, subtask, {"project": project, "task": task, "position": 0}),
+            (ChangeEvent.SUBTASK_ADDED, subtask, {"project": project, "task": task}),
+            (ChangeEvent.SUBTASK_CHANGED, subtask, {"project": project, "task": task, "fields": ("status",)}),
+        ])
+
+    def test_no_events_while_loading(self):
+        project = Project("Project", 1)
+        project.set_header({KanbanBoardColumns.BACKLOG.value: 1})
+        self.focusme.add_project(project)
+        self.events.clear()
+        # e.g. load_project_tasks on the database worker
+        project.clear_tasks()
+        project.add_task(Task(id=1, taskname="Task"))
+        project.tasks_loaded = True
+        self.assertEqual(self.events, [])
+
 class TestProject(unittest.TestCase):
     def test_create_project(self):
         project_name = "Testproject"
@@ -36,13 +202,152 @@ class TestProject(unittest.TestCase):
         project.add_task(task1)
         project.add_task(task2)
         self.assertEqual(project.name,project_name)
+
+    def test_rename_move_task(self):
+        project = Project("Testproject")
+        task = Task(id=1, taskname="Task")
+        project.add_task(task)
+        project.rename_task(task, "Renamed")
+        self.assertEqual(project.get_task("Task", KanbanBoardColumns.BACKLOG.value), None)
+        self.assertIs(project.get_task("Renamed", KanbanBoardColumns.BACKLOG.value), task)
+        project.move_task(task, KanbanBoardColumns.DONE.value)
+        self.assertEqual(project.get_task("Renamed", KanbanBoardColumns.BACKLOG.value), None)
+        self.assertIs(project.get_task("Renamed", KanbanBoardColumns.DONE.value), task)
+        self.assertEqual(project.tasks[KanbanBoardColumns.DONE.value], [task])
+        self.assertEqual(task.assigned_kanban_swimlane, KanbanBoardColumns.DONE.value)
+
+    def test_move_task_ranks(self):
+        project = Project("Testproject")
+        backlog = KanbanBoardColumns.BACKLOG.value
+        tasks = [Task(id=i, taskname=f"Task{i}") for i in range(1, 4)]
+        for task in tasks:
+            project.add_task(task)
+        self.assertEqual([task.kanban_rank for task in tasks], [RANK_STEP, 2 * RANK_STEP, 3 * RANK_STEP])
+        # moving between two tasks changes only the moved task
+        self.assertEqual(project.move_task(tasks[2], backlog, 1), [tasks[2]])
+        self.assertEqual(project.tasks[backlog], [tasks[0], tasks[2], tasks[1]])
+        self.assertEqual(tasks[2].kanban_rank, 1.5 * RANK_STEP)
+        self.assertEqual(project.move_task(tasks[0], backlog), [tasks[0]])
+        self.assertEqual(project.tasks[backlog], [tasks[2], tasks[1], tasks[0]])
+        # the swimlane is renumbered when no rank is left between the neighbours
+        tasks[1].kanban_rank = math.nextafter(tasks[2].kanban_rank, math.inf)
+        changed = project.move_task(tasks[0], backlog, 1)
+        self.assertEqual(changed, [tasks[2], tasks[0], tasks[1]])
+        self.assertEqual([task.kanban_rank for task in changed], [RANK_STEP, 2 * RANK_STEP, 3 * RANK_STEP])
+
+    def test_get_task_duplicate_names(self):
+        project = Project("Testproject")
+        task1 = Task(id=1, taskname="Task")
+        task2 = Task(id=2, taskname="Task")
+        project.add_task(task1)
+        project.add_task(task2)
+        self.assertIs(project.get_task("Task", KanbanBoardColumns.BACKLOG.value), task1)
+        project.remove_task(task1)
+        self.assertIs(project.get_task("Task", KanbanBoardColumns.BACKLOG.value), task2)
+
+    def test_filter_tasks_by_tags(self):
+        project = Project("Testproject")
+        backlog, done = KanbanBoardColumns.BACKLOG.value, KanbanBoardColumns.DONE.value
+        home = Task(id=1, taskname="Home", tag="Haushalt")
+        both = Task(id=2, taskname="Both", tag="Haushalt, dringend")
+        urgent = Task(id=3, taskname="Urgent", tag=" dringend ", assigned_kanban_swimlane=done)
+        untagged = Task(id=4, taskname="Untagged")
+        for task in (home, both, urgent, untagged):
+            project.add_task(task)
+        self.assertEqual(project.filter_tasks(["Haushalt", "dringend"]), {backlog: [home, both], KanbanBoardColumns.IN_PROGRESS.value: [], done: [urgent]})
+        self.assertEqual(project.filter_tasks(["dringend", "Haushalt"], match_all=True)[backlog], [both])
+        self.assertEqual(project.filter_tasks(["unbekannt"])[backlog], [])
+        # the index follows tag changes, moves and removals
+        project.set_task_tag(home, "dringend")
+        project.move_task(both, done, 0)
+        self.assertEqual(project.filter_tasks(["dringend"]), {backlog: [home], KanbanBoardColumns.IN_PROGRESS.value: [], done: [both, urgent]})
+        project.remove_task(urgent)
+        self.assertEqual(project.filter_tasks(["dringend"])[done], [both])
+        focusme_data = FocusMeData()
+        focusme_data.add_project(project)
+        self.assertEqual(focusme_data.filter_tasks(["Haushalt", "dringend"], match_all=True), [both])
+        self.assertEqual(focusme_data.filter_tasks(["dringend"]), [home, both])
+        project.unload_tasks()
+        self.assertEqual(project.tasks_by_tag, {})
+
+    def test_move_task_in_filtered_swimlane(self):
+        project = Project("Testproject")
+        backlog = KanbanBoardColumns.BACKLOG.value
+        a, b, c, d = [Task(id=i, taskname=name, tag=tag) for i, (name, tag) in
+                      enumerate([("A", ""), ("B", ""), ("C", "x"), ("D", "x")], start=1)]
+        e = Task(id=5, taskname="E", tag="x", assigned_kanban_swimlane=KanbanBoardColumns.DONE.value)
+        for task in (a, b, c, d, e):
+            project.add_task(task)
+        filtered = project.filter_tasks(["x"])[backlog]
+        self.assertEqual(filtered, [c, d])
+        # dropped between C and D (row 1 of the filtered column)
+        position = filtered_row_position(project.tasks[backlog], filtered, 1)
+        self.assertEqual(position, 3)
+        project.move_task(e, backlog, position)
+        self.assertEqual(project.tasks[backlog], [a, b, c, e, d])
+        # dropped after the last shown task and on an empty filtered column
+        self.assertEqual(filtered_row_position(project.tasks[backlog], [c, e], None), 4)
+        self.assertEqual(filtered_row_position(project.tasks[backlog], [c, e], 2), 4)
+        self.assertIsNone(filtered_row_position(project.tasks[backlog], [], 0))
+
+    def test_split_tags(self):
+        self.assertEqual(split_tags(" Haushalt,dringend , ,Haushalt"), ("Haushalt", "dringend"))
+        self.assertEqual(split_tags(None), ())
+
+    def test_unload_tasks(self):
+        project = Project("Testproject")
+        project.add_task(Task())
+        project.add_task(Task(assigned_kanban_swimlane=KanbanBoardColumns.DONE.value))
+        project.unload_tasks()
+        self.assertFalse(project.tasks_loaded)
+        self.assertEqual(project.tasks[KanbanBoardColumns.BACKLOG.value], [])
+        self.assertEqual(project.get_task_count(), 2)
+        self.assertEqual(project.get_task_count(KanbanBoardColumns.DONE.value), 1)
         
         
 class TestTask(unittest.TestCase):
+    def test_to_iso_date(self):
+        self.assertEqual(to_iso_date(date(2024, 2, 29)), "2024-02-29")
+        self.assertEqual(to_iso_date("2024-02-29"), "2024-02-29")
+        self.assertEqual(to_iso_date("29.02.2024"), "2024-02-29")
+        self.assertIsNone(to_iso_date(""))
+        self.assertIsNone(to_iso_date(None))
+        for value in ("dd.MM.yyyy", "2023-02-29", "2024-13-01"):
+            with self.assertRaises(ValueError):
+                to_iso_date(value)
+
     def test_create_task(self):
         task = Task()
         self.assertEqual(task.assigned_kanban_swimlane,KanbanBoardColumns.BACKLOG.value)
 
+    def test_task_slots(self):
+        task = Task()
+        self.assertFalse(hasattr(task, "__dict__"))
+        self.assertFalse(hasattr(Subtask(), "__dict__"))
+        self.assertEqual(task.subtasks, [])
+        task.subtasks.append(Subtask(id=1))
+        self.assertEqual(task.get_subtask(1).id, 1)
+
+    def test_update_subtask(self):
+        task = Task()
+        task.add_subtask(Subtask(id=1, description="Subtask 1"))
+        new_subtask = Subtask() # id is set after the insert into the database
+        task.add_subtask(new_subtask)
+        self.assertEqual(task.get_subtask(1).description, "Subtask 1")
+        new_subtask.id = 2
+        task.update_subtask(Subtask(id=2, description="Updated"))
+        self.assertEqual(task.subtasks[1].description, "Updated")
+        self.assertEqual(task.get_subtask(3), None)
+        # a miss does not rebuild the index
+        positions = task.subtask_positions
+        task.add_subtask(Subtask(id=3))
+        self.assertEqual(task.get_subtask(4), None)
+        self.assertIs(task.subtask_positions, positions)
+        self.assertEqual(task.get_subtask_position(3), 2)
+        # the list was changed directly
+        task.subtasks.append(Subtask(id=4))
+        self.assertEqual(task.get_subtask_position(4), 3)
+
     def test_update_task_in_db(self):
         conn = initialize_database()
         task = Task(
@@ -0,0 +1,92 @@
+import unittest
+import time
+from datetime import date
+from model.focusme_model import Project, Task
+from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db
+from model.focusme_pomodoro import PomodoroEngine, select_pomodoro_sessions
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+class TestPomodoro(unittest.TestCase):
+    def setUp(self):
+        self.conn=initialize_database() #in memory data base
+        add_project_to_db(self.conn, Project("P1"))
+        self.task = Task(taskname="Task", assigned_project="P1")
+        add_task_to_db(self.conn, self.task)
+        self.finished = []
+        self.ticks = []
+        self.engine = PomodoroEngine(on_tick=self.ticks.append, on_finished=self.finished.append, tick_seconds=0.01)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_completed_and_aborted_sessions(self):
+        completed = self.engine.start(self.task, duration=0.05)
+        aborted = self.engine.start(self.task, duration=60)
+        self.assertTrue(self.engine.abort(aborted))
+        self.assertFalse(self.engine.abort(aborted))
+        self.assertTrue(wait_for(lambda: len(self.finished) == 2))
+        self.assertEqual(self.finished, [aborted, completed])
+        self.assertTrue(completed.completed)
+        self.assertFalse(aborted.completed)
+        self.assertGreater(len(self.ticks), 0)
+        # the engine does not change the task, the owner of the model counts the session
+        self.assertEqual(self.task.performed_pomodoros, 0)
+        self.assertTrue(self.engine.has_pending_sessions())
+        self.assertEqual(self.engine.flush(self.conn), 2)
+        self.assertFalse(self.engine.has_pending_sessions())
+        sessions = select_pomodoro_sessions(self.conn, task_id=self.task.id)
+        self.assertEqual(sorted(row[4] for row in sessions), [0, 1])
+        self.assertEqual(len(select_pomodoro_sessions(self.conn, first_day=date.today(), last_day=date.today())), 2)
+        self.assertEqual(select_pomodoro_sessions(self.conn, last_day="2000-01-01"), [])
+
+    def test_many_timers(self):
+        tasks = [Task(id=n, taskname=f"Task {n}") for n in range(1, 101)]
+        for n in range(2000):
+            self.engine.start(tasks[n % 100], duration=0.05 + n % 10 * 0.01)
+        self.assertTrue(wait_for(lambda: len(self.finished) == 2000))
+        self.assertEqual(self.engine.running(), [])
+        self.assertEqual(sum(session.completed for session in self.finished), 2000)
+
+    def test_unsaved_task_stays_queued(self):
+        task = Task(taskname="Not stored", assigned_project="P1")
+        self.engine.start(task, duration=0.01)
+        self.assertTrue(wait_for(lambda: len(self.finished) == 1))
+        self.assertEqual(self.engine.flush(self.conn), 0)
+        add_task_to_db(self.conn, task)
+        self.assertEqual(self.engine.flush(self.conn), 1)
+        self.assertEqual(len(select_pomodoro_sessions(self.conn, task_id=task.id)), 1)
+
+    def test_flush_in_open_transaction(self):
+        session = self.engine.start(self.task, duration=60)
+        self.engine.abort(session)
+        self.conn.execute("UPDATE Tasks SET taskname = 'Outer';")
+        self.assertEqual(self.engine.flush(self.conn), 1)
+        # the outer transaction is left to the caller
+        self.assertTrue(self.conn.in_transaction)
+        self.conn.rollback()
+        self.assertEqual(self.conn.execute("SELECT taskname FROM Tasks;").fetchone()[0], "Task")
+        self.assertEqual(select_pomodoro_sessions(self.conn), [])
+
+    def test_close_aborts_running_sessions(self):
+        session = self.engine.start(self.task, duration=60)
+        self.engine.close()
+        self.assertEqual(self.finished, [session])
+        self.assertFalse(session.completed)
+        with self.assertRaises(RuntimeError):
+            self.engine.start(self.task)
+
+    def test_session_query_uses_index(self):
+        plan = " ".join(row[3] for row in self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM PomodoroSessions WHERE task_id = ? ORDER BY started_at DESC, id DESC;", (1,)))
+        self.assertIn("idx_pomodoro_sessions_task", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import random
+from datetime import date, timedelta
+from itertools import islice
+from model.focusme_model import Project, FocusMeData, Task, KanbanBoardColumns, RepeatEnum, ChangeEvent
+from model.focusme_recurrence import repeat_of, add_months, occurrences, next_occurrence, RecurrenceIndex, \
+                                     roll_over_done_tasks, roll_over_project
+
+class TestRecurrence(unittest.TestCase):
+    def test_repeat_of(self):
+        self.assertEqual(repeat_of("Week"), RepeatEnum.WEEK)
+        self.assertEqual(repeat_of("week"), RepeatEnum.WEEK)
+        self.assertEqual(repeat_of(None), RepeatEnum.NEVER)
+        self.assertEqual(repeat_of("Yearly"), RepeatEnum.NEVER)
+
+    def test_add_months(self):
+        self.assertEqual(add_months(date(2024, 1, 31), 1), date(2024, 2, 29))
+        self.assertEqual(add_months(date(2024, 1, 31), 2), date(2024, 3, 31))
+        self.assertEqual(add_months(date(2024, 11, 15), 14), date(2026, 1, 15))
+
+    def test_occurrences(self):
+        anchor = date(2024, 1, 31)
+        self.assertEqual(list(occurrences(anchor, RepeatEnum.MONTH, date(2024, 2, 1), date(2024, 4, 30))),
+                         [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)])
+        self.assertEqual(list(occurrences(anchor, RepeatEnum.WEEK, date(2024, 2, 1), date(2024, 2, 15))),
+                         [date(2024, 2, 7), date(2024, 2, 14)])
+        self.assertEqual(list(occurrences(anchor, RepeatEnum.DAY, date(2024, 1, 1), date(2024, 2, 1))),
+                         [date(2024, 1, 31), date(2024, 2, 1)])
+        self.assertEqual(list(occurrences(anchor, RepeatEnum.NEVER, date(2024, 1, 1), date(2024, 2, 1))), [anchor])
+        # an unbounded series is generated lazily
+        first, second = islice(occurrences(anchor, RepeatEnum.WEEK, date(3000, 1, 1)), 2)
+        self.assertTrue(date(3000, 1, 1) <= first < date(3000, 1, 8))
+        self.assertEqual((first.weekday(), second - first), (anchor.weekday(), timedelta(days=7)))
+        self.assertEqual(next_occurrence(anchor, RepeatEnum.WEEK, anchor), date(2024, 2, 7))
+        self.assertIsNone(next_occurrence(anchor, RepeatEnum.NEVER, anchor))
+
+    def test_due_between(self):
+        rng = random.Random(1)
+        tasks = [Task(taskname=f"T{n}", repeat=rng.choice(["Never", "Day", "Week", "Month", "month"]),
+                      date_to_perform=(date(2024, 1, 1) + timedelta(days=rng.randrange(400))).isoformat())
+                 for n in range(300)]
+        tasks.append(Task(taskname="No date", repeat="Day"))
+        index = RecurrenceIndex(tasks)
+        for first_day, last_day in ((date(2024, 3, 1), date(2024, 3, 7)), (date(2024, 2, 25), date(2024, 4, 2)),
+                                    (date(2024, 12, 31), date(2024, 12, 31))):
+            expected = []
+            for task in tasks[:-1]:
+                if repeat_of(task.repeat) != RepeatEnum.NEVER:
+                    day = next(occurrences(date.fromisoformat(task.date_to_perform), repeat_of(task.repeat),
+                                           first_day, last_day), None)
+                    if day is not None:
+                        expected.append((day, task.taskname))
+            due = [(day, task.taskname) for day, task in index.due_between(first_day, last_day)]
+            self.assertEqual(sorted(due), sorted(expected))
+            self.assertEqual([day for day, _ in due], sorted(day for day, _ in due))
+
+    def test_update_and_remove(self):
+        task = Task(taskname="Weekly", repeat="Week", date_to_perform="2024-03-04")
+        index = RecurrenceIndex([task, Task(taskname="Once", date_to_perform="2024-03-04")])
+        self.assertEqual(len(index), 1)
+        self.assertEqual(list(index.due_between(date(2024, 3, 11), date(2024, 3, 11))), [(date(2024, 3, 11), task)])
+        task.date_to_perform = "2024-03-05"
+        index.update(task)
+        self.assertEqual(list(index.due_between(date(2024, 3, 11), date(2024, 3, 11))), [])
+        index.remove(task)
+        self.assertEqual(len(index), 0)
+
+    def test_roll_over_done_tasks(self):
+        focusme_data = FocusMeData()
+        project = Project("P1", 1)
+        focusme_data.add_project(project)
+        done = KanbanBoardColumns.DONE.value
+        weekly = Task(id=1, taskname="Weekly", repeat="Week", date_to_perform="2024-03-04", assigned_kanban_swimlane=done)
+        late = Task(id=2, taskname="Late", repeat="Day", date_to_perform="2024-01-01", assigned_kanban_swimlane=done)
+        once = Task(id=3, taskname="Once", date_to_perform="2024-03-04", assigned_kanban_swimlane=done)
+        backlog = Task(id=4, taskname="Backlog", repeat="Day", date_to_perform="2024-03-01")
+        for task in (weekly, late, once, backlog):
+            project.add_task(task)
+        changed = roll_over_done_tasks(focusme_data, today=date(2024, 3, 6))
+        self.assertEqual({task.id for task in changed}, {1, 2})
+        self.assertEqual([task.taskname for task in project.tasks[KanbanBoardColumns.BACKLOG.value]],
+                         ["Backlog", "Weekly", "Late"])
+        self.assertEqual(weekly.date_to_perform, "2024-03-11")
+        # not before today
+        self.assertEqual(late.date_to_perform, "2024-03-06")
+        self.assertEqual(project.tasks[done], [once])
+
+    def test_roll_over_publishes_date_change(self):
+        focusme_data = FocusMeData()
+        project = Project("P1", 1)
+        focusme_data.add_project(project)
+        task = Task(id=1, taskname="Weekly", repeat="Week", date_to_perform="2024-03-04",
+                    assigned_kanban_swimlane=KanbanBoardColumns.DONE.value)
+        project.add_task(task)
+        index = RecurrenceIndex([task])
+        changes = []
+        focusme_data.changes.subscribe(ChangeEvent.TASK_CHANGED, lambda task, project, fields: changes.append(fields))
+        focusme_data.changes.subscribe(ChangeEvent.TASK_CHANGED, lambda task, project, fields: index.update(task))
+        # a project loaded later is rolled over on its own
+        self.assertEqual(roll_over_project(project, today=date(2024, 3, 6)), [task])
+        self.assertEqual(changes, [("date_to_perform",)])
+        # the index sees the new anchor 2024-03-11
+        self.assertEqual(list(index.due_between(date(2024, 3, 4), date(2024, 3, 10))), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import tempfile
+from model.focusme_model import Project, Task, Subtask, KanbanBoardColumns, ChangeEvent
+from model.focusme_db import initialize_database, add_project_to_db, add_task_to_db, update_task_in_db, \
+                             generate_focusme_data_obj, generate_focusme_headers_obj
+from model.focusme_snapshot import snapshot_file_name, read_change_stamp, claim_change_stamp, load_snapshot, \
+                                   save_snapshot, load_focusme_data
+
+def fill(conn):
+    add_project_to_db(conn, Project("P1"))
+    task = Task(taskname="Task1", assigned_project="P1", tag="Tag")
+    task.add_subtask(Subtask(description="Subtask1"))
+    add_task_to_db(conn, task)
+    add_task_to_db(conn, Task(taskname="Task2", assigned_project="P1",
+                              assigned_kanban_swimlane=KanbanBoardColumns.DONE.value))
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmp_dir.name, "focusme.db")
+        self.file_name = snapshot_file_name(self.db_name)
+        self.conn = initialize_database(db_name=self.db_name)
+        fill(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_snapshot_file_name(self):
+        self.assertEqual(self.file_name, self.db_name + ".snapshot")
+        self.assertIsNone(snapshot_file_name(None))
+
+    def test_round_trip(self):
+        focusme_data = generate_focusme_data_obj(self.conn)
+        # subscribers (e.g. views) are not saved
+        focusme_data.changes.subscribe(ChangeEvent.TASK_ADDED, lambda task, **details: None)
+        self.assertTrue(save_snapshot(self.conn, focusme_data, self.file_name))
+        self.assertEqual(read_change_stamp(self.conn)[1:], (1, 0))
+        loaded, from_snapshot = load_focusme_data(self.conn, self.file_name)
+        self.assertTrue(from_snapshot)
+        project = loaded.get_project("P1")
+        task = project.tasks[KanbanBoardColumns.BACKLOG.value][0]
+        self.assertEqual((task.taskname, task.tag, task.subtasks[0].description), ("Task1", "Tag", "Subtask1"))
+        # the indexes are restored with the objects
+        self.assertIs(loaded.tasks_by_id[task.id], task)
+        self.assertIs(project.focusme_data, loaded)
+        self.assertEqual(loaded.changes.subscribers, {})
+
+    def test_write_invalidates_snapshot(self):
+        focusme_data = generate_focusme_data_obj(self.conn)
+        save_snapshot(self.conn, focusme_data, self.file_name)
+        task = focusme_data.get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value][0]
+        task.taskname = "Renamed"
+        update_task_in_db(self.conn, task)
+        self.assertIsNone(load_snapshot(self.conn, self.file_name))
+        loaded, from_snapshot = load_focusme_data(self.conn, self.file_name)
+        self.assertFalse(from_snapshot)
+        self.assertEqual(loaded.get_project("P1").tasks[KanbanBoardColumns.BACKLOG.value][0].taskname, "Renamed")
+
+    def test_claim_change_stamp(self):
+        stamp = claim_change_stamp(self.conn)
+        self.assertEqual(read_change_stamp(self.conn)[1:], (1, 0))
+        self.assertEqual(claim_change_stamp(self.conn), stamp)
+        task = generate_focusme_data_obj(self.conn).get_project("P1").tasks[KanbanBoardColumns.DONE.value][0]
+        task.taskname = "Renamed"
+        update_task_in_db(self.conn, task)
+        self.assertNotEqual(claim_change_stamp(self.conn), stamp)
+
+    def test_snapshot_of_other_database(self):
+        save_snapshot(self.conn, generate_focusme_data_obj(self.conn), self.file_name)
+        other = initialize_database(db_name=os.path.join(self.tmp_dir.name, "other.db"))
+        fill(other)
+        # same counter, but another database
+        other.execute("UPDATE ChangeStamp SET counter = 1, changed = 0;")
+        other.commit()
+        self.assertIsNone(load_snapshot(other, self.file_name))
+        other.close()
+
+    def test_incomplete_model_is_not_saved(self):
+        self.assertFalse(save_snapshot(self.conn, generate_focusme_headers_obj(self.conn), self.file_name))
+        focusme_data = generate_focusme_data_obj(self.conn)
+        focusme_data.get_project("P1").add_task(Task(taskname="Not stored", assigned_project="P1"))
+        self.assertFalse(save_snapshot(self.conn, focusme_data, self.file_name))
+        self.assertFalse(os.path.exists(self.file_name))
+
+    def test_broken_snapshot(self):
+        save_snapshot(self.conn, generate_focusme_data_obj(self.conn), self.file_name)
+        with open(self.file_name, "r+b") as file:
+            file.truncate(os.path.getsize(self.file_name) // 2)
+        self.assertIsNone(load_snapshot(self.conn, self.file_name))
+
+if __name__ == '__main__':
+    unittest.main()
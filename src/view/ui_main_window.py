@@ -1,25 +1,89 @@
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton, QListWidgetItem, 
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QListView, QPushButton, 
     QInputDialog, QLabel,
-    QLineEdit, QComboBox, QDateEdit, QFormLayout, QMenuBar, QMenu, QTextEdit, QCheckBox
+    QLineEdit, QComboBox, QDateEdit, QFormLayout, QMenuBar, QMenu, QTextEdit, QStyledItemDelegate, QMessageBox
 )
-from PySide6.QtCore import Qt, QMimeData, Signal, QDate
+from PySide6.QtCore import Qt, QMimeData, Signal, QDate, QTimer, QAbstractListModel, QModelIndex
 from PySide6.QtGui import QDrag
-from model.focusme_model import Project, Task, Subtask, KanbanBoardColumns, RepeatEnum
-from model.focusme_db import add_project_to_db, add_task_to_db, update_task_in_db, add_subtask_to_db, update_subtask_in_db
+from model.focusme_model import Project, Task, Subtask, KanbanBoardColumns, RepeatEnum, ChangeEvent, \
+                                find_task_position, filtered_row_position, split_tags
+from model.focusme_db import add_project_to_db, add_task_to_db, add_subtask_to_db, search_tasks, WriteBehindQueue, \
+                             select_project_statistics, select_project_rows, delete_project_from_db
+from model.focusme_pomodoro import PomodoroEngine
+from model.focusme_recurrence import roll_over_project
+from model.focusme_instrumentation import instrumented
+
+# idle time after the last edit before pending changes are written to the database
+WRITE_BEHIND_DELAY_MS = 500
+# idle time after the last key stroke in the search box before the search runs
+SEARCH_DELAY_MS = 250
+# item data role of the project list holding the totals of select_project_statistics
+PROJECT_STATISTICS_ROLE = Qt.UserRole + 1
+# minimum date of the date field, shown as NO_DATE_TEXT for a task without date
+NO_DATE = QDate(1752, 9, 14)
+NO_DATE_TEXT = "Kein Datum"
+
+
+def show_repeat(widget, repeat):
+    """
+    Selects the repeat entry of the combo box, the first entry for unknown values
+    """
+    index = widget.findText(repeat)
+    widget.setCurrentIndex(index if index >= 0 else 0)
+
+
+def date_value(widget):
+    """
+    Returns the date of the date field as ISO 8601 date, None for the minimum date ("no date")
+    """
+    date = widget.date()
+    return None if date == widget.minimumDate() else date.toString(Qt.DateFormat.ISODate)
+
+
+def show_date(widget, value):
+    """
+    Shows an ISO 8601 date in the date field, the minimum date ("no date") for None or an invalid date
+    """
+    date = QDate.fromString(value or "", Qt.DateFormat.ISODate)
+    widget.setDate(date if date.isValid() else widget.minimumDate())
+
+
+# dispatch table of the detail panel: detail field -> (task attribute,
+# value of the widget, shows a value in the widget)
+TASK_DETAIL_FIELDS = {
+    "Taskname": ("taskname", lambda widget: widget.text(), lambda widget, value: widget.setText(value)),
+    "Description": ("description", lambda widget: widget.toPlainText(),
+                    lambda widget, value: widget.setPlainText(value or "")),
+    "Estimated_Pomos": ("estimated_pomodoros", lambda widget: int(widget.text()),
+                        lambda widget, value: widget.setText(str(value))),
+    # stored as ISO 8601 date (YYYY-MM-DD), see focusme_model.DATE_FORMAT, None without date
+    "Date_to_Perform": ("date_to_perform", date_value, show_date),
+    "Repeat": ("repeat", lambda widget: widget.currentText(), show_repeat),
+    "Assigned_to_project": ("assigned_project", lambda widget: widget.text(),
+                            lambda widget, value: widget.setText(value or "")),
+    "Tag": ("tag", lambda widget: widget.text(), lambda widget, value: widget.setText(value or "")),
+}
 
 class KanbanBoard(QWidget):
     """
     Class dealing with kanbanboard features like adding task to
     different columns and drag and drop btw.
     the columns
+    Each column is a CustomListView backed by a TaskListModel that reads
+    directly from the task list of the shown project. With a tag filter the
+    columns show the filtered task lists of Project.filter_tasks instead.
+    The board subscribes to the task changes of the data model and updates
+    only the rows of the changed tasks.
     """    
-    def __init__(self, add_task_callback):
+    def __init__(self, add_task_callback, move_task_callback, changes):
         """
         Constructor of KanbanBoard
         
         Args:
             add_task_callback (function reference): a callback function in MainWindow to update data
+            move_task_callback (function reference): a callback function in MainWindow that
+                                                     persists the tasks changed by a move
+            changes (ChangeBus): change notifications of the data model
 
         Returns:
             nothing
@@ -28,11 +92,23 @@ class KanbanBoard(QWidget):
         self.layout = QHBoxLayout()
         self.setLayout(self.layout)
         self.add_task_callback = add_task_callback
+        self.move_task_callback = move_task_callback
+        self.project = None
+        # (tag names, match_all) of the shown tasks, no tag names for all tasks
+        self.tag_filter = ((), False)
         # Spalten für das Board
         self.columns = {}
         for col in KanbanBoardColumns:
             self.columns[col.value] = self.create_column(col.value)
             self.layout.addWidget(self.columns[col.value])
+        changes.subscribe(ChangeEvent.TASK_ROW_ABOUT_TO_BE_INSERTED, self.task_row_about_to_be_inserted)
+        changes.subscribe(ChangeEvent.TASK_ROW_INSERTED, self.task_row_inserted)
+        changes.subscribe(ChangeEvent.TASK_ROW_ABOUT_TO_BE_REMOVED, self.task_row_about_to_be_removed)
+        changes.subscribe(ChangeEvent.TASK_ROW_REMOVED, self.task_row_removed)
+        changes.subscribe(ChangeEvent.TASK_ADDED, self.task_added)
+        changes.subscribe(ChangeEvent.TASK_REMOVED, self.task_removed)
+        changes.subscribe(ChangeEvent.TASK_MOVED, self.task_moved)
+        changes.subscribe(ChangeEvent.TASK_CHANGED, self.task_changed)
 
     def create_column(self, title):
         """
@@ -42,7 +118,7 @@ class KanbanBoard(QWidget):
             title (string): title of kanbanboard column
 
         Returns:
-            Complete kanbanboard column with ListWidget and pushbuttons
+            Complete kanbanboard column with list view and pushbuttons
         """
         column_widget = QWidget()
         column_layout = QVBoxLayout()
@@ -52,29 +128,29 @@ class KanbanBoard(QWidget):
         label.setAlignment(Qt.AlignCenter)
         column_layout.addWidget(label)
 
-        list_widget = CustomListWidget(title, self)
-        list_widget.setAcceptDrops(True)
-        list_widget.setDragEnabled(True)
-        column_layout.addWidget(list_widget)
+        list_view = CustomListView(title, self)
+        list_view.setAcceptDrops(True)
+        list_view.setDragEnabled(True)
+        column_layout.addWidget(list_view)
 
         add_btn = QPushButton(f"{title} hinzufügen")
-        add_btn.clicked.connect(lambda: self.add_task(list_widget, title))
+        add_btn.clicked.connect(lambda: self.add_task(title))
         column_layout.addWidget(add_btn)
-        #save list widget for later access (e.g. delete entries)
-        column_widget.list_widget = list_widget 
+        #save list view for later access (e.g. delete entries)
+        column_widget.list_view = list_view 
         return column_widget
 
-    def add_task(self, list_widget, column_name):
+    def add_task(self, column_name):
         """
-        Adds a new task to the specified list widget and assigns it to the given kanban swimlane.
+        Adds a new task to the specified kanban swimlane.
         Args:
-            list_widget (QListWidget): The list widget to which the new task will be added.
             column_name (str): The name of the kanban swimlane to which the task will be assigned.
         Creates:
             Task: A new task with default values and assigns it to the specified kanban swimlane.
         Side Effects:
-            Adds the new task to the provided list widget and calls the add_task_callback function
-            to handle additional logic for adding the task to the correct project and kanban lane.
+            Calls the add_task_callback function to handle additional logic for adding the 
+            task to the correct project and kanban lane. The new task is shown in the column
+            when the project publishes TASK_ADDED.
         """
         
 
@@ -83,16 +159,13 @@ class KanbanBoard(QWidget):
                 taskname="Enter Taskname",
                 description="Enter Description",
                 estimated_pomodoros=0,
-                date_to_perform="dd.MM.yyyy",
+                date_to_perform=None,
                 repeat=RepeatEnum.NEVER.value,
                 assigned_project="NA",
                 assigned_kanban_swimlane=column_name,
                 tag="",
                 subtasks=[]
                 )
-        item = QListWidgetItem(task.taskname)
-        item.setData(Qt.UserRole, task)
-        list_widget.addItem(item)
         #this is a callback function call that adds the new task
         #the the correct project and kanban_lane.
         self.add_task_callback(task)
@@ -100,49 +173,292 @@ class KanbanBoard(QWidget):
 
     def updated_boards(self, project):
         """
-        Method is called during a drag and drop action.
-        Clears all kanbanboard list widgets
-        and populates with new (post drag and drop)
-        setting
+        Method is called when another project is shown.
+        The column models are reset to the task lists of the project,
+        only the visible rows are fetched.
+        Changes of single tasks are applied by the handlers of the
+        change notifications (task_added, task_moved, ...) instead.
         
         Args:
-            project (string): project name
+            project (Project): project to show
         """
-        
-         # Step 1: delete old entries and add new entries 
+        self.project = project
+        tags, match_all = self.tag_filter
+        tasks = project.filter_tasks(tags, match_all) if tags else project.tasks
+        for column_widget in self.columns.values():
+            column_widget.list_view.task_model.set_tasks(tasks[column_widget.list_view.column_name])
+
+    def clear_board(self):
+        """
+        Shows no project, e.g. after the shown project has been removed
+        """
+        self.project = None
         for column_widget in self.columns.values():
-            column_widget.list_widget.clear()  # clear elements in the list widgets
-            for task in project.tasks[column_widget.list_widget.column_name]:
-                item = QListWidgetItem(task.taskname)
-                item.setData(Qt.UserRole, task)
-                column_widget.list_widget.addItem(item)
+            column_widget.list_view.task_model.set_tasks([])
+
+    def set_tag_filter(self, tags, match_all=False):
+        """
+        Shows only the tasks with one (match_all=False) or all (match_all=True)
+        of the tags. The filter is answered from the tag index of the project.
+
+        Args:
+            tags (iterable of str): tag names, empty to show all tasks
+            match_all (bool, optional): True for tasks with all tags. Defaults to False.
+        """
+        self.tag_filter = (tuple(tags), match_all)
+        if self.project is not None:
+            self.updated_boards(self.project)
+
+    def move_task(self, task, assigned_kanban_swimlane, position=None):
+        """
+        Moves a task of the shown project to another kanban swimlane or to another
+        position in its swimlane. The board is updated when the project publishes
+        TASK_MOVED. The changed tasks are handed to move_task_callback to persist the
+        swimlane and kanban rank.
+
+        Args:
+            task (Task): task of the shown project
+            assigned_kanban_swimlane (string): target kanban swimlane
+            position (int, optional): row in the target column the task is dropped on.
+                                      Defaults to None (end of the column).
+        """
+        if self.tag_filter[0]:
+            # the rows of a filtered column are not the positions in the swimlane
+            shown_tasks = self.columns[assigned_kanban_swimlane].list_view.task_model.tasks
+            position = filtered_row_position(self.project.tasks[assigned_kanban_swimlane], shown_tasks, position)
+        changed_tasks = self.project.move_task(task, assigned_kanban_swimlane, position)
+        self.move_task_callback(changed_tasks)
+
+    def column_model(self, project, swimlane):
+        """
+        Provides the list model of a column if it shows the swimlane list of the
+        project, None for another project or filtered lists
+
+        Args:
+            project (Project): project of the changed task
+            swimlane (string): kanban swimlane of the changed list
+        """
+        if project is not self.project or self.tag_filter[0]:
+            return None
+        return self.columns[swimlane].list_view.task_model
+
+    def task_row_about_to_be_inserted(self, task, project, swimlane, position):
+        """
+        Handler of TASK_ROW_ABOUT_TO_BE_INSERTED
+        """
+        task_model = self.column_model(project, swimlane)
+        if task_model is not None:
+            task_model.begin_insert_row(position)
+
+    def task_row_inserted(self, task, project, swimlane, position):
+        """
+        Handler of TASK_ROW_INSERTED
+        """
+        task_model = self.column_model(project, swimlane)
+        if task_model is not None:
+            task_model.end_insert_row(position)
+
+    def task_row_about_to_be_removed(self, task, project, swimlane, position):
+        """
+        Handler of TASK_ROW_ABOUT_TO_BE_REMOVED
+        """
+        task_model = self.column_model(project, swimlane)
+        if task_model is not None:
+            task_model.begin_remove_row(position)
+
+    def task_row_removed(self, task, project, swimlane, position):
+        """
+        Handler of TASK_ROW_REMOVED
+        """
+        task_model = self.column_model(project, swimlane)
+        if task_model is not None:
+            task_model.end_remove_row(position)
+
+    def task_added(self, task, project):
+        """
+        Handler of TASK_ADDED. The row is inserted by the row events, the
+        filtered lists are copies, they are filtered again.
+        """
+        if project is self.project and self.tag_filter[0]:
+            self.updated_boards(self.project)
+
+    def task_removed(self, task, project, position):
+        """
+        Handler of TASK_REMOVED, see task_added
+        """
+        if project is self.project and self.tag_filter[0]:
+            self.updated_boards(self.project)
+
+    def task_moved(self, task, project, source, changed_tasks):
+        """
+        Handler of TASK_MOVED. The rows are moved by the row events of the
+        removal and the insert, the filtered lists are filtered again. The order
+        of the other tasks does not change, also if their kanban ranks were renumbered.
+        """
+        if project is self.project and self.tag_filter[0]:
+            self.updated_boards(self.project)
+
+    def task_changed(self, task, project, fields):
+        """
+        Handler of TASK_CHANGED, updates the row of a renamed task. A changed
+        tag is filtered again when the board has a tag filter.
+        """
+        if project is not self.project:
+            return
+        if "tag" in fields and self.tag_filter[0]:
+            self.updated_boards(self.project)
+        elif "taskname" in fields:
+            self.sync_task(task)
+
+    def sync_task(self, task):
+        """
+        Updates the row of a single task after its name has changed.
+        The cost does not depend on the number of tasks of the column.
+
+        Args:
+            task (Task): changed task
+        """
+        self.columns[task.assigned_kanban_swimlane].list_view.task_model.task_changed(task)
+
+
+class TaskListModel(QAbstractListModel):
+    """
+    List model of a kanbanboard column. It reads directly from the task
+    list of a project swimlane (Project.tasks[column]) and fetches the rows
+    in batches, so only the rows that are scrolled into view are materialized.
+    """
+    FETCH_BATCH_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = []
+        self.fetched_rows = 0
+
+    def set_tasks(self, tasks):
+        """
+        Shows another task list
 
+        Args:
+            tasks (list): task list of a project swimlane
+        """
+        self.beginResetModel()
+        self.tasks = tasks
+        self.fetched_rows = min(len(tasks), self.FETCH_BATCH_SIZE)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched_rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.fetched_rows:
+            return None
+        task = self.tasks[index.row()]
+        if role == Qt.DisplayRole:
+            return task.taskname
+        if role == Qt.UserRole:
+            return task
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetched_rows < len(self.tasks)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH_SIZE, len(self.tasks) - self.fetched_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched_rows, self.fetched_rows + count - 1)
+        self.fetched_rows += count
+        self.endInsertRows()
+
+    def row_of(self, task):
+        """
+        Provides the row of a task. The task list is sorted by kanban_rank,
+        so the row is found by bisection.
+
+        Args:
+            task (Task): task of the list
+
+        Returns:
+            int: row of the task or None
+        """
+        return find_task_position(self.tasks, task)
+
+    def begin_insert_row(self, row):
+        """
+        Must be called before a task is inserted into the task list at row.
+        The row is shown at once if all rows before it are fetched.
+        """
+        if row <= self.fetched_rows:
+            self.beginInsertRows(QModelIndex(), row, row)
 
-class CustomListWidget(QListWidget):
+    def end_insert_row(self, row):
+        """
+        Must be called after a task has been inserted into the task list at row.
+        """
+        if row <= self.fetched_rows:
+            self.fetched_rows += 1
+            self.endInsertRows()
+
+    def begin_remove_row(self, row):
+        """
+        Must be called before the task in row is removed from the task list.
+        """
+        if row < self.fetched_rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+
+    def end_remove_row(self, row):
+        """
+        Must be called after the task in row has been removed from the task list.
+        """
+        if row < self.fetched_rows:
+            self.fetched_rows -= 1
+            self.endRemoveRows()
+
+    def task_changed(self, task):
+        """
+        Updates the row of a changed task
+
+        Args:
+            task (Task): task of the list
+        """
+        row = self.row_of(task)
+        if row is not None and row < self.fetched_rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+
+class CustomListView(QListView):
     """
     Class for a kanbanboard task list with drag and dropfeature
     """
-    #definition of a signal which provides string for clicked item
-    #the string is a name of a task
-    itemClickedSignal = Signal(str, str)
+    #definition of a signal which provides the Task object of the clicked item
+    itemClickedSignal = Signal(object)
     def __init__(self, column_name, board):
         super().__init__()
         self.column_name = column_name
         self.board = board
-        self.itemClicked.connect(self.handle_item_clicked)
+        self.task_model = TaskListModel(self)
+        self.setModel(self.task_model)
+        # all rows have the same height, the view does not have to measure each row
+        self.setUniformItemSizes(True)
+        self.clicked.connect(self.handle_item_clicked)
 
-    def handle_item_clicked(self, item):
+    def handle_item_clicked(self, index):
         """
-        Method is connected to itemClicked signal from list widget
-        and emits item clicked signal with task name and kanbanboard
-        column information.
+        Method is connected to clicked signal from list view
+        and emits item clicked signal with the Task object of the row,
+        so tasks with the same name are told apart.
         This specific signal is used in MainWindow to update detailed
         task information, when task selection has changed.
 
         Args:
-            item (QListItem): Clicked item in list
-        """        
-        self.itemClickedSignal.emit(item.text(),self.column_name)
+            index (QModelIndex): Clicked row in list
+        """
+        task = index.data(Qt.UserRole)
+        if task is not None:
+            self.itemClickedSignal.emit(task)
 
     def startDrag(self, supportedActions):
         """
@@ -151,12 +467,14 @@ class CustomListWidget(QListWidget):
         Args:
             supportedActions (_type_): _description_
         """
-        item = self.currentItem()
-        if item:
+        index = self.currentIndex()
+        task = index.data(Qt.UserRole) if index.isValid() else None
+        # a new task can only be moved after it has got its database id
+        if task is not None and task.id is not None:
             mime_data = QMimeData()
-            mime_data.setText(item.text())
+            mime_data.setText(task.taskname)
             mime_data.setData("application/x-kanban-task",
-                              self.column_name.encode())
+                              str(task.id).encode())
 
             drag = QDrag(self)
             drag.setMimeData(mime_data)
@@ -172,24 +490,158 @@ class CustomListWidget(QListWidget):
 
     def dropEvent(self, event):
         if event.mimeData().hasFormat("application/x-kanban-task"):
-            task_name = event.mimeData().text()
-            source_column = event.mimeData().data(
-                "application/x-kanban-task").data().decode()
-            self.move_task_to_column(task_name, source_column)
+            task_id = int(event.mimeData().data(
+                "application/x-kanban-task").data().decode())
+            index = self.indexAt(event.position().toPoint())
+            self.move_task_to_column(task_id, index.row() if index.isValid() else None)
             event.acceptProposedAction()
 
-    def move_task_to_column(self, task_name, source_column):
-        # Add the task to the destination column
-        item = QListWidgetItem(task_name)
-        self.addItem(item) #self is end point (target List Widget) of the drag&drop action
-        # Remove the task from the source column's internal data
-        parent_lane__list_widget = self.board.columns[source_column].list_widget
-        for index in range(parent_lane__list_widget.count()):
-            item = parent_lane__list_widget.item(index)
-            if item.text() == task_name:
-                parent_lane__list_widget.takeItem(index)
-                del item
-                break
+    def move_task_to_column(self, task_id, position=None):
+        """
+        Moves a task to this column (end point of the drag&drop action)
+
+        Args:
+            task_id (int): id of the dragged task
+            position (int, optional): row the task is dropped on, None for the end of the column
+        """
+        task = self.board.project.get_task_by_id(task_id)
+        if task is None:
+            return
+        if task.assigned_kanban_swimlane == self.column_name:
+            row = self.task_model.row_of(task)
+            if position is None and row == len(self.task_model.tasks) - 1 or position in (row, row + 1):
+                # dropped on its own place
+                return
+        self.board.move_task(task, self.column_name, position)
+
+
+class SubtaskListModel(QAbstractListModel):
+    """
+    List model of the subtasks of the current task. The status is shown as
+    check box and the description is edited with SubtaskItemDelegate, so no
+    widgets are created per subtask. Edits are made with Project.update_subtask,
+    the row is updated by subtask_changed when the change is published.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.task = None
+        self.project = None
+
+    def set_task(self, task, project):
+        """
+        Shows the subtasks of another task
+
+        Args:
+            task (Task): task whose subtasks are shown
+            project (Project): project of the task
+        """
+        self.beginResetModel()
+        self.task = task
+        self.project = project
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.task is None:
+            return 0
+        return len(self.task.subtasks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        subtask = self.task.subtasks[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return subtask.description
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if subtask.status else Qt.Unchecked
+        if role == Qt.UserRole:
+            return subtask
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        subtask = self.task.subtasks[index.row()]
+        if role == Qt.EditRole:
+            changed = self.project.update_subtask(self.task, subtask, description=value)
+        elif role == Qt.CheckStateRole:
+            changed = self.project.update_subtask(self.task, subtask, status=Qt.CheckState(value) == Qt.Checked)
+        else:
+            return False
+        return bool(changed)
+
+    def row_of(self, subtask):
+        """
+        Provides the row of a subtask of the shown task
+
+        Args:
+            subtask (Subtask): subtask of the task
+
+        Returns:
+            int: row of the subtask or None
+        """
+        row = self.task.get_subtask_position(subtask.id) if subtask.id is not None else None
+        if row is None or self.task.subtasks[row] is not subtask:
+            # new subtasks get their id later
+            row = next((row for row, st in enumerate(self.task.subtasks) if st is subtask), None)
+        return row
+
+    def subtask_changed(self, subtask):
+        """
+        Must be called after a subtask of the shown task has been changed
+        """
+        row = self.row_of(subtask)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, Qt.CheckStateRole])
+
+    def begin_append_row(self):
+        """
+        Must be called before a subtask is appended to the shown task
+        """
+        row = len(self.task.subtasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+
+    def end_append_row(self):
+        """
+        Must be called after a subtask has been appended to the shown task
+        """
+        self.endInsertRows()
+
+
+class SubtaskItemDelegate(QStyledItemDelegate):
+    """
+    Delegate that creates a line edit only for the subtask that is edited.
+    The description is written to the model once when editing is finished.
+    """
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setFrame(False)
+        editor.setPlaceholderText("Enter subtask name...")
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.EditRole)
+
+
+class ProjectItemDelegate(QStyledItemDelegate):
+    """
+    Delegate that shows the totals of a project below its name. The totals are
+    stored with PROJECT_STATISTICS_ROLE, the item text stays the project name.
+    """
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        statistics = index.data(PROJECT_STATISTICS_ROLE)
+        if statistics:
+            tasks, estimated, performed, subtasks, subtasks_done = statistics
+            option.text = (f"{option.text}\n{tasks} Tasks, {performed}/{estimated} Pomodoros, "
+                           f"{subtasks_done}/{subtasks} Subtasks")
+
 
 class MainWindow(QMainWindow):
     """_summary_
@@ -197,18 +649,47 @@ class MainWindow(QMainWindow):
     Args:
         QMainWindow (_type_): _description_
     """
-    def __init__(self, focusme_data_model, focusme_control, db_conn):
+    #emitted by the database worker thread, delivers (callback, error callback, future) to the GUI thread
+    db_result_ready = Signal(object, object, object)
+    #emitted by the pomodoro engine thread with the running sessions / a finished session
+    pomodoro_tick = Signal(object)
+    pomodoro_finished = Signal(object)
+
+    def __init__(self, focusme_data_model, focusme_control, db_worker, project_loader=None):
         """_summary_
 
         Args:
             focusme_data_model (_type_): _description_
+            db_worker (DatabaseWorker): executes all database commands on a background thread
+            project_loader (LoadedProjectsLRU, optional): loads the tasks of a project
+                when it is opened (lazy mode). Defaults to None (all tasks are loaded).
         """
         super().__init__()
         self.setWindowTitle("FocusMe")
         self.setGeometry(100, 100, 1200, 800)
         self.focusme_data_model = focusme_data_model
         self.focusme_control = focusme_control
-        self.db_conn = db_conn      
+        self.db_worker = db_worker
+        self.db_result_ready.connect(self.handle_db_result)
+        self.project_loader = project_loader
+        # edits are collected and written on idle, selection change and close
+        self.pending_writes = WriteBehindQueue()
+        self.write_behind_timer = QTimer(self)
+        self.write_behind_timer.setSingleShot(True)
+        self.write_behind_timer.setInterval(WRITE_BEHIND_DELAY_MS)
+        self.write_behind_timer.timeout.connect(self.flush_pending_writes)
+        # search as you type, debounced
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        # task of a clicked search result, shown when its project is loaded
+        self.search_task_id = None
+        # the timers tick on the engine thread, the sessions are written with the pending writes
+        self.pomodoro_engine = PomodoroEngine(on_tick=self.pomodoro_tick.emit, on_finished=self.pomodoro_finished.emit)
+        self.pomodoro_session = None
+        self.pomodoro_tick.connect(self.show_pomodoro_time)
+        self.pomodoro_finished.connect(self.pomodoro_session_finished)
         self.init_ui()
 
     def init_ui(self):
@@ -235,8 +716,29 @@ class MainWindow(QMainWindow):
 
         project_layout = QVBoxLayout()
 
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Tasks suchen...")
+        self.search_box.textChanged.connect(self.search_timer.start)
+        project_layout.addWidget(self.search_box)
+
+        self.search_results = QListWidget()
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.search_results.hide()
+        project_layout.addWidget(self.search_results)
+
+        # tag filter of the board: "a, b" shows the tasks with one or all of the tags
+        self.tag_filter_box = QLineEdit()
+        self.tag_filter_box.setPlaceholderText("Tags filtern (a, b)...")
+        self.tag_filter_box.textChanged.connect(self.apply_tag_filter)
+        project_layout.addWidget(self.tag_filter_box)
+        self.tag_filter_mode = QComboBox()
+        self.tag_filter_mode.addItems(["eines der Tags", "alle Tags"])
+        self.tag_filter_mode.currentIndexChanged.connect(self.apply_tag_filter)
+        project_layout.addWidget(self.tag_filter_mode)
+
         self.project_list_q_widget = QListWidget()
         self.project_list_q_widget.itemClicked.connect(self.switch_project)
+        self.project_list_q_widget.setItemDelegate(ProjectItemDelegate(self.project_list_q_widget))
         project_layout.addWidget(self.project_list_q_widget)
 
         add_project_btn = QPushButton("Projekt hinzufügen")
@@ -250,10 +752,10 @@ class MainWindow(QMainWindow):
         main_area.addLayout(project_layout, 1)
 
         # Kanban-Board
-        self.kanban_board = KanbanBoard(self.update_data_model)
+        self.kanban_board = KanbanBoard(self.update_data_model, self.tasks_moved, self.focusme_data_model.changes)
         main_area.addWidget(self.kanban_board, 4)
         for col in KanbanBoardColumns:
-            self.kanban_board.columns[col.value].list_widget.itemClickedSignal.connect(self.show_task_details)
+            self.kanban_board.columns[col.value].list_view.itemClickedSignal.connect(self.show_task)
         
         # right side if GUI with task details
         self.details_panel = QWidget()
@@ -268,13 +770,23 @@ class MainWindow(QMainWindow):
             "Repeat": QComboBox(),
             "Assigned_to_project": QLineEdit(),
             "Tag": QLineEdit(),
-            "Subtasks":QListWidget()
+            "Subtasks":QListView()
 
             #"Subtasks": QLineEdit(),
         }
 
+        self.subtask_model = SubtaskListModel(self)
+        self.detail_fields["Subtasks"].setModel(self.subtask_model)
+        self.detail_fields["Subtasks"].setItemDelegate(SubtaskItemDelegate(self.detail_fields["Subtasks"]))
+        self.detail_fields["Subtasks"].setUniformItemSizes(True)
+
         self.detail_fields["Repeat"].addItems(
             ["never", "day", "week", "month"])
+        # only the display format, the date is stored as ISO 8601 date
+        self.detail_fields["Date_to_Perform"].setDisplayFormat("dd.MM.yyyy")
+        # a task without date shows the minimum date as NO_DATE_TEXT, see show_date
+        self.detail_fields["Date_to_Perform"].setMinimumDate(NO_DATE)
+        self.detail_fields["Date_to_Perform"].setSpecialValueText(NO_DATE_TEXT)
 
         for key, widget in self.detail_fields.items():
             details_layout.addRow(QLabel(key), widget)
@@ -287,7 +799,17 @@ class MainWindow(QMainWindow):
         # Füge die Subtasks-Liste und den Button in das Layout ein
         details_layout.addRow(QLabel("Subtasks"), self.detail_fields["Subtasks"])
         details_layout.addRow("", add_subtask_btn)  # Leerzeichen als Label
-        
+
+        # Pomodoro
+        self.pomodoro_btn = QPushButton("Pomodoro starten")
+        self.pomodoro_btn.clicked.connect(self.toggle_pomodoro)
+        self.pomodoro_label = QLabel("")
+        details_layout.addRow(self.pomodoro_label, self.pomodoro_btn)
+
+        # widget -> (task attribute, value of the widget, show a value), see TASK_DETAIL_FIELDS
+        self.task_field_bindings = {self.detail_fields[key]: binding for key, binding in TASK_DETAIL_FIELDS.items()}
+        # task attribute -> widget of the detail panel
+        self.task_field_widgets = {binding[0]: widget for widget, binding in self.task_field_bindings.items()}
         self.detail_fields["Taskname"].textChanged.connect(self.check_for_changes)
         self.detail_fields["Description"].textChanged.connect(self.check_for_changes)
         self.detail_fields["Estimated_Pomos"].textChanged.connect(self.check_for_changes)
@@ -295,66 +817,275 @@ class MainWindow(QMainWindow):
         self.detail_fields["Repeat"].currentIndexChanged.connect(self.check_for_changes) 
         self.detail_fields["Assigned_to_project"].textChanged.connect(self.check_for_changes)
         self.detail_fields["Tag"].textChanged.connect(self.check_for_changes)
-        self.detail_fields["Subtasks"].itemChanged.connect(self.check_for_changes)
         main_area.addWidget(self.details_panel, 2)
+
+        changes = self.focusme_data_model.changes
+        changes.subscribe(ChangeEvent.PROJECT_ADDED, self.project_added)
+        changes.subscribe(ChangeEvent.PROJECT_REMOVED, self.project_removed)
+        changes.subscribe(ChangeEvent.TASK_CHANGED, self.task_changed)
+        changes.subscribe(ChangeEvent.SUBTASK_ABOUT_TO_BE_ADDED, self.subtask_about_to_be_added)
+        changes.subscribe(ChangeEvent.SUBTASK_ADDED, self.subtask_added)
+        changes.subscribe(ChangeEvent.SUBTASK_CHANGED, self.subtask_changed)
         if self.focusme_control.get_current_project():
             self.populate_ui()
 
-    def check_for_changes(self):
+    @instrumented
+    def check_for_changes(self, *signal_args):
         """
         Checks if one of the edit field of task details has been changed.
         This method is the slot for the "Changed" signals of the ui elements for the 
         detailed task ui.
-        It is checked if the current content of each the task dtetails edit ui is different to
-        what is currently stored in focusme data model.
-        The check is done by using the sender information.
-        If a difference btw. content of ui element and focusme data model 
-        is detected in any of the editable elements, the informetion from the ui element is
-        pushed to the focusme data model and directly to the database.
-        """
-        sender = self.sender()
-        has_changes = False
-        if sender == self.detail_fields["Taskname"]:
-            has_changes = self.detail_fields["Taskname"].text() != self.focusme_control.get_current_task().taskname
-            if has_changes is True:
-                self.focusme_control.get_current_task().taskname = self.detail_fields["Taskname"].text()
-                self.kanban_board.updated_boards(self.focusme_control.get_current_project())
- 
-        if sender == self.detail_fields["Description"]:
-            has_changes = self.detail_fields["Description"].toPlainText() != self.focusme_control.get_current_task().description
-            if has_changes is True:
-                self.focusme_control.get_current_task().description = self.detail_fields["Description"].toPlainText()
- 
-        if sender == self.detail_fields["Estimated_Pomos"]:
-            has_changes = self.detail_fields["Estimated_Pomos"].text() != str(self.focusme_control.get_current_task().estimated_pomodoros)
-            if has_changes is True:
-                self.focusme_control.get_current_task().estimated_pomodoros = int(self.detail_fields["Estimated_Pomos"].text())
-                
-        if sender == self.detail_fields["Date_to_Perform"]:
-            has_changes = self.detail_fields["Date_to_Perform"].date().toString("dd.MM.yyyy") != self.focusme_control.get_current_task().date_to_perform
-            if has_changes is True:
-                self.focusme_control.get_current_task().date_to_perform = self.detail_fields["Date_to_Perform"].date().toString("dd.MM.yyyy")
-        
-        if sender == self.detail_fields["Repeat"]:     
-            has_changes = self.detail_fields["Repeat"].currentText() != self.focusme_control.get_current_task().repeat
-            if has_changes is True:
-                self.focusme_control.get_current_task().repeat = has_changes = self.detail_fields["Repeat"].currentText()
- 
-        if sender == self.detail_fields["Assigned_to_project"]:
-            has_changes = self.detail_fields["Assigned_to_project"].text() != self.focusme_control.get_current_task().assigned_project
-            if has_changes is True:
-                self.focusme_control.get_current_task().assigned_project = self.detail_fields["Assigned_to_project"].text()
-        
-        if sender == self.detail_fields["Tag"]:
-            has_changes = self.detail_fields["Tag"].text() != self.focusme_control.get_current_task().tag
-            if has_changes is True:
-                self.focusme_control.get_current_task().tag = self.detail_fields["Tag"].text()
-        
-        if sender == self.detail_fields["Subtasks"]:
-            print("Subtask changed")
-        
-        if has_changes is True:
-            update_task_in_db(self.db_conn, self.focusme_control.get_current_task())
+        The task attribute of the sender is looked up in task_field_bindings
+        (see TASK_DETAIL_FIELDS), the arguments of the different "Changed"
+        signals are not used.
+        If the content of the ui element differs from the focusme data model, it
+        is pushed to the model with Project.update_task. The published TASK_CHANGED
+        updates the kanban board and marks the task for the write-behind queue
+        (see task_changed).
+        """
+        task = self.focusme_control.get_current_task()
+        if task is None:
+            return
+        widget = self.sender()
+        field, widget_value, _ = self.task_field_bindings[widget]
+        try:
+            value = widget_value(widget)
+        except ValueError:
+            # e.g. an incomplete number, taken over when it is valid
+            return
+        current = getattr(task, field)
+        # empty database columns (NULL) are shown as empty text
+        if value == current or (value == "" and current is None):
+            return
+        self.focusme_control.get_current_project().update_task(task, **{field: value})
+
+    @instrumented
+    def task_changed(self, task, project, fields):
+        """
+        Handler of TASK_CHANGED. The task is written with the next flush of the
+        write-behind queue, the detail panel updates the widgets of the changed
+        attributes if the task is shown.
+
+        Args:
+            task (Task): changed task
+            project (Project): project of the task
+            fields (tuple): names of the changed attributes
+        """
+        self.pending_writes.mark_task_dirty(task)
+        self.write_behind_timer.start()
+        if task is not self.focusme_control.get_current_task():
+            return
+        for field in fields:
+            widget = self.task_field_widgets.get(field)
+            if widget is None:
+                continue
+            _, widget_value, show_value = self.task_field_bindings[widget]
+            value = getattr(task, field)
+            try:
+                unchanged = widget_value(widget) == value
+            except ValueError:
+                unchanged = False
+            if not unchanged:
+                show_value(widget, value)
+
+    @instrumented
+    def apply_tag_filter(self, *signal_args):
+        """
+        Slot of the tag filter box and mode, filters the board by the entered tags.
+        """
+        self.kanban_board.set_tag_filter(split_tags(self.tag_filter_box.text()),
+                                         match_all=self.tag_filter_mode.currentIndex() == 1)
+
+    @instrumented
+    def tasks_moved(self, tasks):
+        """
+        Callback of the kanban board for drag&drop moves. The changed swimlane
+        and kanban rank of the tasks are written to the database at once.
+
+        Args:
+            tasks (list): Task objects changed by the move
+        """
+        for task in tasks:
+            self.pending_writes.mark_task_dirty(task)
+        self.flush_pending_writes()
+
+    @instrumented
+    def run_search(self):
+        """
+        Runs the full-text search for the text of the search box on the database worker.
+        Slot of the search timer, so only the text after a typing pause is searched.
+        """
+        text = self.search_box.text()
+        self.run_db_command(search_tasks, text,
+                            on_result=lambda rows: self.show_search_results(text, rows))
+
+    def show_search_results(self, text, rows):
+        """
+        Shows the results of a search, unless the search text has changed meanwhile.
+
+        Args:
+            text (str): searched text
+            rows (list): result of search_tasks
+        """
+        if text != self.search_box.text():
+            return
+        self.search_results.clear()
+        for task_id, taskname, project_name, swimlane in rows:
+            item = QListWidgetItem(f"{taskname} ({project_name} / {swimlane})")
+            item.setData(Qt.UserRole, (task_id, project_name))
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(rows))
+
+    def open_search_result(self, item):
+        """
+        Opens the project of a search result and shows the task.
+
+        Args:
+            item (QListWidgetItem): clicked search result
+        """
+        task_id, project_name = item.data(Qt.UserRole)
+        project_items = self.project_list_q_widget.findItems(project_name, Qt.MatchExactly)
+        if not project_items:
+            return
+        self.search_task_id = task_id
+        self.project_list_q_widget.setCurrentItem(project_items[0])
+        self.switch_project(project_items[0])
+
+    @instrumented
+    def flush_pending_writes(self):
+        """
+        Writes all pending task and subtask changes to the database in one transaction.
+        """
+        self.write_behind_timer.stop()
+        written = False
+        if self.pending_writes.has_pending_writes():
+            self.run_db_command(self.pending_writes.flush)
+            written = True
+        if self.pomodoro_engine.has_pending_sessions():
+            self.run_db_command(self.pomodoro_engine.flush)
+            written = True
+        if written:
+            self.refresh_project_statistics()
+
+    def refresh_project_statistics(self):
+        """
+        Reads the totals of all projects from the statistics table (one row per
+        project, tag and swimlane, kept current by triggers) and shows them in the
+        project list. The totals are read after the submitted writes.
+        """
+        self.run_db_command(select_project_statistics, on_result=self.show_project_statistics)
+
+    def show_project_statistics(self, statistics):
+        """
+        Shows the totals in the project list.
+
+        Args:
+            statistics (dict): project name -> totals, see select_project_statistics
+        """
+        for index in range(self.project_list_q_widget.count()):
+            item = self.project_list_q_widget.item(index)
+            item.setData(PROJECT_STATISTICS_ROLE, statistics.get(item.text()))
+
+    @instrumented
+    def toggle_pomodoro(self, *signal_args):
+        """
+        Starts a pomodoro for the current task or aborts the running one.
+        """
+        if self.pomodoro_session is not None:
+            self.pomodoro_engine.abort(self.pomodoro_session)
+            return
+        task = self.focusme_control.get_current_task()
+        if task is None:
+            return
+        self.pomodoro_session = self.pomodoro_engine.start(task)
+        self.pomodoro_btn.setText("Pomodoro abbrechen")
+        self.show_pomodoro_time([self.pomodoro_session])
+
+    def show_pomodoro_time(self, sessions):
+        """
+        Slot for pomodoro_tick, shows the remaining time of the pomodoro.
+
+        Args:
+            sessions (list): running PomodoroSession objects
+        """
+        if self.pomodoro_session in sessions:
+            minutes, seconds = divmod(round(self.pomodoro_session.remaining()), 60)
+            self.pomodoro_label.setText(f"{self.pomodoro_session.task.taskname}: {minutes:02d}:{seconds:02d}")
+
+    def pomodoro_session_finished(self, session):
+        """
+        Slot for pomodoro_finished, runs in the GUI thread. A completed session
+        is counted in performed_pomodoros of its task with Project.update_task,
+        the engine thread never changes the task. The session and the counter
+        are written with the next flush of the pending writes.
+
+        Args:
+            session (PomodoroSession): the completed or aborted session
+        """
+        if session.completed:
+            task = session.task
+            performed_pomodoros = (task.performed_pomodoros or 0) + 1
+            project = self.focusme_data_model.get_project(task.assigned_project)
+            if project is not None and project.tasks_loaded:
+                # TASK_CHANGED updates the views and marks the task for the write-behind queue
+                project.update_task(task, performed_pomodoros=performed_pomodoros)
+            else:
+                # the tasks of the project were unloaded meanwhile, no view shows the task
+                task.performed_pomodoros = performed_pomodoros
+                self.pending_writes.mark_task_dirty(task)
+        if session is self.pomodoro_session:
+            self.pomodoro_session = None
+            self.pomodoro_btn.setText("Pomodoro starten")
+            state = "beendet" if session.completed else "abgebrochen"
+            self.pomodoro_label.setText(f"{session.task.taskname}: {state} ({session.task.performed_pomodoros})")
+        self.write_behind_timer.start()
+
+    def run_db_command(self, func, *args, on_result=None, on_error=None):
+        """
+        Runs a database command on the database worker, so the GUI never
+        waits for SQLite. Commands are executed in the order they are submitted.
+
+        Args:
+            func (function): function that is called as func(conn, *args)
+            on_result (function, optional): called in the GUI thread with the result
+            on_error (function, optional): called in the GUI thread with the exception
+                if the command fails, e.g. to enable widgets disabled for the command
+
+        Returns:
+            Future: result of the command
+        """
+        future = self.db_worker.submit(func, *args)
+        future.add_done_callback(lambda f: self.db_result_ready.emit(on_result, on_error, f))
+        return future
+
+    def handle_db_result(self, on_result, on_error, future):
+        """
+        Slot for db_result_ready, runs in the GUI thread. A failed command is
+        shown to the user and handed to on_error.
+
+        Args:
+            on_result (function): callback for the result or None
+            on_error (function): callback for the exception or None
+            future (Future): finished database command
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Fehler beim Datenbankzugriff: {e}")
+            QMessageBox.warning(self, "FocusMe", f"Fehler beim Datenbankzugriff: {e}")
+            if on_error:
+                on_error(e)
+            return
+        if on_result:
+            on_result(result)
+
+    def closeEvent(self, event):
+        """
+        Writes pending changes before the window is closed. A running pomodoro is aborted.
+        """
+        self.pomodoro_engine.close()
+        self.flush_pending_writes()
+        super().closeEvent(event)
 
     def populate_ui(self):
         """
@@ -376,53 +1107,167 @@ class MainWindow(QMainWindow):
                 self.project_list_q_widget.setCurrentItem(item)
                 self.project_list_q_widget.setFocus()
         self.kanban_board.updated_boards(self.focusme_control.get_current_project())
-        self.show_task_details(self.focusme_control.get_current_task().taskname, self.focusme_control.get_current_task().assigned_kanban_swimlane)
+        self.show_task(self.focusme_control.get_current_task())
+        self.refresh_project_statistics()
     
     def add_project(self):
         project_name, ok = QInputDialog.getText(
             self, "Projekt hinzufügen", "Projektname:")
         if ok and project_name:
-            self.project_list_q_widget.addItem(project_name)
-            self.focusme_data_model.add_project(Project(project_name))
-            self.focusme_control.set_current_project(self.focusme_data_model.get_project(project_name)) 
-            add_project_to_db(self.db_conn, self.focusme_data_model.get_project(project_name))
+            # the project list shows the project when PROJECT_ADDED is published
+            project = Project(project_name)
+            self.focusme_data_model.add_project(project)
+            self.focusme_control.set_current_project(project) 
+            self.run_db_command(add_project_to_db, project)
+            if self.project_loader:
+                # a new project has all its tasks, it only becomes the most recently used one
+                self.project_loader.add_rows(project)
 
     def delete_project(self):
         selected_item = self.project_list_q_widget.currentItem()
         if not selected_item:
             return
 
-        project_name = selected_item.text()
-        if project_name == self.current_project:
-            self.kanban_board.clear_board()
-            self.current_project = None
+        project = self.focusme_data_model.get_project(selected_item.text())
+        if project is not None:
+            # the model is changed only after the database worker has deleted the project,
+            # so a snapshot never misses a project that is still in the database
+            if project is self.focusme_control.get_current_project():
+                self.kanban_board.setEnabled(False)
+                self.details_panel.setEnabled(False)
+            self.run_db_command(delete_project_from_db, project,
+                                on_result=lambda _: self.project_deleted(project),
+                                on_error=lambda _: self.enable_project_editing())
 
-        self.project_list_q_widget.takeItem(self.project_list_q_widget.row(selected_item))
-        del self.projects[project_name]
+    def project_deleted(self, project):
+        """
+        Removes a project from the model after the database worker has deleted it.
+        The project list and the board are updated when PROJECT_REMOVED is published.
 
+        Args:
+            project (Project): the deleted project
+        """
+        if project.focusme_data is None:
+            return
+        if self.project_loader:
+            self.project_loader.discard(project)
+        self.focusme_data_model.remove_project(project)
+        self.enable_project_editing()
+
+    def enable_project_editing(self):
+        """
+        Enables the board and the detail panel again after a database command
+        they were disabled for has finished or failed.
+        """
+        self.kanban_board.setEnabled(True)
+        self.details_panel.setEnabled(True)
+
+    def project_added(self, project):
+        """
+        Handler of PROJECT_ADDED, adds the project to the project list
+        """
+        self.project_list_q_widget.addItem(project.name)
+
+    def project_removed(self, project):
+        """
+        Handler of PROJECT_REMOVED, removes the project from the project list
+        and from the board if it is shown
+        """
+        items = self.project_list_q_widget.findItems(project.name, Qt.MatchExactly)
+        if items:
+            self.project_list_q_widget.takeItem(self.project_list_q_widget.row(items[0]))
+        if project is self.focusme_control.get_current_project():
+            self.kanban_board.clear_board()
+            self.focusme_control.set_current_project(None)
+            self.focusme_control.set_current_task(None)
+            self.subtask_model.set_task(None, None)
+
+    @instrumented
     def switch_project(self, item):
+        self.flush_pending_writes()
         project_name = item.text()
-        self.focusme_control.set_current_project(self.focusme_data_model.get_project(item.text()))
+        project = self.focusme_data_model.get_project(project_name)
+        self.focusme_control.set_current_project(project)
         #self.current_project = project_name
-        self.kanban_board.updated_boards(self.focusme_data_model.get_project(project_name))
+        if self.project_loader and not project.tasks_loaded:
+            # lazy mode: the database worker reads the rows when the project is opened the first time,
+            # the tasks are added on the GUI thread. Board and details cannot be edited meanwhile.
+            self.kanban_board.clear_board()
+            self.kanban_board.setEnabled(False)
+            self.details_panel.setEnabled(False)
+            self.run_db_command(select_project_rows, project.name,
+                                on_result=lambda rows: self.project_rows_loaded(project, rows),
+                                on_error=lambda _: self.project_rows_failed(project))
+        else:
+            if self.project_loader:
+                self.project_loader.add_rows(project)
+            self.show_loaded_project(project)
 
+    def project_rows_loaded(self, project, rows):
+        """
+        Adds the rows read by the database worker to the project and shows it.
+        The completed repeating tasks of the project return to the backlog
+        (roll_over_project), they are written with the pending writes.
+
+        Args:
+            project (Project): the opened project
+            rows (tuple): result of select_project_rows
+        """
+        if project.focusme_data is None:
+            # deleted while it was loaded
+            return
+        self.project_loader.add_rows(project, rows)
+        rolled_over = roll_over_project(project)
+        for task in rolled_over:
+            self.pending_writes.mark_task_dirty(task)
+        if rolled_over:
+            self.write_behind_timer.start()
+        self.show_loaded_project(project)
 
-    def show_task_details(self, task_name,  assigned_kanban_swimlane):
-        curr_proj = self.focusme_control.get_current_project()
-        self.focusme_data_model.get_project(curr_proj)
-        task_data=curr_proj.get_task(task_name, assigned_kanban_swimlane)
+    def project_rows_failed(self, project):
+        """
+        Closes a project whose rows could not be read, its tasks stay unloaded.
+        The board is enabled again, opening the project once more retries the load.
+
+        Args:
+            project (Project): the opened project
+        """
+        if project is self.focusme_control.get_current_project():
+            self.focusme_control.set_current_project(None)
+            self.focusme_control.set_current_task(None)
+            self.enable_project_editing()
+
+    def show_loaded_project(self, project):
+        """
+        Shows a project on the kanban board after its tasks have been loaded,
+        if it is still the current project.
+
+        Args:
+            project (Project): the loaded project
+        """
+        if project is self.focusme_control.get_current_project():
+            self.enable_project_editing()
+            self.kanban_board.updated_boards(project)
+            if self.search_task_id is not None:
+                task = project.get_task_by_id(self.search_task_id)
+                self.search_task_id = None
+                if task is not None:
+                    self.show_task(task)
+
+    @instrumented
+    def show_task(self, task_data):
+        """
+        Shows the details of a task of the current project
+
+        Args:
+            task_data (Task): task to show
+        """
+        self.flush_pending_writes()
         self.focusme_control.set_current_task(task_data)
-        self.detail_fields["Taskname"].setText(task_data.taskname)
-        self.detail_fields["Estimated_Pomos"].setText(str(task_data.estimated_pomodoros))
-        self.detail_fields["Date_to_Perform"].setDate(QDate.fromString(task_data.date_to_perform, "dd.MM.yyyy"))
-        index = self.detail_fields["Repeat"].findText(task_data.repeat)
-        self.detail_fields["Repeat"].setCurrentIndex(index if index >= 0 else 0)
-        self.detail_fields["Assigned_to_project"].setText(task_data.assigned_project)
-        self.detail_fields["Description"].setPlainText(task_data.description)
+        for widget, (field, _, show_value) in self.task_field_bindings.items():
+            show_value(widget, getattr(task_data, field))
         
-        self.detail_fields["Subtasks"].clear()
-        for subtask in task_data.subtasks:
-            self.add_subtask_to_ui(subtask)
+        self.subtask_model.set_task(task_data, self.focusme_control.get_current_project())
 
 
     def save_task_details(self):
@@ -430,10 +1275,12 @@ class MainWindow(QMainWindow):
         # Speichere Task-Änderungen
         pass  # Implementiere Speichern-Logik hier
     
+    @instrumented
     def update_data_model(self,task):
         """
         This is function is used as a callback function in KanbanBoard in
-        order to update the global data model with new tasks added to the board
+        order to update the global data model with new tasks added to the board.
+        The board shows the task when the project publishes TASK_ADDED.
 
         Args:
             task (Task): Task information from an added task_
@@ -441,37 +1288,11 @@ class MainWindow(QMainWindow):
         proj = self.focusme_control.get_current_project()
         task.assigned_project = proj.name
         proj.add_task(task)
-        add_task_to_db(self.db_conn, task)
-        self.show_task_details(task.taskname, task.assigned_kanban_swimlane)
+        self.run_db_command(add_task_to_db, task)
+        self.refresh_project_statistics()
+        self.show_task(task)
  
-    def add_subtask_to_ui(self, subtask):
-         # Neues benutzerdefiniertes Widget für den Subtask
-        subtask_widget = QWidget()
-        subtask_layout = QHBoxLayout(subtask_widget)
-        subtask_layout.setContentsMargins(0, 0, 0, 0)  # Entfernt unnötige Ränder
-
-        # Checkbox und editierbares Textfeld
-        checkbox = QCheckBox()
-        checkbox.setChecked(subtask.status)
-        text_edit = QLineEdit()
-        text_edit.setPlaceholderText(subtask.description)
-
-        # Füge Checkbox und Textfeld zum Layout hinzu
-        subtask_layout.addWidget(checkbox)
-        subtask_layout.addWidget(text_edit)
-        
-        # Neues Listenelement für die Subtask-Liste
-        list_item = QListWidgetItem(self.detail_fields["Subtasks"])
-        self.detail_fields["Subtasks"].addItem(list_item)
-
-        # Setze das benutzerdefinierte Widget als Inhalt des Listenelements
-        list_item.setSizeHint(subtask_widget.sizeHint())
-        self.detail_fields["Subtasks"].setItemWidget(list_item, subtask_widget)
-        #adds a reference to the subtask object to the list item for later access
-        list_item.setData(Qt.UserRole, subtask)
-        checkbox.stateChanged.connect(lambda state, s=subtask: self.update_subtask_status(s, state))
-        text_edit.textChanged.connect(lambda text, s=subtask: self.update_subtask_description(s, text))
-    
+    @instrumented
     def add_subtask(self, subtask_description="Enter subtask name...", subtask_status=False):
         """
         Adds a new subtask to the current task.
@@ -482,26 +1303,35 @@ class MainWindow(QMainWindow):
             None
         """
         
-        subtask = Subtask(id=None, task_id=self.focusme_control.get_current_task().id,
+        task = self.focusme_control.get_current_task()
+        subtask = Subtask(id=None, task_id=task.id,
                           description=subtask_description, status=subtask_status)
-        add_subtask_to_db(self.db_conn, subtask)
-        self.focusme_control.get_current_task().add_subtask(subtask)
-        self.add_subtask_to_ui(subtask)
-    
-    def update_subtask_status(self, subtask, state):
+        #the task id is taken when the insert is executed, the task insert may still be queued
+        self.run_db_command(add_subtask_to_db, subtask, task)
+        self.focusme_control.get_current_project().add_subtask(task, subtask)
+
+    def subtask_about_to_be_added(self, subtask, task, project, position):
         """
-        Aktualisiert den Status des Subtasks, wenn die Checkbox geändert wird.
+        Handler of SUBTASK_ABOUT_TO_BE_ADDED, begins the insert of the row if the task is shown
         """
-        subtask.status = state == Qt.Checked.value
-        self.focusme_control.get_current_task().update_subtask(subtask)
-        update_subtask_in_db(self.db_conn, subtask)
-        print(f"Updated Subtask Status: {subtask.description} -> {subtask.status}")
+        if task is self.subtask_model.task:
+            self.subtask_model.begin_append_row()
 
-    def update_subtask_description(self, subtask, text):
+    def subtask_added(self, subtask, task, project):
+        """
+        Handler of SUBTASK_ADDED, shows the new subtask if its task is shown
+        """
+        if task is self.subtask_model.task:
+            self.subtask_model.end_append_row()
+    
+    @instrumented
+    def subtask_changed(self, subtask, task, project, fields):
         """
-        Aktualisiert die Beschreibung des Subtasks, wenn der Text im LineEdit geändert wird.
+        Handler of SUBTASK_CHANGED. The change is written to the database with
+        the next flush of the write-behind queue, the row of the subtask is
+        updated if its task is shown.
         """
-        subtask.description = text
-        self.focusme_control.get_current_task().update_subtask(subtask)
-        update_subtask_in_db(self.db_conn, subtask)
-        print(f"Updated Subtask Description: {subtask.description}")
\ No newline at end of file
+        self.pending_writes.mark_subtask_dirty(subtask)
+        self.write_behind_timer.start()
+        if task is self.subtask_model.task:
+            self.subtask_model.subtask_changed(subtask)